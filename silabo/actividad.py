@@ -0,0 +1,302 @@
+from collections import Counter
+from datetime import date
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Min, Sum
+from django.db.models.functions import Coalesce
+
+from .cache import invalidar_modelo
+from .models import LogActividadDiaria, LogProcesos
+
+
+# ─────────────────────────────────────────────
+#  Almacenamiento de LogProcesos
+# ─────────────────────────────────────────────
+#
+# En PostgreSQL la tabla de logs se particiona por mes (RANGE sobre `fecha`)
+# con `manage.py mantener_logs --particionar`; después, el mismo comando
+# (programado a diario) crea las particiones de los próximos meses y borra
+# enteras las que salen del período de retención (SILABO_LOGS_RETENCION_MESES,
+# 12 por defecto). En otros motores la retención se aplica con un DELETE.
+#
+# LogActividadDiaria acumula cuántas entradas hubo por día, usuario y tipo
+# de acción. Se actualiza de forma incremental al escribir los logs, así que
+# las estadísticas no recorren LogProcesos y sobreviven a la retención.
+# Borrar o editar logs ya registrados no altera el resumen.
+
+TABLA = LogProcesos._meta.db_table
+PARTICION_DEFAULT = f'{TABLA}_default'
+SECUENCIA = f'{TABLA}_particionada_id_seq'
+
+
+def retencion_meses():
+    return getattr(settings, 'SILABO_LOGS_RETENCION_MESES', 12)
+
+
+# ←–– Meses ––→
+
+def inicio_de_mes(fecha):
+    return fecha.replace(day=1)
+
+
+def sumar_meses(fecha, meses):
+    total = fecha.year * 12 + fecha.month - 1 + meses
+    return date(total // 12, total % 12 + 1, 1)
+
+
+def nombre_particion(mes):
+    return f'{TABLA}_p{mes.year}_{mes.month:02d}'
+
+
+def mes_de_particion(nombre):
+    """
+    Primer día del mes de una partición mensual, o None para otras tablas
+    """
+    sufijo = nombre.removeprefix(f'{TABLA}_p')
+    try:
+        anio, mes = sufijo.split('_')
+        return date(int(anio), int(mes), 1)
+    except ValueError:
+        return None
+
+
+def corte_retencion(hoy=None, meses=None):
+    """
+    Primer día que se conserva: los logs anteriores se eliminan
+    """
+    meses = retencion_meses() if meses is None else meses
+    return sumar_meses(inicio_de_mes(hoy or date.today()), -meses)
+
+
+# ←–– Particiones (PostgreSQL) ––→
+
+def sql_crear_particion(mes):
+    return (
+        f"CREATE TABLE IF NOT EXISTS {nombre_particion(mes)} PARTITION OF {TABLA} "
+        f"FOR VALUES FROM ('{mes.isoformat()}') TO ('{sumar_meses(mes, 1).isoformat()}')"
+    )
+
+
+def sql_particionar(desde, hasta):
+    """
+    DDL que reemplaza la tabla de logs por una particionada por mes con
+    particiones de `desde` a `hasta` (meses) y copia las filas existentes.
+    La clave primaria pasa a ser (id, fecha) porque debe incluir la clave de
+    partición; el id sigue saliendo de una secuencia única.
+    """
+    anterior = f'{TABLA}_anterior'
+    usuario = LogProcesos._meta.get_field('usuario')
+    tabla_usuarios = usuario.related_model._meta.db_table
+    sentencias = [
+        f"ALTER TABLE {TABLA} RENAME TO {anterior}",
+        f"ALTER TABLE {anterior} RENAME CONSTRAINT {TABLA}_pkey TO {anterior}_pkey",
+        "ALTER INDEX log_fecha_id_idx RENAME TO log_fecha_id_idx_anterior",
+        f"CREATE SEQUENCE IF NOT EXISTS {SECUENCIA} AS bigint",
+        f"SELECT setval('{SECUENCIA}', COALESCE((SELECT max(id) FROM {anterior}), 0) + 1, false)",
+        f"""CREATE TABLE {TABLA} (
+            id bigint NOT NULL DEFAULT nextval('{SECUENCIA}'),
+            fecha date NOT NULL,
+            accion text NOT NULL,
+            usuario_id {usuario.db_type(connection)} NULL
+                REFERENCES {tabla_usuarios} (id) DEFERRABLE INITIALLY DEFERRED,
+            PRIMARY KEY (id, fecha)
+        ) PARTITION BY RANGE (fecha)""",
+        f"ALTER SEQUENCE {SECUENCIA} OWNED BY {TABLA}.id",
+        f"CREATE INDEX log_fecha_id_idx ON {TABLA} (fecha DESC, id DESC)",
+        f"CREATE INDEX {TABLA}_usuario_id_idx ON {TABLA} (usuario_id)",
+    ]
+    mes = desde
+    while mes <= hasta:
+        sentencias.append(sql_crear_particion(mes))
+        mes = sumar_meses(mes, 1)
+    # Recibe lo que no tenga partición mensual para que ningún INSERT falle
+    sentencias.append(f"CREATE TABLE {PARTICION_DEFAULT} PARTITION OF {TABLA} DEFAULT")
+    sentencias.append(f"INSERT INTO {TABLA} (id, fecha, accion, usuario_id) SELECT id, fecha, accion, usuario_id FROM {anterior}")
+    sentencias.append(f"DROP TABLE {anterior}")
+    return sentencias
+
+
+def esta_particionada():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [TABLA])
+        fila = cursor.fetchone()
+    return fila is not None and fila[0] == 'p'
+
+
+def particiones():
+    """
+    Nombres de las particiones de la tabla de logs
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(%s) ORDER BY c.relname",
+            [TABLA],
+        )
+        return [nombre for nombre, in cursor.fetchall()]
+
+
+def particiones_vencidas(corte):
+    """
+    Particiones mensuales cuyo mes termina antes de `corte`
+    """
+    vencidas = []
+    for nombre in particiones():
+        mes = mes_de_particion(nombre)
+        if mes is not None and sumar_meses(mes, 1) <= corte:
+            vencidas.append(nombre)
+    return vencidas
+
+
+def crear_particiones(hasta):
+    """
+    Crea las particiones mensuales desde el mes actual hasta `hasta`
+    """
+    existentes = set(particiones())
+    creadas = []
+    mes = inicio_de_mes(date.today())
+    with connection.cursor() as cursor:
+        while mes <= hasta:
+            if nombre_particion(mes) not in existentes:
+                cursor.execute(sql_crear_particion(mes))
+                creadas.append(nombre_particion(mes))
+            mes = sumar_meses(mes, 1)
+    return creadas
+
+
+def aplicar_retencion(corte):
+    """
+    Elimina los logs anteriores a `corte`: borra particiones enteras si la
+    tabla está particionada y, si no, las filas con un único DELETE. Devuelve
+    los nombres de las particiones borradas o el número de filas.
+    """
+    if esta_particionada():
+        vencidas = particiones_vencidas(corte)
+        with connection.cursor() as cursor:
+            for nombre in vencidas:
+                cursor.execute(f"DROP TABLE {nombre}")
+            # Lo que haya caído en la partición DEFAULT se borra fila a fila
+            cursor.execute(f"DELETE FROM {PARTICION_DEFAULT} WHERE fecha < %s", [corte])
+        resultado = vencidas
+    else:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLA} WHERE fecha < %s", [corte])
+            resultado = cursor.rowcount
+    invalidar_modelo(LogProcesos)
+    return resultado
+
+
+def rango_a_particionar(meses_adelante):
+    primera = LogProcesos.objects.aggregate(primera=Min('fecha'))['primera']
+    hoy = inicio_de_mes(date.today())
+    desde = inicio_de_mes(primera) if primera and primera < hoy else hoy
+    return max(desde, corte_retencion()), sumar_meses(hoy, meses_adelante)
+
+
+# ─────────────────────────────────────────────
+#  Resumen diario de actividad
+# ─────────────────────────────────────────────
+
+LARGO_ACCION = LogActividadDiaria._meta.get_field('accion').max_length
+
+
+def tipo_de_accion(texto):
+    """
+    'actualizar silabo.semana #12' -> 'actualizar silabo.semana'
+    """
+    return texto.split(' #', 1)[0].removesuffix(' (masivo)').strip()[:LARGO_ACCION]
+
+
+def acumular(logs):
+    """
+    Suma las entradas `logs` al resumen: un SELECT ... FOR UPDATE de las
+    filas afectadas, un UPDATE y un INSERT como máximo
+    """
+    conteos = Counter((log.fecha, log.usuario_id, tipo_de_accion(log.accion)) for log in logs)
+    if not conteos:
+        return
+    for intento in range(2):
+        try:
+            with transaction.atomic():
+                _acumular(conteos)
+            break
+        except IntegrityError:
+            # Otro proceso creó la misma fila a la vez: se reintenta como UPDATE
+            if intento:
+                raise
+    invalidar_modelo(LogActividadDiaria)
+
+
+def _acumular(conteos):
+    existentes = {
+        (fila.fecha, fila.usuario_id, fila.accion): fila
+        for fila in LogActividadDiaria.objects.select_for_update().filter(
+            fecha__in={fecha for fecha, _, _ in conteos},
+            accion__in={accion for _, _, accion in conteos},
+        )
+    }
+    nuevas, cambiadas = [], []
+    for (fecha, usuario_id, accion), total in conteos.items():
+        fila = existentes.get((fecha, usuario_id, accion))
+        if fila is None:
+            nuevas.append(LogActividadDiaria(fecha=fecha, usuario_id=usuario_id, accion=accion, total=total))
+        else:
+            fila.total = F('total') + total
+            cambiadas.append(fila)
+    LogActividadDiaria.objects.bulk_update(cambiadas, ['total'])
+    LogActividadDiaria.objects.bulk_create(nuevas)
+
+
+def reconstruir_resumen(desde=None, tamano_bloque=5000):
+    """
+    Recalcula el resumen a partir de los logs (desde `desde` o todos). Los
+    días anteriores a la retención conservan sus conteos.
+    """
+    logs = LogProcesos.objects.only('fecha', 'accion', 'usuario_id').order_by()
+    resumen = LogActividadDiaria.objects.all()
+    if desde is None:
+        desde = logs.aggregate(primera=Min('fecha'))['primera']
+    if desde is None:
+        return 0
+    logs = logs.filter(fecha__gte=desde)
+    total = 0
+    with transaction.atomic():
+        resumen.filter(fecha__gte=desde).delete()
+        conteos = Counter()
+        for log in logs.iterator(chunk_size=tamano_bloque):
+            conteos[(log.fecha, log.usuario_id, tipo_de_accion(log.accion))] += 1
+            total += 1
+        LogActividadDiaria.objects.bulk_create(
+            [LogActividadDiaria(fecha=f, usuario_id=u, accion=a, total=n) for (f, u, a), n in conteos.items()],
+            batch_size=tamano_bloque,
+        )
+    invalidar_modelo(LogActividadDiaria)
+    return total
+
+
+AGRUPACIONES = ('fecha', 'usuario', 'accion')
+
+
+def estadisticas_actividad(agrupar=('fecha',), desde=None, hasta=None, usuario_id=None, accion=None):
+    """
+    Totales del resumen agrupados por `agrupar` (subconjunto de AGRUPACIONES)
+    """
+    filas = LogActividadDiaria.objects.all()
+    if desde:
+        filas = filas.filter(fecha__gte=desde)
+    if hasta:
+        filas = filas.filter(fecha__lte=hasta)
+    if usuario_id:
+        filas = filas.filter(usuario_id=usuario_id)
+    if accion:
+        filas = filas.filter(accion__startswith=accion)
+    if not agrupar:
+        return [filas.aggregate(total=Coalesce(Sum('total'), 0))]
+    campos = ['usuario_id' if campo == 'usuario' else campo for campo in agrupar]
+    return [
+        {('usuario' if clave == 'usuario_id' else clave): valor for clave, valor in fila.items()}
+        for fila in filas.values(*campos).annotate(total=Sum('total')).order_by(*campos)
+    ]
@@ -3,7 +3,7 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
 
 from .models import (
-    Rol, CustomUser, Persona, LogProcesos,
+    Rol, CustomUser, Persona, LogProcesos, LogActividadDiaria,
     Profesion, Profesor, Estudiante,
     Universidad, Facultad, Departamento, Carrera,
     PlanCurricular, SemestreAcademico, SemestrePlan, PeriodoLectivo,
@@ -12,6 +12,7 @@ from .models import (
     Metodologia, Silabo,
     Unidad, Bibliografia, Semana, ContenidoEspecifico,
     Actividad, CriterioEvaluacion,
+    AvanceSilabo, ResumenAvance,
 )
 
 # ─────────────────────────────────────────────
@@ -63,7 +64,7 @@ CustomUserAdmin.inlines = [PersonaInline]
 #  modelos sencillos
 # ─────────────────────────────────────────────
 simple_models = [
-    Rol, Persona, LogProcesos,
+    Rol, Persona, LogProcesos, LogActividadDiaria,
     Profesion, Profesor, Estudiante,
     Universidad, Facultad, Departamento, Carrera,
     PlanCurricular, SemestreAcademico, SemestrePlan, PeriodoLectivo,
@@ -72,6 +73,7 @@ simple_models = [
     Metodologia, Silabo,
     Unidad, Bibliografia, Semana, ContenidoEspecifico,
     Actividad, CriterioEvaluacion,
+    AvanceSilabo, ResumenAvance,
 ]
 
 for model in simple_models:
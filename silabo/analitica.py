@@ -0,0 +1,134 @@
+from django.conf import settings
+from django.db.models import Count, Exists, F, OuterRef, Sum, Value
+from django.db.models.functions import Coalesce, Concat
+
+from .models import CargaCurso, Curso, Silabo
+
+
+# ─────────────────────────────────────────────
+#  Analítica de carga docente
+# ─────────────────────────────────────────────
+#
+# Una sola consulta agrupa las cargas activas por profesor y por la dimensión
+# pedida y suma en SQL `Curso.horas_totales` (columna generada) y los
+# créditos. Las filas resultantes (una por profesor y grupo) se consolidan en
+# Python para marcar a cada profesor según su carga total:
+#
+#   SILABO_CARGA_HORAS_MIN  por debajo, subcarga (12)
+#   SILABO_CARGA_HORAS_MAX  por encima, sobrecarga (40)
+
+RUTA_DEPARTAMENTO = 'curso__semestre__plan__carrera__departamento'
+
+# dimensión: (columna del id, columna del nombre)
+DIMENSIONES = {
+    'profesor': ('profesor_id', None),
+    'departamento': (f'{RUTA_DEPARTAMENTO}_id', f'{RUTA_DEPARTAMENTO}__nombre'),
+    'facultad': (f'{RUTA_DEPARTAMENTO}__facultad_id', f'{RUTA_DEPARTAMENTO}__facultad__nombre'),
+    'semestre_academico': ('curso__semestre__semestre_academico_id', 'curso__semestre__semestre_academico__nombre'),
+}
+
+NOMBRE_PROFESOR = Concat(
+    'profesor__persona__nombre', Value(' '),
+    'profesor__persona__apellido_paterno', Value(' '),
+    'profesor__persona__apellido_materno',
+)
+
+
+def sql_horas_totales():
+    """
+    DDL de la columna generada Curso.horas_totales para bases creadas antes
+    de que existiera (PostgreSQL)
+    """
+    tabla = Curso._meta.db_table
+    columnas = ' + '.join(
+        Curso._meta.get_field(campo).column
+        for campo in ('horas_teoria', 'horas_practica', 'horas_laboratorio', 'horas_teopra')
+    )
+    return [
+        f"ALTER TABLE {tabla} ADD COLUMN IF NOT EXISTS horas_totales integer "
+        f"GENERATED ALWAYS AS ({columnas}) STORED CHECK (horas_totales >= 0)",
+    ]
+
+
+def umbrales():
+    return (
+        getattr(settings, 'SILABO_CARGA_HORAS_MIN', 12),
+        getattr(settings, 'SILABO_CARGA_HORAS_MAX', 40),
+    )
+
+
+def estado_de_carga(horas, minimo, maximo):
+    if horas > maximo:
+        return 'sobrecarga'
+    if horas < minimo:
+        return 'subcarga'
+    return 'normal'
+
+
+def cargas_filtradas(periodo_id=None, semestre_academico_id=None, facultad_id=None, departamento_id=None):
+    """
+    Cargas activas. El periodo lectivo se deduce de los sílabos: cuenta la
+    carga si el profesor tiene sílabo del curso en ese periodo.
+    """
+    cargas = CargaCurso.objects.filter(activo=True, profesor__isnull=False, curso__isnull=False)
+    if periodo_id:
+        cargas = cargas.filter(Exists(Silabo.objects.filter(
+            periodo_lectivo_id=periodo_id, profesor_id=OuterRef('profesor_id'),
+            curso_id=OuterRef('curso_id'), activo=True,
+        )))
+    if semestre_academico_id:
+        cargas = cargas.filter(curso__semestre__semestre_academico_id=semestre_academico_id)
+    if facultad_id:
+        cargas = cargas.filter(**{f'{RUTA_DEPARTAMENTO}__facultad_id': facultad_id})
+    if departamento_id:
+        cargas = cargas.filter(**{f'{RUTA_DEPARTAMENTO}_id': departamento_id})
+    return cargas
+
+
+def analitica_de_carga(cargas, agrupar='profesor', minimo=None, maximo=None):
+    """
+    Horas, créditos y cargas por grupo de `agrupar` (ver DIMENSIONES), con
+    los profesores del grupo sobre y bajo los umbrales
+    """
+    por_defecto = umbrales()
+    minimo = por_defecto[0] if minimo is None else minimo
+    maximo = por_defecto[1] if maximo is None else maximo
+    columna_id, columna_nombre = DIMENSIONES[agrupar]
+
+    filas = (
+        cargas.values(
+            profesor_clave=F('profesor_id'), profesor_nombre=NOMBRE_PROFESOR,
+            clave=F(columna_id), nombre=F(columna_nombre) if columna_nombre else NOMBRE_PROFESOR,
+        )
+        .annotate(
+            horas=Coalesce(Sum('curso__horas_totales'), 0),
+            creditos=Coalesce(Sum('curso__creditos'), 0),
+            cargas=Count('id'),
+        )
+        .order_by()
+    )
+
+    horas_por_profesor, grupos = {}, {}
+    for fila in filas:
+        profesor = fila['profesor_clave']
+        horas_por_profesor[profesor] = horas_por_profesor.get(profesor, 0) + fila['horas']
+        grupo = grupos.setdefault(fila['clave'], {
+            'id': fila['clave'], 'nombre': fila['nombre'],
+            'horas': 0, 'creditos': 0, 'cargas': 0, 'profesores': set(),
+        })
+        grupo['horas'] += fila['horas']
+        grupo['creditos'] += fila['creditos']
+        grupo['cargas'] += fila['cargas']
+        grupo['profesores'].add(profesor)
+
+    resultados = []
+    for grupo in grupos.values():
+        estados = [estado_de_carga(horas_por_profesor[p], minimo, maximo) for p in grupo.pop('profesores')]
+        grupo['profesores'] = len(estados)
+        grupo['sobrecargados'] = estados.count('sobrecarga')
+        grupo['subcargados'] = estados.count('subcarga')
+        if agrupar == 'profesor':
+            grupo['estado'] = estados[0]
+        resultados.append(grupo)
+    resultados.sort(key=lambda grupo: (-grupo['horas'], grupo['id'] is None, grupo['id'] or 0))
+    return {'agrupar': agrupar, 'umbrales': {'minimo': minimo, 'maximo': maximo}, 'resultados': resultados}
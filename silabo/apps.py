@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SilaboConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'silabo'
+
+    def ready(self):
+        from . import signals  # noqa: F401
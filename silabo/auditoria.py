@@ -0,0 +1,195 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.decorators import sync_and_async_middleware
+
+from .actividad import acumular
+from .models import LogProcesos
+
+
+logger = logging.getLogger(__name__)
+
+
+# ─────────────────────────────────────────────
+#  Auditoría asíncrona en LogProcesos
+# ─────────────────────────────────────────────
+#
+# Las altas, cambios y bajas de los modelos de la app (señales y
+# `notificar_cambio_masivo`) se encolan al confirmarse la transacción y un
+# hilo en segundo plano los inserta en lotes con bulk_create, así que la
+# petición no paga ningún INSERT de auditoría. La cola es acotada: si se
+# llena, quien registra espera como máximo SILABO_AUDITORIA_ESPERA segundos
+# y luego descarta la entrada (queda contada en `descartados`). Al terminar
+# el proceso se vacía lo pendiente.
+#
+# En serverless (Vercel) la instancia se congela al responder y puede
+# terminar sin ejecutar atexit, así que ni el hilo ni el vaciado final son
+# fiables: ahí las entradas se escriben en el mismo callback de on_commit,
+# con un bulk_create por transacción confirmada.
+#
+#   SILABO_AUDITORIA_ACTIVA     registrar o no (True)
+#   SILABO_AUDITORIA_SINCRONA   escribir al confirmar, sin cola (True si
+#                               DB_CONN_MODE es serverless)
+#   SILABO_AUDITORIA_HILO       escribir desde el hilo de fondo (True); con
+#                               False las entradas esperan a `vaciar()`
+#   SILABO_AUDITORIA_LOTE       entradas por INSERT (200)
+#   SILABO_AUDITORIA_INTERVALO  segundos máximos entre escrituras (2)
+#   SILABO_AUDITORIA_MAXIMO     entradas pendientes como máximo (10000)
+#   SILABO_AUDITORIA_ESPERA     segundos de espera con la cola llena (0.05)
+
+def _opcion(nombre, defecto):
+    return getattr(settings, f'SILABO_AUDITORIA_{nombre}', defecto)
+
+
+def sincrona():
+    return _opcion('SINCRONA', getattr(settings, 'DB_CONN_MODE', None) == 'serverless')
+
+
+# ←–– Usuario de la petición en curso ––→
+
+_peticion = ContextVar('silabo_auditoria_peticion', default=None)
+
+
+@sync_and_async_middleware
+def auditoria_middleware(get_response):
+    """
+    Expone la petición en curso a las señales. DRF asigna `request.user`
+    recién al autenticar dentro de la vista, por eso se guarda la petición
+    y no el usuario.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            marca = _peticion.set(request)
+            try:
+                return await get_response(request)
+            finally:
+                _peticion.reset(marca)
+    else:
+        def middleware(request):
+            marca = _peticion.set(request)
+            try:
+                return get_response(request)
+            finally:
+                _peticion.reset(marca)
+    return middleware
+
+
+def usuario_actual():
+    usuario = getattr(_peticion.get(), 'user', None)
+    if usuario is not None and usuario.is_authenticated:
+        return usuario.pk
+    return None
+
+
+# ←–– Escritor en segundo plano ––→
+
+class EscritorAuditoria:
+
+    def __init__(self):
+        self.cola = queue.Queue(maxsize=_opcion('MAXIMO', 10000))
+        self.hilo = None
+        self.candado = threading.Lock()
+        self.descartados = 0
+
+    def encolar(self, entrada):
+        self._arrancar()
+        try:
+            self.cola.put(entrada, timeout=_opcion('ESPERA', 0.05))
+        except queue.Full:
+            self.descartados += 1
+            logger.warning("Cola de auditoría llena: entrada descartada (%s)", entrada.accion)
+
+    def _arrancar(self):
+        if not _opcion('HILO', True) or (self.hilo is not None and self.hilo.is_alive()):
+            return
+        with self.candado:
+            if self.hilo is None or not self.hilo.is_alive():
+                self.hilo = threading.Thread(target=self._bucle, name='silabo-auditoria', daemon=True)
+                self.hilo.start()
+
+    def _bucle(self):
+        while True:
+            lote = self._tomar_lote()
+            if lote:
+                self._escribir(lote)
+
+    def _tomar_lote(self):
+        """
+        Espera la primera entrada y junta las que lleguen hasta completar el
+        lote o cumplir el intervalo
+        """
+        lote = [self.cola.get()]
+        limite = time.monotonic() + _opcion('INTERVALO', 2)
+        while len(lote) < _opcion('LOTE', 200):
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                lote.append(self.cola.get(timeout=restante))
+            except queue.Empty:
+                break
+        return lote
+
+    def _escribir(self, lote):
+        close_old_connections()
+        try:
+            with transaction.atomic():
+                LogProcesos.objects.bulk_create(lote, batch_size=_opcion('LOTE', 200))
+                acumular(lote)
+        except Exception:
+            logger.exception("No se pudieron guardar %d entradas de auditoría", len(lote))
+
+    def pendientes(self):
+        return self.cola.qsize()
+
+    def vaciar(self):
+        """
+        Escribe en el hilo actual todo lo pendiente
+        """
+        lote = []
+        while True:
+            try:
+                lote.append(self.cola.get_nowait())
+            except queue.Empty:
+                break
+        if lote:
+            self._escribir(lote)
+        return len(lote)
+
+
+escritor = EscritorAuditoria()
+atexit.register(escritor.vaciar)
+
+
+# ←–– Registro ––→
+
+def registrar(accion, model, pks=(), usuario_id=None):
+    """
+    Encola una entrada por pk (o una sola si no hay pks) cuando la
+    transacción en curso se confirma; en modo síncrono las escribe ahí mismo
+    """
+    if not _opcion('ACTIVA', True):
+        return
+    if usuario_id is None:
+        usuario_id = usuario_actual()
+    etiqueta = model._meta.label_lower
+    acciones = [f"{accion} {etiqueta} #{pk}" for pk in pks] or [f"{accion} {etiqueta} (masivo)"]
+
+    def encolar():
+        fecha = timezone.localdate()
+        entradas = [LogProcesos(fecha=fecha, accion=texto, usuario_id=usuario_id) for texto in acciones]
+        if sincrona():
+            escritor._escribir(entradas)
+            return
+        for entrada in entradas:
+            escritor.encolar(entrada)
+
+    transaction.on_commit(encolar)
@@ -0,0 +1,196 @@
+import time
+from functools import cached_property
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+
+
+# ─────────────────────────────────────────────
+#  JWT con claims: autenticación sin consultas
+# ─────────────────────────────────────────────
+#
+# Los tokens llevan email, rol y estado del usuario, así que cada petición se
+# autentica sin leer CustomUser ni Rol. Al cambiar esos datos, la contraseña
+# o al borrar el usuario se guarda una nueva marca de revocación en
+# `CustomUser.revision_token`. Cada token lleva en el claim `revision` la
+# marca vigente al emitirlo: los que traen una marca anterior dejan de valer y
+# hay que iniciar sesión otra vez (la marca tiene resolución de nanosegundos,
+# así que el login que sigue a un cambio de contraseña no queda revocado por
+# caer en el mismo segundo). La marca vive en la base de datos, no en la
+# caché: sobrevive a reinicios, a instancias serverless distintas y al
+# descarte de entradas de locmem. Cada proceso la recuerda
+# SILABO_JWT_REVOCACION_TTL segundos, así que cuesta una consulta por clave
+# primaria por usuario y periodo.
+
+CAMPOS_TOKEN = ('email', 'rol_id', 'activo', 'is_active', 'password')
+
+
+def claims_de(usuario):
+    _recordar(usuario.pk, usuario.revision_token)
+    return {
+        'email': usuario.email,
+        'rol': usuario.rol_id,
+        'rol_nombre': usuario.rol.nombre if usuario.rol_id else None,
+        'activo': usuario.activo and usuario.is_active,
+        'revision': usuario.revision_token,
+    }
+
+
+# ←–– Revocación ––→
+
+_memo = {}
+
+
+def _ttl():
+    return getattr(settings, 'SILABO_JWT_REVOCACION_TTL', 5)
+
+
+def _recordar(user_id, marca):
+    _memo[user_id] = (time.monotonic() + _ttl(), marca)
+
+
+def revocar(*user_ids, instancia=None):
+    """
+    Invalida los tokens emitidos hasta ahora para `user_ids` con un único
+    UPDATE. Si se pasa `instancia`, también actualiza su atributo.
+    """
+    marca = time.time_ns()
+    get_user_model().objects.filter(pk__in=user_ids).update(revision_token=marca)
+    if instancia is not None:
+        instancia.revision_token = marca
+    for user_id in user_ids:
+        _recordar(user_id, marca)
+
+
+def marca_vigente(user_id):
+    """
+    Marca de revocación actual; None si el usuario ya no existe
+    """
+    return get_user_model().objects.filter(pk=user_id).values_list('revision_token', flat=True).first()
+
+
+def revocado(user_id, revision):
+    """
+    True si el token se emitió con una marca anterior a la vigente (o el
+    usuario fue borrado). Los tokens sin claim `revision` cuentan como
+    emitidos con la marca 0.
+    """
+    memo = _memo.get(user_id)
+    if memo is None or memo[0] < time.monotonic():
+        _recordar(user_id, marca_vigente(user_id))
+        memo = _memo[user_id]
+    return memo[1] is None or revision < memo[1]
+
+
+def sql_revision_token():
+    """
+    DDL de la columna CustomUser.revision_token para bases creadas antes de
+    que existiera (PostgreSQL)
+    """
+    tabla = get_user_model()._meta.db_table
+    return [f"ALTER TABLE {tabla} ADD COLUMN IF NOT EXISTS revision_token bigint NOT NULL DEFAULT 0"]
+
+
+# ←–– Usuario y autenticación ––→
+
+class UsuarioToken(TokenUser):
+    """
+    Usuario construido sólo con los claims del token
+    """
+
+    @cached_property
+    def is_active(self):
+        return self.token.get('activo', True)
+
+    @cached_property
+    def email(self):
+        return self.token.get('email', '')
+
+    @cached_property
+    def rol_id(self):
+        return self.token.get('rol')
+
+    @cached_property
+    def rol_nombre(self):
+        return self.token.get('rol_nombre')
+
+    def __str__(self):
+        return self.email
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication que no consulta la base de datos cuando el token trae
+    los claims de `claims_de`; los tokens anteriores siguen la ruta normal
+    """
+
+    def get_user(self, validated_token):
+        if 'email' not in validated_token or 'activo' not in validated_token:
+            return super().get_user(validated_token)
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        if not validated_token['activo']:
+            raise AuthenticationFailed("El usuario está inactivo", code="user_inactive")
+        if revocado(user_id, validated_token.get('revision', 0)):
+            raise AuthenticationFailed("Token revocado: vuelva a iniciar sesión", code="token_revoked")
+        return UsuarioToken(validated_token)
+
+
+# ←–– Emisión de tokens ––→
+
+class TokenConClaimsSerializer(TokenObtainPairSerializer):
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        if not self.user.activo:
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        return data
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim, valor in claims_de(user).items():
+            token[claim] = valor
+        return token
+
+
+class TokenRefreshConClaimsSerializer(TokenRefreshSerializer):
+    """
+    Renueva el access token con los claims actuales del usuario. Un refresh
+    token revocado obliga a iniciar sesión otra vez.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        if revocado(user_id, refresh.get('revision', 0)):
+            raise AuthenticationFailed("Token revocado: vuelva a iniciar sesión", code="token_revoked")
+
+        usuario = (
+            get_user_model().objects.select_related('rol')
+            .filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        )
+        if usuario is None or not usuario.activo or not api_settings.USER_AUTHENTICATION_RULE(usuario):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+
+        claims = claims_de(usuario)
+        access = refresh.access_token
+        access.set_iat()
+        for claim, valor in claims.items():
+            access[claim] = valor
+        data = {'access': str(access)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            for claim, valor in claims.items():
+                refresh[claim] = valor
+            data['refresh'] = str(refresh)
+        return data
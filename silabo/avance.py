@@ -0,0 +1,257 @@
+from django.db import transaction
+from django.db.models import Avg, Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import (
+    AvanceSilabo, CargaCurso, PeriodoLectivo, ResumenAvance, Silabo,
+    Unidad, Semana, ContenidoEspecifico, Bibliografia, Actividad, CriterioEvaluacion,
+)
+
+
+# ─────────────────────────────────────────────
+#  Tablero de avance de sílabos (tablas materializadas)
+# ─────────────────────────────────────────────
+#
+# AvanceSilabo guarda los conteos del árbol de cada sílabo activo y el
+# `fecha_modificacion_arbol` con que se calcularon: cada actualización
+# recalcula, con una sola consulta, sólo los sílabos cuyo sello avanzó (las
+# señales y las escrituras masivas lo mantienen al día). ResumenAvance se
+# reconstruye después con tres consultas agrupadas, así que el tablero lee
+# siempre tablas pequeñas. `actualizar_avance` se programa cada pocos minutos
+# (en Vercel, el cron de vercel.json llama a /silabo/avance/actualizar/); con
+# --completo recalcula todo (p. ej. tras mover sílabos de periodo con
+# QuerySet.update(), que no mueve el sello). Los sílabos sin
+# `fecha_modificacion_arbol` usan `fecha_modificacion` como sello, igual que
+# condicional.py.
+
+# conteo: (modelo, ruta hasta el sílabo)
+CONTEOS = {
+    'unidades': (Unidad, 'silabo'),
+    'semanas': (Semana, 'unidad__silabo'),
+    'contenidos': (ContenidoEspecifico, 'semana__unidad__silabo'),
+    'bibliografias': (Bibliografia, 'unidad__silabo'),
+    'actividades': (Actividad, 'silabo'),
+    'criterios': (CriterioEvaluacion, 'silabo'),
+}
+
+PESO_COMPLETO = 100
+RUTA_CARRERA_CURSO = 'curso__semestre__plan__carrera'
+
+
+def _activos(model, ruta):
+    """
+    Filas activas de `model` cuyos ancestros hasta el sílabo también lo están
+    """
+    partes = ruta.split('__')[:-1]
+    ancestros = {'__'.join(partes[:i + 1]) + '__activo': True for i in range(len(partes))}
+    return model.objects.filter(activo=True, **ancestros)
+
+
+def _conteo(model, ruta):
+    subconsulta = (
+        _activos(model, ruta).filter(**{ruta: OuterRef('pk')})
+        .order_by().values(ruta).annotate(n=Count('pk')).values('n')
+    )
+    return Coalesce(Subquery(subconsulta), 0)
+
+
+def _peso():
+    subconsulta = (
+        _activos(CriterioEvaluacion, 'silabo').filter(silabo=OuterRef('pk'))
+        .order_by().values('silabo').annotate(total=Sum('peso')).values('total')
+    )
+    return Coalesce(Subquery(subconsulta), 0.0)
+
+
+def porcentaje_de(fila):
+    """
+    Parte de los requisitos que cumple el sílabo: cada nivel del árbol con
+    al menos un elemento, criterios que suman 100 y sumilla
+    """
+    requisitos = [fila[conteo] > 0 for conteo in CONTEOS]
+    requisitos.append(abs(fila['peso_criterios'] - PESO_COMPLETO) < 0.01)
+    requisitos.append(bool(fila['sumilla']))
+    return round(100 * sum(requisitos) / len(requisitos))
+
+
+def _sello():
+    return Coalesce('fecha_modificacion_arbol', 'fecha_modificacion')
+
+
+def pendientes():
+    """
+    Sílabos activos sin fila de avance o modificados desde que se calculó
+    """
+    return Silabo.objects.filter(activo=True).annotate(sello=_sello()).filter(
+        Q(avance__isnull=True)
+        | Q(avance__fecha_arbol__isnull=True)
+        | Q(sello__gt=F('avance__fecha_arbol'))
+    )
+
+
+def _filas_de_avance(silabos):
+    filas = silabos.annotate(
+        peso_criterios=_peso(), sello_arbol=_sello(),
+        **{f'total_{nombre}': _conteo(*conteo) for nombre, conteo in CONTEOS.items()}
+    ).values(
+        'id', 'periodo_lectivo_id', 'facultad_id', 'carrera_id', 'curso_id', 'profesor_id',
+        'sumilla', 'sello_arbol', 'peso_criterios', *(f'total_{nombre}' for nombre in CONTEOS),
+    )
+    for fila in filas:
+        # Las anotaciones llevan prefijo: `unidades` y `actividades` son relaciones de Silabo
+        fila.update({nombre: fila.pop(f'total_{nombre}') for nombre in CONTEOS})
+        porcentaje = porcentaje_de(fila)
+        yield AvanceSilabo(
+            silabo_id=fila['id'],
+            periodo_lectivo_id=fila['periodo_lectivo_id'], facultad_id=fila['facultad_id'],
+            carrera_id=fila['carrera_id'], curso_id=fila['curso_id'], profesor_id=fila['profesor_id'],
+            peso_criterios=fila['peso_criterios'], porcentaje=porcentaje, completo=porcentaje == 100,
+            fecha_arbol=fila['sello_arbol'],
+            **{conteo: fila[conteo] for conteo in CONTEOS},
+        )
+
+
+CAMPOS_AVANCE = [
+    'periodo_lectivo', 'facultad', 'carrera', 'curso', 'profesor', *CONTEOS,
+    'peso_criterios', 'porcentaje', 'completo', 'fecha_arbol',
+]
+
+
+def _por_grupo(filas, *claves):
+    return {tuple(fila[clave] for clave in claves): fila for fila in filas}
+
+
+def reconstruir_resumen():
+    """
+    Reescribe ResumenAvance: una fila por periodo activo (o con sílabos) y
+    por cada carrera con cargas o sílabos
+    """
+    ahora = timezone.now()
+    avance = _por_grupo(
+        AvanceSilabo.objects.values('periodo_lectivo_id', 'facultad_id', 'carrera_id').annotate(
+            silabos=Count('pk'),
+            completos=Count('pk', filter=Q(completo=True)),
+            porcentaje_promedio=Avg('porcentaje'),
+        ).order_by(),
+        'periodo_lectivo_id', 'facultad_id', 'carrera_id',
+    )
+    cargas = CargaCurso.objects.filter(activo=True, profesor__isnull=False, curso__isnull=False)
+    grupo_de_carga = {
+        'carrera_id': F(f'{RUTA_CARRERA_CURSO}_id'),
+        'facultad_id': F(f'{RUTA_CARRERA_CURSO}__departamento__facultad_id'),
+    }
+    asignadas = _por_grupo(
+        cargas.values(**grupo_de_carga).annotate(total=Count('pk')).order_by(),
+        'facultad_id', 'carrera_id',
+    )
+    # La carga tiene sílabo en un periodo si su profesor tiene sílabo activo
+    # del curso en ese periodo
+    con_silabo = _por_grupo(
+        cargas.filter(curso__silabos__profesor_id=F('profesor_id'), curso__silabos__activo=True)
+        .values(periodo_lectivo_id=F('curso__silabos__periodo_lectivo_id'), **grupo_de_carga)
+        .annotate(total=Count('pk', distinct=True)).order_by(),
+        'periodo_lectivo_id', 'facultad_id', 'carrera_id',
+    )
+
+    periodos = set(PeriodoLectivo.objects.filter(activo=True).values_list('pk', flat=True))
+    periodos |= {periodo for periodo, _, _ in avance}
+    grupos = set(avance) | set(con_silabo) | {(periodo, *clave) for periodo in periodos for clave in asignadas}
+    resumen = []
+    for clave in grupos:
+        periodo, facultad, carrera = clave
+        fila = avance.get(clave, {})
+        resumen.append(ResumenAvance(
+            periodo_lectivo_id=periodo, facultad_id=facultad, carrera_id=carrera,
+            cargas=asignadas.get((facultad, carrera), {}).get('total', 0),
+            cargas_con_silabo=con_silabo.get(clave, {}).get('total', 0),
+            silabos=fila.get('silabos', 0), completos=fila.get('completos', 0),
+            porcentaje_promedio=fila.get('porcentaje_promedio') or 0, actualizado=ahora,
+        ))
+    ResumenAvance.objects.all().delete()
+    ResumenAvance.objects.bulk_create(resumen, batch_size=1000)
+    return len(resumen)
+
+
+def actualizar_avance(completo=False):
+    """
+    Recalcula las filas de avance pendientes (o todas) y el resumen.
+    Devuelve cuántos sílabos se recalcularon y cuántos se retiraron.
+    """
+    with transaction.atomic():
+        silabos = Silabo.objects.filter(activo=True) if completo else pendientes()
+        avances = list(_filas_de_avance(silabos))
+        AvanceSilabo.objects.bulk_create(
+            avances, batch_size=1000,
+            update_conflicts=True, unique_fields=['silabo'], update_fields=CAMPOS_AVANCE,
+        )
+        retirados, _ = AvanceSilabo.objects.filter(silabo__activo=False).delete()
+        reconstruir_resumen()
+    return len(avances), retirados
+
+
+# ←–– Tablero ––→
+
+# Columna con el nombre de cada nivel del resumen
+NOMBRES = {'periodo_lectivo': 'periodo', 'facultad': 'nombre', 'carrera': 'nombre'}
+
+CAMPOS_FILA = ['silabo_id', 'curso_id', 'profesor_id', *CONTEOS, 'peso_criterios', 'porcentaje', 'completo']
+
+
+def nivel_de(periodo_id=None, facultad_id=None, carrera_id=None):
+    """
+    Nivel de detalle según los filtros: periodo → facultad → carrera → sílabo
+    """
+    if not periodo_id:
+        return 'periodo_lectivo'
+    if carrera_id:
+        return 'silabo'
+    return 'carrera' if facultad_id else 'facultad'
+
+
+SUMAS = ('cargas', 'cargas_con_silabo', 'silabos', 'completos')
+
+
+def _totales(resumen, nivel):
+    filas = (
+        resumen.values(f'{nivel}_id', nombre=F(f'{nivel}__{NOMBRES[nivel]}'))
+        .annotate(
+            ponderado=Sum(F('porcentaje_promedio') * F('silabos')),
+            **{f'total_{campo}': Sum(campo) for campo in SUMAS},
+        )
+        .order_by(F(f'{nivel}_id').asc(nulls_last=True))
+    )
+    resultados = []
+    for fila in filas:
+        totales = {campo: fila[f'total_{campo}'] for campo in SUMAS}
+        silabos = totales['silabos']
+        resultados.append({
+            'id': fila[f'{nivel}_id'], 'nombre': fila['nombre'], **totales,
+            'porcentaje_promedio': round((fila['ponderado'] or 0) / silabos, 1) if silabos else 0,
+        })
+    return resultados
+
+
+def _filas(avances):
+    return avances.values(*CAMPOS_FILA, nombre=F('silabo__nombre'))
+
+
+def avance_de_silabo(silabo_id):
+    return _filas(AvanceSilabo.objects.filter(pk=silabo_id)).first()
+
+
+def tablero(periodo_id=None, facultad_id=None, carrera_id=None):
+    """
+    Avance agregado en el nivel siguiente a los filtros; con periodo y
+    carrera, la fila de cada sílabo. Sólo lee las tablas materializadas.
+    """
+    filtros = {'periodo_lectivo_id': periodo_id, 'facultad_id': facultad_id, 'carrera_id': carrera_id}
+    filtros = {campo: valor for campo, valor in filtros.items() if valor}
+    nivel = nivel_de(periodo_id, facultad_id, carrera_id)
+    actualizado = ResumenAvance.objects.order_by('-actualizado').values_list('actualizado', flat=True).first()
+    if nivel == 'silabo':
+        filas = AvanceSilabo.objects.filter(**filtros).order_by('porcentaje', 'silabo_id')
+        resultados = list(_filas(filas))
+    else:
+        resultados = _totales(ResumenAvance.objects.filter(**filtros), nivel)
+    return {'nivel': nivel, 'actualizado': actualizado, 'resultados': resultados}
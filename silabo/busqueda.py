@@ -0,0 +1,255 @@
+import math
+import re
+import unicodedata
+from collections import defaultdict
+
+from django.db import connection
+from django.db.models import F
+
+from .cache import versiones
+from .models import Silabo, Curso, Unidad, Semana, ContenidoEspecifico
+
+
+# ─────────────────────────────────────────────
+#  Búsqueda de texto completo en sílabos
+# ─────────────────────────────────────────────
+#
+# En PostgreSQL cada tabla con texto buscable tiene una columna `busqueda`
+# (tsvector generado, diccionario `spanish` + unaccent) con índice GIN; la
+# crea `python manage.py configurar_busqueda` y el propio motor la mantiene
+# al día en cada escritura. Sin esas columnas (SQLite en pruebas, entornos de
+# desarrollo) se usa un índice invertido en memoria con la misma ponderación.
+
+# Pesos equivalentes a setweight A/B/C/D de PostgreSQL
+PESOS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+# Texto de cada tabla: (columnas, peso)
+CAMPOS = {
+    Silabo: [(('nombre',), 'A'), (('sumilla',), 'B'),
+             (('competencia_curso', 'competencia_perfil_egreso', 'competencia_profesional'), 'C')],
+    Curso: [(('nombre',), 'A'), (('descripcion',), 'B')],
+    Unidad: [(('descripcion',), 'C')],
+    ContenidoEspecifico: [(('contenido',), 'D')],
+}
+
+STOPWORDS = frozenset("""
+    a al ante bajo con contra de del desde durante e el en entre es hacia hasta la las le lo los
+    mas mediante o para pero por que se sin sobre su sus tras u un una unas unos y
+""".split())
+SUFIJOS = (
+    'amientos', 'imientos', 'amiento', 'imiento', 'aciones', 'uciones', 'acion', 'ucion',
+    'mente', 'idades', 'idad', 'ismos', 'ismo', 'istas', 'ista', 'ables', 'able',
+    'ibles', 'ible', 'ivos', 'ivas', 'ivo', 'iva', 'es', 's', 'a', 'o', 'e',
+)
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def sin_tildes(texto):
+    return ''.join(c for c in unicodedata.normalize('NFKD', texto) if not unicodedata.combining(c))
+
+
+def raiz(token):
+    """
+    Reducción de sufijos aproximada al stemmer `spanish` de PostgreSQL
+    """
+    for sufijo in SUFIJOS:
+        if token.endswith(sufijo) and len(token) - len(sufijo) >= 3:
+            return token[:-len(sufijo)]
+    return token
+
+
+def terminos(texto):
+    return [
+        raiz(token)
+        for token in TOKEN_RE.findall(sin_tildes(texto or '').lower())
+        if token not in STOPWORDS
+    ]
+
+
+# ←–– Índice invertido en memoria ––→
+
+class IndiceInvertido:
+    """
+    termino → {silabo_id: peso acumulado}. Se construye con una consulta por
+    tabla y se reconstruye cuando cambia la versión de alguno de los modelos.
+    """
+    MODELOS = (Silabo, Curso, Unidad, Semana, ContenidoEspecifico)
+
+    def __init__(self):
+        self.postings = defaultdict(lambda: defaultdict(float))
+        self.silabos = {}
+
+    def _agregar(self, silabo_id, texto, peso):
+        for termino in terminos(texto):
+            self.postings[termino][silabo_id] += PESOS[peso]
+
+    def _agregar_campos(self, model, silabo_ids, fila):
+        for columnas, peso in CAMPOS[model]:
+            texto = ' '.join(fila[c] or '' for c in columnas)
+            for silabo_id in silabo_ids:
+                self._agregar(silabo_id, texto, peso)
+
+    @classmethod
+    def construir(cls):
+        indice = cls()
+        columnas_silabo = [c for columnas, _ in CAMPOS[Silabo] for c in columnas]
+        silabos_por_curso = defaultdict(list)
+        for fila in Silabo.objects.filter(activo=True).values(
+            'id', 'curso_id', 'periodo_lectivo_id', 'carrera_id', *columnas_silabo
+        ):
+            indice.silabos[fila['id']] = fila
+            silabos_por_curso[fila['curso_id']].append(fila['id'])
+            indice._agregar_campos(Silabo, [fila['id']], fila)
+
+        for fila in Curso.objects.filter(id__in=silabos_por_curso).values('id', 'nombre', 'descripcion'):
+            indice._agregar_campos(Curso, silabos_por_curso[fila['id']], fila)
+
+        for fila in Unidad.objects.filter(activo=True, silabo_id__in=indice.silabos).values('silabo_id', 'descripcion'):
+            indice._agregar_campos(Unidad, [fila['silabo_id']], fila)
+
+        for fila in ContenidoEspecifico.objects.filter(
+            activo=True, semana__activo=True, semana__unidad__activo=True,
+            semana__unidad__silabo_id__in=indice.silabos,
+        ).values('contenido', silabo_id=F('semana__unidad__silabo_id')):
+            indice._agregar_campos(ContenidoEspecifico, [fila['silabo_id']], fila)
+        return indice
+
+    def buscar(self, consulta, periodo_id=None, carrera_id=None, limite=20):
+        total = len(self.silabos) or 1
+        puntajes = defaultdict(float)
+        for termino in set(terminos(consulta)):
+            postings = self.postings.get(termino)
+            if not postings:
+                continue
+            idf = math.log(1 + total / len(postings))
+            for silabo_id, peso in postings.items():
+                puntajes[silabo_id] += peso * idf
+
+        resultados = []
+        for silabo_id, rank in puntajes.items():
+            silabo = self.silabos[silabo_id]
+            if periodo_id and str(silabo['periodo_lectivo_id']) != str(periodo_id):
+                continue
+            if carrera_id and str(silabo['carrera_id']) != str(carrera_id):
+                continue
+            resultados.append((silabo_id, rank))
+        resultados.sort(key=lambda r: (-r[1], r[0]))
+        return resultados[:limite]
+
+
+_indice = {'version': None, 'indice': None}
+
+
+def indice_en_memoria():
+    version = tuple(versiones(*IndiceInvertido.MODELOS))
+    if _indice['version'] != version:
+        _indice['indice'] = IndiceInvertido.construir()
+        _indice['version'] = version
+    return _indice['indice']
+
+
+# ←–– PostgreSQL ––→
+
+FUNCION_UNACCENT = 'silabo_unaccent'
+COLUMNA = 'busqueda'
+
+
+def _expresion_tsvector(model):
+    partes = []
+    for columnas, peso in CAMPOS[model]:
+        texto = " || ' ' || ".join(f"coalesce({c}, '')" for c in columnas)
+        partes.append(f"setweight(to_tsvector('spanish', {FUNCION_UNACCENT}({texto})), '{peso}')")
+    return ' || '.join(partes)
+
+
+def sql_configuracion():
+    """
+    DDL que crea las columnas tsvector generadas y sus índices GIN
+    """
+    sentencias = [
+        "CREATE EXTENSION IF NOT EXISTS unaccent",
+        # unaccent() no es IMMUTABLE; la envoltura con diccionario fijo sí
+        # puede usarse en columnas generadas e índices
+        f"""CREATE OR REPLACE FUNCTION {FUNCION_UNACCENT}(text) RETURNS text
+            AS $$ SELECT public.unaccent('public.unaccent', $1) $$
+            LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT""",
+    ]
+    for model in CAMPOS:
+        tabla = model._meta.db_table
+        sentencias.append(
+            f"ALTER TABLE {tabla} ADD COLUMN IF NOT EXISTS {COLUMNA} tsvector "
+            f"GENERATED ALWAYS AS ({_expresion_tsvector(model)}) STORED"
+        )
+        sentencias.append(f"CREATE INDEX IF NOT EXISTS {tabla}_{COLUMNA}_gin ON {tabla} USING gin ({COLUMNA})")
+    return sentencias
+
+
+_postgres_configurado = {}
+
+
+def usa_postgres():
+    if connection.vendor != 'postgresql':
+        return False
+    if connection.alias not in _postgres_configurado:
+        tabla = ContenidoEspecifico._meta.db_table
+        with connection.cursor() as cursor:
+            columnas = connection.introspection.get_table_description(cursor, tabla)
+        _postgres_configurado[connection.alias] = any(c.name == COLUMNA for c in columnas)
+    return _postgres_configurado[connection.alias]
+
+
+def _buscar_postgres(consulta, periodo_id=None, carrera_id=None, limite=20):
+    silabo_t = Silabo._meta.db_table
+    curso_t = Curso._meta.db_table
+    unidad_t = Unidad._meta.db_table
+    semana_t = Semana._meta.db_table
+    contenido_t = ContenidoEspecifico._meta.db_table
+
+    filtros, params = '', [consulta]
+    if periodo_id:
+        filtros += ' AND s.periodo_lectivo_id = %s'
+        params.append(periodo_id)
+    if carrera_id:
+        filtros += ' AND s.carrera_id = %s'
+        params.append(carrera_id)
+    params.append(limite)
+
+    sql = f"""
+        WITH q AS (SELECT websearch_to_tsquery('spanish', {FUNCION_UNACCENT}(%s)) AS q),
+        coincidencias AS (
+            SELECT s.id AS silabo_id, ts_rank(s.{COLUMNA}, q.q) AS rank
+            FROM {silabo_t} s, q WHERE s.{COLUMNA} @@ q.q
+            UNION ALL
+            SELECT s.id, ts_rank(c.{COLUMNA}, q.q)
+            FROM {curso_t} c JOIN {silabo_t} s ON s.curso_id = c.id, q
+            WHERE c.{COLUMNA} @@ q.q
+            UNION ALL
+            SELECT u.silabo_id, ts_rank(u.{COLUMNA}, q.q)
+            FROM {unidad_t} u, q WHERE u.{COLUMNA} @@ q.q AND u.activo
+            UNION ALL
+            SELECT u.silabo_id, ts_rank(ce.{COLUMNA}, q.q)
+            FROM {contenido_t} ce
+            JOIN {semana_t} se ON se.id = ce.semana_id
+            JOIN {unidad_t} u ON u.id = se.unidad_id, q
+            WHERE ce.{COLUMNA} @@ q.q AND ce.activo AND se.activo AND u.activo
+        )
+        SELECT c.silabo_id, sum(c.rank) AS rank
+        FROM coincidencias c JOIN {silabo_t} s ON s.id = c.silabo_id
+        WHERE s.activo{filtros}
+        GROUP BY c.silabo_id
+        ORDER BY rank DESC, c.silabo_id
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(silabo_id, float(rank)) for silabo_id, rank in cursor.fetchall()]
+
+
+def buscar(consulta, periodo_id=None, carrera_id=None, limite=20):
+    """
+    Sílabos que mencionan `consulta`, ordenados por relevancia.
+    Devuelve (motor, [(silabo_id, rank), ...]).
+    """
+    if usa_postgres():
+        return 'postgres', _buscar_postgres(consulta, periodo_id, carrera_id, limite)
+    return 'memoria', indice_en_memoria().buscar(consulta, periodo_id, carrera_id, limite)
@@ -0,0 +1,122 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+
+# ─────────────────────────────────────────────
+#  Caché versionada de respuestas
+# ─────────────────────────────────────────────
+#
+# Cada modelo tiene un número de versión en la caché. Las claves de las
+# respuestas incluyen la versión de todos los modelos que intervienen, así
+# que al guardar o borrar una fila (ver signals.py) basta con incrementar la
+# versión de su modelo: las entradas anteriores dejan de ser alcanzables y
+# expiran solas. Las escrituras masivas con `QuerySet.update()` no disparan
+# señales y deben llamar a `invalidar_modelo` explícitamente.
+
+PREFIJO = 'silabo'
+
+
+def get_cache():
+    return caches[getattr(settings, 'SILABO_CACHE_ALIAS', 'default')]
+
+
+def _clave_version(model):
+    nombre = model if isinstance(model, str) else model._meta.label_lower
+    return f"{PREFIJO}:version:{nombre}"
+
+
+def versiones(*modelos):
+    """
+    Versión actual de cada modelo (o nombre arbitrario), inicializándola si no existe
+    """
+    cache = get_cache()
+    claves = [_clave_version(m) for m in modelos]
+    actuales = cache.get_many(claves)
+    for clave in claves:
+        if clave not in actuales:
+            # Un valor basado en el reloj evita reutilizar versiones antiguas
+            # si la caché se vació
+            cache.add(clave, time.time_ns(), timeout=None)
+            actuales[clave] = cache.get(clave)
+    return [actuales[clave] for clave in claves]
+
+
+def invalidar_modelo(model):
+    cache = get_cache()
+    clave = _clave_version(model)
+    try:
+        cache.incr(clave)
+    except ValueError:
+        cache.set(clave, time.time_ns(), timeout=None)
+
+
+# ─────────────────────────────────────────────
+#  Contadores de aciertos / fallos
+# ─────────────────────────────────────────────
+
+def _contar(evento):
+    cache = get_cache()
+    clave = f"{PREFIJO}:stats:{evento}"
+    try:
+        cache.incr(clave)
+    except ValueError:
+        cache.add(clave, 1, timeout=None)
+
+
+def estadisticas():
+    cache = get_cache()
+    hits = cache.get(f"{PREFIJO}:stats:hit", 0)
+    misses = cache.get(f"{PREFIJO}:stats:miss", 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'ratio': round(hits / total, 4) if total else None,
+    }
+
+
+# ─────────────────────────────────────────────
+#  Respuestas
+# ─────────────────────────────────────────────
+
+def clave_respuesta(request, modelos):
+    partes = [request.get_full_path()] + [str(v) for v in versiones(*modelos)]
+    digest = hashlib.md5('|'.join(partes).encode('utf-8')).hexdigest()
+    return f"{PREFIJO}:resp:{digest}"
+
+
+def respuesta_cacheada(request, modelos, generar):
+    """
+    Devuelve la respuesta guardada para la petición o la genera con
+    `generar()` y la guarda si es un 200
+    """
+    cache = get_cache()
+    clave = clave_respuesta(request, modelos)
+    data = cache.get(clave)
+    if data is not None:
+        _contar('hit')
+        return Response(data)
+
+    _contar('miss')
+    response = generar()
+    if response.status_code == 200:
+        timeout = getattr(settings, 'SILABO_CACHE_TIMEOUT', 3600)
+        cache.set(clave, response.data, timeout=timeout)
+    return response
+
+
+def cache_respuesta(*modelos):
+    """
+    Decorador para acciones GET de un viewset cuya respuesta depende de `modelos`
+    """
+    def decorador(func):
+        @wraps(func)
+        def wrapper(self, request, *args, **kwargs):
+            return respuesta_cacheada(request, modelos, lambda: func(self, request, *args, **kwargs))
+        return wrapper
+    return decorador
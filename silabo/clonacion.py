@@ -0,0 +1,195 @@
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+
+from .models import (
+    SemestreAcademico, Silabo, Unidad, Semana, ContenidoEspecifico, Bibliografia,
+    Actividad, CriterioEvaluacion,
+)
+from .signals import notificar_cambio_masivo
+
+
+# ─────────────────────────────────────────────
+#  Clonación de sílabos a otro periodo lectivo
+# ─────────────────────────────────────────────
+#
+# Se copia un nivel del árbol por vez (sílabos, unidades, semanas, ...) y
+# sólo las filas activas, todo en una transacción. En PostgreSQL cada nivel
+# son dos sentencias: una tabla temporal con el mapeo id viejo → id nuevo
+# (reservado con nextval) y un INSERT ... SELECT que toma el padre nuevo de
+# ese mapeo. En otros motores se usa un SELECT y un bulk_create por nivel.
+# Las fechas de unidades y criterios se desplazan los días que separan el
+# inicio del SemestreAcademico de origen del de destino.
+
+# (modelo, campo del padre); cada padre aparece antes que sus hijos
+NIVELES = (
+    (Unidad, 'silabo'),
+    (Semana, 'unidad'),
+    (ContenidoEspecifico, 'semana'),
+    (Bibliografia, 'unidad'),
+    (Actividad, 'silabo'),
+    (CriterioEvaluacion, 'silabo'),
+)
+
+FECHAS_DESPLAZADAS = {
+    Unidad: ('inicio', 'final'),
+    CriterioEvaluacion: ('fecha_inicio', 'fecha_fin'),
+}
+
+
+def semestre_de_periodo(periodo):
+    """
+    SemestreAcademico con el mismo nombre que el periodo lectivo ('2025-I')
+    """
+    return SemestreAcademico.objects.filter(nombre=periodo.periodo).order_by('-fecha_inicio').first()
+
+
+def dias_entre(origen, destino):
+    if origen is None or destino is None:
+        return 0
+    return (destino.fecha_inicio - origen.fecha_inicio).days
+
+
+def pendientes_de_clonar(silabos, destino):
+    """
+    Excluye los sílabos cuyo curso ya tiene un sílabo activo del mismo
+    profesor en el periodo `destino`
+    """
+    return silabos.exclude(Exists(Silabo.objects.filter(
+        periodo_lectivo=destino, curso=OuterRef('curso'), profesor=OuterRef('profesor'), activo=True,
+    )))
+
+
+def _nombre(nombre, origen, destino):
+    return nombre.replace(origen.periodo, destino.periodo) if nombre and origen.periodo else nombre
+
+
+def _desplazados(model, fila, dias):
+    for campo in FECHAS_DESPLAZADAS.get(model, ()):
+        fila[campo] += timedelta(days=dias)
+    return fila
+
+
+# ←–– PostgreSQL: INSERT ... SELECT ––→
+
+def _tabla_mapa(model):
+    return f'clon_{model._meta.model_name}'
+
+
+def _copiar_nivel_sql(cursor, model, seleccion, params, reemplazos, padre=None):
+    """
+    Reserva ids nuevos para las filas de `model` que devuelve `seleccion`
+    (alias t) y las copia aplicando `reemplazos` {columna: (sql, params)}.
+    `padre` es (tabla de mapeo del padre, columna), disponible como alias p.
+    """
+    tabla = model._meta.db_table
+    mapa = _tabla_mapa(model)
+    cursor.execute(f"DROP TABLE IF EXISTS {mapa}")
+    cursor.execute(f"CREATE TEMP TABLE {mapa} (viejo bigint PRIMARY KEY, nuevo bigint NOT NULL) ON COMMIT DROP")
+    cursor.execute(
+        f"INSERT INTO {mapa} (viejo, nuevo) "
+        f"SELECT t.id, nextval(pg_get_serial_sequence('{tabla}', 'id')) {seleccion}",
+        params,
+    )
+
+    columnas, expresiones, valores = ['id'], ['m.nuevo'], []
+    for campo in model._meta.concrete_fields:
+        if campo.primary_key:
+            continue
+        columnas.append(campo.column)
+        sql, parametros = reemplazos.get(campo.column, (f't.{campo.column}', []))
+        if getattr(campo, 'auto_now', False) or getattr(campo, 'auto_now_add', False):
+            sql, parametros = 'now()', []
+        expresiones.append(sql)
+        valores.extend(parametros)
+    union_padre = f"JOIN {padre[0]} p ON p.viejo = t.{padre[1]}" if padre else ''
+    cursor.execute(
+        f"INSERT INTO {tabla} ({', '.join(columnas)}) "
+        f"SELECT {', '.join(expresiones)} FROM {tabla} t JOIN {mapa} m ON m.viejo = t.id {union_padre}",
+        valores,
+    )
+    cursor.execute(f"SELECT viejo, nuevo FROM {mapa}")
+    return dict(cursor.fetchall())
+
+
+def _clonar_sql(silabos, origen, destino, dias, profesor_id):
+    consulta, params = silabos.values('id').query.sql_with_params()
+    copiados = {}
+    with connection.cursor() as cursor:
+        reemplazos = {
+            'periodo_lectivo_id': ('%s', [destino.pk]),
+            'nombre': ('REPLACE(t.nombre, %s, %s)', [origen.periodo, destino.periodo]),
+        }
+        if profesor_id is not None:
+            reemplazos['profesor_id'] = ('%s', [profesor_id])
+        mapa_silabos = _copiar_nivel_sql(
+            cursor, Silabo, f"FROM {Silabo._meta.db_table} t WHERE t.id IN ({consulta})", params, reemplazos,
+        )
+        copiados[Silabo] = list(mapa_silabos.values())
+
+        for model, padre in NIVELES:
+            columna_padre = model._meta.get_field(padre).column
+            mapa_padre = _tabla_mapa(model._meta.get_field(padre).related_model)
+            reemplazos = {columna_padre: ('p.nuevo', [])}
+            for campo in FECHAS_DESPLAZADAS.get(model, ()):
+                reemplazos[campo] = (f't.{campo} + %s::integer', [dias])
+            mapa = _copiar_nivel_sql(
+                cursor, model,
+                f"FROM {model._meta.db_table} t JOIN {mapa_padre} p ON p.viejo = t.{columna_padre} WHERE t.activo",
+                [], reemplazos, padre=(mapa_padre, columna_padre),
+            )
+            copiados[model] = list(mapa.values())
+
+        for model in (Silabo, *(model for model, _ in NIVELES)):
+            cursor.execute(f"DROP TABLE IF EXISTS {_tabla_mapa(model)}")
+    return mapa_silabos, copiados
+
+
+# ←–– Otros motores: bulk_create por nivel ––→
+
+def _copiar_nivel_orm(model, filas, transformar):
+    filas = list(filas)
+    nuevos = [model(**transformar({k: v for k, v in fila.items() if k != 'id'})) for fila in filas]
+    model.objects.bulk_create(nuevos)
+    return {fila['id']: nuevo.pk for fila, nuevo in zip(filas, nuevos)}
+
+
+def _clonar_orm(silabos, origen, destino, dias, profesor_id):
+    def silabo_nuevo(fila):
+        fila['periodo_lectivo_id'] = destino.pk
+        fila['nombre'] = _nombre(fila['nombre'], origen, destino)
+        if profesor_id is not None:
+            fila['profesor_id'] = profesor_id
+        return fila
+
+    mapas = {Silabo: _copiar_nivel_orm(Silabo, silabos.values(), silabo_nuevo)}
+    for model, padre in NIVELES:
+        columna_padre = model._meta.get_field(padre).attname
+        mapa_padre = mapas[model._meta.get_field(padre).related_model]
+
+        def transformar(fila, model=model, columna_padre=columna_padre, mapa_padre=mapa_padre):
+            fila[columna_padre] = mapa_padre[fila[columna_padre]]
+            return _desplazados(model, fila, dias)
+
+        filas = model.objects.filter(**{f'{columna_padre}__in': list(mapa_padre), 'activo': True}).values()
+        mapas[model] = _copiar_nivel_orm(model, filas, transformar)
+    return mapas[Silabo], {model: list(mapa.values()) for model, mapa in mapas.items()}
+
+
+def clonar_silabos(silabos, origen, destino, dias=0, profesor_id=None):
+    """
+    Copia los sílabos `silabos` (queryset del periodo `origen`) con todo su
+    árbol activo al periodo `destino`. Devuelve el mapeo
+    {sílabo original: sílabo nuevo} y el número de filas copiadas por modelo.
+    """
+    clonar = _clonar_sql if connection.vendor == 'postgresql' else _clonar_orm
+    with transaction.atomic():
+        mapa, copiados = clonar(silabos.order_by(), origen, destino, dias, profesor_id)
+        notificar_cambio_masivo(Silabo, copiados.pop(Silabo), accion='clonar')
+        # Los sílabos nuevos ya tienen el sello de ahora: no hace falta tocarlos
+        for model, pks in copiados.items():
+            if pks:
+                notificar_cambio_masivo(model, pks, accion='clonar', tocar=False)
+    totales = {model._meta.model_name: len(pks) for model, pks in copiados.items()}
+    return mapa, {'silabo': len(mapa), **totales}
@@ -0,0 +1,57 @@
+import hashlib
+from calendar import timegm
+from functools import wraps
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .cache import versiones
+from .models import Silabo
+
+
+def condicional_silabo(*modelos):
+    """
+    GET condicional (ETag / Last-Modified) para vistas de detalle de un sílabo.
+
+    El sello es `Silabo.fecha_modificacion_arbol`, que se actualiza con
+    cualquier escritura en el árbol. Si la representación incluye datos de
+    otros modelos (`modelos`, p. ej. el profesor o el curso anidados), sus
+    versiones de caché entran en el ETag y `If-Modified-Since` no se usa
+    para decidir el 304, porque esos cambios no mueven el sello.
+    Una respuesta 304 cuesta una sola consulta y no serializa nada.
+    """
+    def decorador(func):
+        @wraps(func)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return func(self, request, *args, **kwargs)
+
+            pk = kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+            fila = (
+                Silabo.objects.filter(pk=pk)
+                .values_list('fecha_modificacion_arbol', 'fecha_modificacion')
+                .first()
+            )
+            if fila is None:
+                return func(self, request, *args, **kwargs)
+
+            sello = fila[0] or fila[1]
+            partes = [str(pk), sello.isoformat(), self.action, request.get_full_path()]
+            partes += [str(v) for v in versiones(*modelos)]
+            etag = '"%s"' % hashlib.md5('|'.join(partes).encode('utf-8')).hexdigest()
+            last_modified = timegm(sello.utctimetuple())
+
+            no_modificado = get_conditional_response(
+                request, etag=etag, last_modified=None if modelos else last_modified
+            )
+            if no_modificado is not None:
+                return no_modificado
+
+            response = func(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                response['ETag'] = etag
+                response['Last-Modified'] = http_date(last_modified)
+                response['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorador
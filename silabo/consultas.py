@@ -0,0 +1,170 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+from .models import (
+    Profesor, Estudiante, PlanCurricular, SemestrePlan, CargaCurso, Grupo,
+    Silabo, Unidad, Semana, ContenidoEspecifico, Bibliografia,
+    Actividad, CriterioEvaluacion,
+)
+
+
+# ─────────────────────────────────────────────
+#  Documento completo del sílabo
+# ─────────────────────────────────────────────
+
+def prefetch_documento():
+    """
+    Prefetch del árbol completo de un sílabo (sólo registros activos).
+
+    Cada nivel se resuelve con una única consulta, sin importar el tamaño
+    del sílabo: unidades, semanas, contenidos, bibliografías, actividades
+    y criterios de evaluación.
+    """
+    contenidos = ContenidoEspecifico.objects.filter(activo=True).order_by('id')
+    semanas = (
+        Semana.objects.filter(activo=True)
+        .order_by('numero', 'id')
+        .prefetch_related(Prefetch('contenidos', queryset=contenidos))
+    )
+    bibliografias = Bibliografia.objects.filter(activo=True).order_by('id')
+    unidades = (
+        Unidad.objects.filter(activo=True)
+        .order_by('numero', 'id')
+        .prefetch_related(
+            Prefetch('semanas', queryset=semanas),
+            Prefetch('bibliografias', queryset=bibliografias),
+        )
+    )
+    return [
+        Prefetch('unidades', queryset=unidades),
+        Prefetch('actividades', queryset=Actividad.objects.filter(activo=True).order_by('id')),
+        Prefetch('criterios_evaluacion', queryset=CriterioEvaluacion.objects.filter(activo=True).order_by('id')),
+    ]
+
+
+# ─────────────────────────────────────────────
+#  Carga anticipada derivada de los serializers
+# ─────────────────────────────────────────────
+
+# Relaciones que usa el __str__ de cada modelo. Los StringRelatedField
+# dependen de ellas y el serializer no tiene forma de declararlas.
+RELACIONES_STR = {
+    Silabo: ('periodo_lectivo', 'curso'),
+    Profesor: ('persona',),
+    Estudiante: ('persona',),
+    PlanCurricular: ('carrera',),
+    SemestrePlan: ('plan__carrera',),
+    CargaCurso: ('curso', 'profesor__persona'),
+    Grupo: ('curso',),
+}
+
+
+def _resolver_relacion(model, atributos):
+    """
+    Recorre `atributos` (source_attrs de un campo) sobre el modelo y devuelve
+    la lista de (nombre, campo_modelo) que son relaciones.
+    """
+    relaciones = []
+    for atributo in atributos:
+        if model is None:
+            break
+        try:
+            campo = model._meta.get_field(atributo)
+        except FieldDoesNotExist:
+            break
+        if not campo.is_relation:
+            break
+        relaciones.append((atributo, campo))
+        model = campo.related_model
+    return relaciones, model
+
+
+def _agregar_str(model, prefijo, en_prefetch, select, prefetch):
+    for ruta in RELACIONES_STR.get(model, ()):
+        (prefetch if en_prefetch else select).add(prefijo + ruta)
+
+
+def _recorrer(serializer, model, prefijo, en_prefetch, select, prefetch):
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+
+        # Un PrimaryKeyRelatedField simple lee `<campo>_id`, no necesita JOIN
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            continue
+
+        relaciones, destino = _resolver_relacion(model, field.source_attrs)
+        if not relaciones:
+            continue
+
+        ruta = prefijo
+        prefetch_actual = en_prefetch
+        for nombre, campo in relaciones:
+            ruta = f"{ruta}{nombre}"
+            if prefetch_actual or campo.many_to_many or campo.one_to_many:
+                prefetch_actual = True
+                prefetch.add(ruta)
+            else:
+                select.add(ruta)
+            ruta += '__'
+
+        if isinstance(field, serializers.ListSerializer):
+            _recorrer(field.child, destino, ruta, True, select, prefetch)
+        elif isinstance(field, serializers.BaseSerializer):
+            _recorrer(field, destino, ruta, prefetch_actual, select, prefetch)
+        elif isinstance(field, serializers.ManyRelatedField):
+            if isinstance(field.child_relation, serializers.StringRelatedField):
+                _agregar_str(destino, ruta, True, select, prefetch)
+        elif isinstance(field, serializers.StringRelatedField):
+            _agregar_str(destino, ruta, prefetch_actual, select, prefetch)
+
+
+def plan_de_carga(serializer):
+    """
+    Calcula los `select_related` y `prefetch_related` que necesita un
+    serializer (clase o instancia) para no generar consultas por fila.
+
+    Recorre los campos de lectura anidados (`*_detalle`, `source=`,
+    StringRelatedField y relaciones many) y devuelve dos tuplas de rutas.
+    """
+    if isinstance(serializer, type):
+        return _plan_de_clase(serializer)
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    if not hasattr(getattr(serializer, 'Meta', None), 'model'):
+        # Serializers de entrada (parámetros de una acción): nada que cargar
+        return (), ()
+    select, prefetch = set(), set()
+    _recorrer(serializer, serializer.Meta.model, '', False, select, prefetch)
+    return tuple(sorted(select)), tuple(sorted(prefetch))
+
+
+@lru_cache(maxsize=None)
+def _plan_de_clase(serializer_class):
+    return plan_de_carga(serializer_class())
+
+
+def optimizar(queryset, serializer):
+    """
+    Aplica el plan de carga de `serializer` sobre `queryset`.
+
+    Los prefetch que el queryset ya declara (p. ej. un `Prefetch` con
+    queryset propio) tienen prioridad sobre los calculados.
+    """
+    select, prefetch = plan_de_carga(serializer)
+    existentes = [
+        getattr(lookup, 'prefetch_to', lookup)
+        for lookup in queryset._prefetch_related_lookups
+    ]
+    prefetch = [
+        ruta for ruta in prefetch
+        if not any(ruta == e or ruta.startswith(e + '__') for e in existentes)
+    ]
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
@@ -0,0 +1,146 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import Silabo, Unidad, Semana, ContenidoEspecifico, Bibliografia, Actividad, CriterioEvaluacion
+from .signals import notificar_cambio_masivo
+
+
+# ─────────────────────────────────────────────
+#  Escritura del documento completo de un sílabo
+# ─────────────────────────────────────────────
+#
+# El árbol recibido se compara con el guardado (una consulta por modelo) y
+# sólo se escribe la diferencia: un bulk_create por modelo para las filas
+# sin id, un bulk_update con las columnas que cambiaron y un UPDATE que da de
+# baja (activo = False) las filas activas que ya no aparecen. Todo ocurre en
+# una transacción con el sílabo bloqueado; si nada cambió no se escribe nada.
+
+# Hijos de cada nodo en el documento, en el orden en que se escriben
+HIJOS = {
+    Silabo: (('unidades', Unidad), ('actividades', Actividad), ('criterios_evaluacion', CriterioEvaluacion)),
+    Unidad: (('semanas', Semana), ('bibliografias', Bibliografia)),
+    Semana: (('contenidos', ContenidoEspecifico),),
+}
+
+PADRE = {
+    Unidad: 'silabo',
+    Actividad: 'silabo',
+    CriterioEvaluacion: 'silabo',
+    Semana: 'unidad',
+    Bibliografia: 'unidad',
+    ContenidoEspecifico: 'semana',
+}
+
+# Filtro desde cada modelo hasta su sílabo
+RUTA_AL_SILABO = {
+    Unidad: 'silabo',
+    Actividad: 'silabo',
+    CriterioEvaluacion: 'silabo',
+    Semana: 'unidad__silabo',
+    Bibliografia: 'unidad__silabo',
+    ContenidoEspecifico: 'semana__unidad__silabo',
+}
+
+
+class DiferenciaDocumento:
+
+    def __init__(self, actuales):
+        self.actuales = actuales
+        self.nuevos = defaultdict(list)
+        self.cambiados = defaultdict(dict)
+        self.campos = defaultdict(set)
+        self.vistos = defaultdict(set)
+
+    def recorrer(self, model, padre, nodos, ruta):
+        for indice, nodo in enumerate(nodos):
+            posicion = f'{ruta}[{indice}]'
+            hijos = {nombre: nodo.pop(nombre, []) for nombre, _ in HIJOS.get(model, ())}
+            obj = self._comparar(model, padre, nodo, posicion)
+            for nombre, model_hijo in HIJOS.get(model, ()):
+                self.recorrer(model_hijo, obj, hijos[nombre], f'{posicion}.{nombre}')
+
+    def _comparar(self, model, padre, nodo, posicion):
+        campo_padre = PADRE[model]
+        pk = nodo.pop('id', None)
+        if pk is None:
+            obj = model(activo=True, **nodo)
+            obj._padre = padre
+            self.nuevos[model].append(obj)
+            return obj
+
+        fila = self.actuales[model].get(pk)
+        if fila is None:
+            raise ValidationError({f'{posicion}.id': [f'{pk} no pertenece a este sílabo']})
+        if pk in self.vistos[model]:
+            raise ValidationError({f'{posicion}.id': [f'{pk} está repetido']})
+        self.vistos[model].add(pk)
+
+        cambios = {campo for campo, valor in nodo.items() if fila[campo] != valor}
+        if not fila['activo']:
+            cambios.add('activo')
+        if padre.pk is None or fila[f'{campo_padre}_id'] != padre.pk:
+            cambios.add(campo_padre)
+        if not cambios:
+            return model(pk=pk)
+
+        obj = model(**{**fila, **nodo, 'activo': True})
+        obj._padre = padre
+        self.cambiados[model][pk] = obj
+        self.campos[model] |= cambios
+        return obj
+
+    def bajas(self, model):
+        return [pk for pk, fila in self.actuales[model].items() if fila['activo'] and pk not in self.vistos[model]]
+
+
+def _actuales(model, silabo_id):
+    campos = [campo.attname for campo in model._meta.concrete_fields]
+    filas = model.objects.filter(**{RUTA_AL_SILABO[model]: silabo_id}).values(*campos)
+    return {fila['id']: fila for fila in filas}
+
+
+def guardar_documento(silabo, datos):
+    """
+    Aplica el documento validado `datos` sobre `silabo` (ya obtenido con los
+    filtros y permisos de la vista). Devuelve cuántas
+    filas se crearon, actualizaron y dieron de baja.
+    """
+    resumen = {'creados': 0, 'actualizados': 0, 'eliminados': 0}
+    with transaction.atomic():
+        silabo = Silabo.objects.select_for_update().get(pk=silabo.pk)
+        diferencia = DiferenciaDocumento({model: _actuales(model, silabo.pk) for model in PADRE})
+        hijos = {nombre: datos.pop(nombre, []) for nombre, _ in HIJOS[Silabo]}
+        for nombre, model in HIJOS[Silabo]:
+            diferencia.recorrer(model, silabo, hijos[nombre], nombre)
+
+        # Los padres se escriben antes que los hijos: PADRE está en ese orden
+        for model, campo_padre in PADRE.items():
+            nuevos = diferencia.nuevos[model]
+            cambiados = list(diferencia.cambiados[model].values())
+            for obj in nuevos + cambiados:
+                setattr(obj, campo_padre, obj._padre)
+            if nuevos:
+                model.objects.bulk_create(nuevos)
+                notificar_cambio_masivo(model, [obj.pk for obj in nuevos], accion='crear', tocar=False)
+            if cambiados:
+                model.objects.bulk_update(cambiados, sorted(diferencia.campos[model]))
+                notificar_cambio_masivo(model, [obj.pk for obj in cambiados], tocar=False)
+            bajas = diferencia.bajas(model)
+            if bajas:
+                model.objects.filter(pk__in=bajas).update(activo=False)
+                notificar_cambio_masivo(model, bajas, accion='eliminar', tocar=False)
+            resumen['creados'] += len(nuevos)
+            resumen['actualizados'] += len(cambiados)
+            resumen['eliminados'] += len(bajas)
+
+        cambios = {campo: valor for campo, valor in datos.items() if getattr(silabo, campo) != valor}
+        if cambios:
+            cambios['fecha_modificacion'] = timezone.now()
+            resumen['actualizados'] += 1
+        if any(resumen.values()):
+            Silabo.objects.filter(pk=silabo.pk).update(fecha_modificacion_arbol=timezone.now(), **cambios)
+            notificar_cambio_masivo(Silabo, [silabo.pk])
+    return resumen
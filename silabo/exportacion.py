@@ -0,0 +1,81 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .consultas import prefetch_documento
+from .models import Silabo
+from .serializers import SilaboDocumentoSerializer
+
+
+# ─────────────────────────────────────────────
+#  Exportación en streaming de sílabos completos
+# ─────────────────────────────────────────────
+#
+# Los sílabos se recorren con `iterator(chunk_size=...)`: en PostgreSQL es un
+# cursor del lado del servidor y el prefetch del árbol se hace por bloque,
+# así que la memoria depende del tamaño del bloque y la primera línea sale
+# en cuanto se lee el primer bloque.
+
+FORMATOS = ('ndjson', 'csv')
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+COLUMNAS_CSV = [
+    "id", "nombre", "periodo_lectivo", "profesor", "facultad", "carrera", "curso",
+    "competencia_curso", "competencia_perfil_egreso", "competencia_profesional",
+    "sumilla", "fecha_creacion", "fecha_modificacion", "fecha_modificacion_arbol",
+    "unidades", "actividades", "criterios_evaluacion",
+]
+
+
+def silabos_para_exportar(periodo_id=None, facultad_id=None, carrera_id=None):
+    filtros = {'activo': True}
+    if periodo_id:
+        filtros['periodo_lectivo_id'] = periodo_id
+    if facultad_id:
+        filtros['facultad_id'] = facultad_id
+    if carrera_id:
+        filtros['carrera_id'] = carrera_id
+    return Silabo.objects.filter(**filtros).order_by('id').prefetch_related(*prefetch_documento())
+
+
+def _documentos(queryset, tamano_bloque):
+    serializer = SilaboDocumentoSerializer()
+    for silabo in queryset.iterator(chunk_size=tamano_bloque):
+        yield serializer.to_representation(silabo)
+
+
+def _json(valor):
+    return json.dumps(valor, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def generar_ndjson(queryset, tamano_bloque=200):
+    for documento in _documentos(queryset, tamano_bloque):
+        yield _json(documento) + '\n'
+
+
+class _Eco:
+    """
+    Pseudo-archivo para csv.writer: devuelve la línea en vez de guardarla
+    """
+
+    def write(self, valor):
+        return valor
+
+
+def generar_csv(queryset, tamano_bloque=200):
+    """
+    Una fila por sílabo; unidades, actividades y criterios van como JSON
+    """
+    writer = csv.writer(_Eco())
+    yield writer.writerow(COLUMNAS_CSV)
+    for documento in _documentos(queryset, tamano_bloque):
+        yield writer.writerow([
+            _json(documento[col]) if isinstance(documento[col], list) else documento[col]
+            for col in COLUMNAS_CSV
+        ])
+
+
+GENERADORES = {'ndjson': generar_ndjson, 'csv': generar_csv}
@@ -0,0 +1,245 @@
+from collections import defaultdict, deque
+
+from .cache import versiones, invalidar_modelo
+from .models import Curso, SemestrePlan
+
+
+# ─────────────────────────────────────────────
+#  Grafo de prerrequisitos por plan curricular
+# ─────────────────────────────────────────────
+#
+# El grafo de un plan se arma con dos consultas (cursos del plan y la tabla
+# intermedia de `Curso.prerrequisitos`) y se guarda en memoria del proceso.
+# Cada grafo lleva la versión de caché con la que se construyó: cualquier
+# proceso que modifique los enlaces incrementa la versión y los demás lo
+# reconstruyen en la siguiente consulta. El proceso que hace el cambio lo
+# aplica en su copia sin reconstruirla.
+
+VERSION_GLOBAL = 'grafo'
+
+PrerrequisitoThrough = Curso.prerrequisitos.through
+
+
+ROMANOS = {'I': 1, 'V': 5, 'X': 10}
+
+
+def numero_de_semestre(nombre):
+    """
+    Número del semestre del plan a partir de su nombre ("III", "3",
+    "Semestre 3", "III ciclo"...); None si no se reconoce
+    """
+    for palabra in (nombre or '').upper().replace('-', ' ').split():
+        if palabra.isdigit():
+            return int(palabra)
+        if palabra and all(letra in ROMANOS for letra in palabra):
+            valores = [ROMANOS[letra] for letra in palabra]
+            return sum(-v if v < siguiente else v for v, siguiente in zip(valores, valores[1:] + [0]))
+    return None
+
+
+def _clave_plan(plan_id):
+    return f"grafo:{plan_id}"
+
+
+class GrafoPrerrequisitos:
+    """
+    Grafo dirigido curso → prerrequisito. Todas las consultas son O(V + E)
+    en memoria.
+    """
+
+    def __init__(self, plan_id, semestres, aristas):
+        self.plan_id = plan_id
+        # curso_id → posición de su semestre dentro del plan
+        self.semestres = semestres
+        self.prerrequisitos = defaultdict(set)
+        self.dependientes = defaultdict(set)
+        for curso_id, prerrequisito_id in aristas:
+            self.agregar(curso_id, [prerrequisito_id])
+
+    @classmethod
+    def construir(cls, plan_id):
+        # Los semestres se ordenan por el número de su nombre; los que no lo
+        # tienen van al final, por id
+        filas = SemestrePlan.objects.filter(plan_id=plan_id).values_list('id', 'nombre')
+        numeros = {semestre_id: numero_de_semestre(nombre) for semestre_id, nombre in filas}
+        orden = {
+            semestre_id: posicion
+            for posicion, semestre_id in enumerate(
+                sorted(numeros, key=lambda s: (numeros[s] is None, numeros[s] or 0, s))
+            )
+        }
+        semestres = {
+            curso_id: orden.get(semestre_id)
+            for curso_id, semestre_id in Curso.objects.filter(semestre__plan_id=plan_id)
+            .values_list('id', 'semestre_id')
+        }
+        aristas = PrerrequisitoThrough.objects.filter(
+            from_curso__semestre__plan_id=plan_id
+        ).values_list('from_curso_id', 'to_curso_id')
+        return cls(plan_id, semestres, aristas)
+
+    # ←–– Modificación incremental ––→
+    def agregar(self, curso_id, prerrequisitos):
+        for p in prerrequisitos:
+            self.prerrequisitos[curso_id].add(p)
+            self.dependientes[p].add(curso_id)
+
+    def quitar(self, curso_id, prerrequisitos):
+        for p in prerrequisitos:
+            self.prerrequisitos[curso_id].discard(p)
+            self.dependientes[p].discard(curso_id)
+
+    def copia(self):
+        grafo = GrafoPrerrequisitos(self.plan_id, self.semestres, ())
+        for curso_id, prerrequisitos in self.prerrequisitos.items():
+            grafo.agregar(curso_id, prerrequisitos)
+        return grafo
+
+    def nodos(self):
+        return set(self.semestres) | set(self.prerrequisitos) | set(self.dependientes)
+
+    # ←–– Consultas ––→
+    @staticmethod
+    def _alcanzables(adyacencia, inicio):
+        vistos, pendientes = set(), deque(inicio)
+        while pendientes:
+            nodo = pendientes.popleft()
+            if nodo in vistos:
+                continue
+            vistos.add(nodo)
+            pendientes.extend(adyacencia.get(nodo, ()))
+        return vistos
+
+    def ancestros(self, curso_id):
+        """
+        Prerrequisitos transitivos de un curso
+        """
+        return self._alcanzables(self.prerrequisitos, self.prerrequisitos.get(curso_id, ())) - {curso_id}
+
+    def descendientes(self, curso_id):
+        """
+        Cursos que dependen (transitivamente) de un curso
+        """
+        return self._alcanzables(self.dependientes, self.dependientes.get(curso_id, ())) - {curso_id}
+
+    def crearia_ciclo(self, curso_id, prerrequisitos):
+        """
+        True si asignar `prerrequisitos` a `curso_id` cierra un ciclo
+        """
+        return curso_id in self._alcanzables(self.prerrequisitos, prerrequisitos)
+
+    def orden_topologico(self):
+        """
+        Orden de los cursos con los prerrequisitos primero (Kahn). Devuelve
+        (orden, nodos_en_ciclo); si no hay ciclos la segunda lista está vacía.
+        """
+        nodos = self.nodos()
+        pendientes_por_curso = {n: len(self.prerrequisitos.get(n, ())) for n in nodos}
+        cola = deque(sorted(n for n, grado in pendientes_por_curso.items() if grado == 0))
+        orden = []
+        while cola:
+            nodo = cola.popleft()
+            orden.append(nodo)
+            for dependiente in sorted(self.dependientes.get(nodo, ())):
+                pendientes_por_curso[dependiente] -= 1
+                if pendientes_por_curso[dependiente] == 0:
+                    cola.append(dependiente)
+        en_ciclo = sorted(n for n, grado in pendientes_por_curso.items() if grado > 0)
+        return orden, en_ciclo
+
+    def ruta_critica(self):
+        """
+        Cadena de prerrequisitos más larga: mínimo de semestres necesarios
+        para llevar todos los cursos. Ignora los nodos que están en ciclos.
+        """
+        orden, _ = self.orden_topologico()
+        nivel, anterior = {}, {}
+        for nodo in orden:
+            previos = [p for p in self.prerrequisitos.get(nodo, ()) if p in nivel]
+            mejor = max(previos, key=lambda p: nivel[p], default=None)
+            nivel[nodo] = nivel[mejor] + 1 if mejor is not None else 1
+            anterior[nodo] = mejor
+        if not nivel:
+            return {'semestres': 0, 'cursos': []}
+        final = max(nivel, key=nivel.get)
+        ruta = []
+        while final is not None:
+            ruta.append(final)
+            final = anterior[final]
+        return {'semestres': len(ruta), 'cursos': list(reversed(ruta))}
+
+    def inconsistencias(self):
+        """
+        Prerrequisitos ubicados en el mismo semestre del plan o en uno posterior
+        """
+        resultado = []
+        for curso_id, prerrequisitos in self.prerrequisitos.items():
+            semestre = self.semestres.get(curso_id)
+            for p in prerrequisitos:
+                semestre_p = self.semestres.get(p)
+                if semestre is None or semestre_p is None or semestre_p < semestre:
+                    continue
+                resultado.append({
+                    'curso': curso_id,
+                    'prerrequisito': p,
+                    'tipo': 'mismo_semestre' if semestre_p == semestre else 'semestre_posterior',
+                })
+        return sorted(resultado, key=lambda i: (i['curso'], i['prerrequisito']))
+
+    def resumen(self):
+        orden, en_ciclo = self.orden_topologico()
+        return {
+            'plan': self.plan_id,
+            'orden_topologico': orden,
+            'ciclos': en_ciclo,
+            'ruta_critica': self.ruta_critica(),
+            'inconsistencias': self.inconsistencias(),
+        }
+
+
+# ─────────────────────────────────────────────
+#  Índice en memoria
+# ─────────────────────────────────────────────
+
+_grafos = {}
+
+
+def _version(plan_id):
+    return tuple(versiones(VERSION_GLOBAL, _clave_plan(plan_id)))
+
+
+def obtener_grafo(plan_id):
+    version = _version(plan_id)
+    guardado = _grafos.get(plan_id)
+    if guardado is not None and guardado[0] == version:
+        return guardado[1]
+    grafo = GrafoPrerrequisitos.construir(plan_id)
+    _grafos[plan_id] = (version, grafo)
+    return grafo
+
+
+def plan_de_curso(curso):
+    if curso.semestre_id is None:
+        return None
+    return SemestrePlan.objects.filter(pk=curso.semestre_id).values_list('plan_id', flat=True).first()
+
+
+def aplicar_cambio(plan_id, curso_id, agregados=(), quitados=()):
+    """
+    Aplica un cambio de enlaces al grafo local (si está vigente) y avisa
+    a los demás procesos incrementando la versión del plan
+    """
+    version = _version(plan_id)
+    guardado = _grafos.get(plan_id)
+    invalidar_modelo(_clave_plan(plan_id))
+    if guardado is None or guardado[0] != version:
+        _grafos.pop(plan_id, None)
+        return
+    grafo = guardado[1]
+    grafo.agregar(curso_id, agregados)
+    grafo.quitar(curso_id, quitados)
+    _grafos[plan_id] = (_version(plan_id), grafo)
+
+
+def invalidar_grafos():
+    invalidar_modelo(VERSION_GLOBAL)
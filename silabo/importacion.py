@@ -0,0 +1,274 @@
+import csv
+import io
+import re
+from datetime import date
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import connection, transaction
+from django.db.models.functions import Lower
+
+from .models import CustomUser, Persona, Estudiante, Profesor, Profesion
+from .signals import notificar_cambio_masivo
+
+
+# ─────────────────────────────────────────────
+#  Importación masiva de personas desde CSV
+# ─────────────────────────────────────────────
+#
+# El archivo se lee en bloques de `tamano_bloque` filas: cada bloque se
+# valida, se deduplica contra sí mismo y contra la base (una consulta por
+# dni y otra por email) y se escribe en su propia transacción. En PostgreSQL
+# las filas pasan por una tabla temporal cargada con COPY y se insertan con
+# tres INSERT ... SELECT; en otros motores se usa bulk_create. La memoria
+# depende del tamaño del bloque, no del archivo.
+
+COLUMNAS_REQUERIDAS = (
+    'dni', 'email', 'nombre', 'apellido_paterno', 'apellido_materno',
+    'fecha_nacimiento', 'genero', 'nacionalidad',
+)
+COLUMNAS_STAGING = COLUMNAS_REQUERIDAS + ('telefono', 'profesion_id')
+TIPOS = {'estudiante': Estudiante, 'profesor': Profesor}
+MAX_RECHAZOS_REPORTADOS = 1000
+DNI_RE = re.compile(r'^\d{8}$')
+
+
+class ResultadoImportacion:
+
+    def __init__(self):
+        self.procesadas = 0
+        self.insertadas = 0
+        self.rechazadas = 0
+        self.rechazos = []
+
+    def rechazar(self, linea, errores):
+        self.rechazadas += 1
+        if len(self.rechazos) < MAX_RECHAZOS_REPORTADOS:
+            self.rechazos.append({'linea': linea, 'errores': errores})
+
+    def as_dict(self):
+        return {
+            'procesadas': self.procesadas,
+            'insertadas': self.insertadas,
+            'rechazadas': self.rechazadas,
+            'rechazos': self.rechazos,
+            'rechazos_truncados': self.rechazadas > len(self.rechazos),
+        }
+
+
+def _validar_fila(fila):
+    errores = {}
+    datos = {col: (fila.get(col) or '').strip() for col in COLUMNAS_REQUERIDAS + ('telefono', 'profesion')}
+
+    for col in COLUMNAS_REQUERIDAS:
+        if not datos[col]:
+            errores[col] = 'Requerido'
+    if datos['dni'] and not DNI_RE.match(datos['dni']):
+        errores['dni'] = 'Debe tener 8 dígitos'
+    if datos['email']:
+        datos['email'] = datos['email'].lower()
+        try:
+            validate_email(datos['email'])
+        except ValidationError:
+            errores['email'] = 'Email inválido'
+    if datos['fecha_nacimiento']:
+        try:
+            datos['fecha_nacimiento'] = date.fromisoformat(datos['fecha_nacimiento'])
+        except ValueError:
+            errores['fecha_nacimiento'] = 'Formato esperado AAAA-MM-DD'
+    if datos['genero'] and datos['genero'].upper() not in ('M', 'F'):
+        errores['genero'] = 'Debe ser M o F'
+    datos['genero'] = datos['genero'].upper()
+
+    profesion = datos.pop('profesion')
+    datos['profesion_id'] = None
+    if profesion:
+        if profesion.isdigit():
+            datos['profesion_id'] = int(profesion)
+        else:
+            errores['profesion'] = 'Debe ser el id de una profesión'
+    return datos, errores
+
+
+def _depurar_bloque(bloque, resultado):
+    """
+    Valida el bloque y descarta duplicados internos, registros ya existentes
+    y profesiones inexistentes
+    """
+    validas, dnis, emails = [], set(), set()
+    for linea, fila in bloque:
+        datos, errores = _validar_fila(fila)
+        if not errores:
+            if datos['dni'] in dnis:
+                errores['dni'] = 'Duplicado en el archivo'
+            elif datos['email'] in emails:
+                errores['email'] = 'Duplicado en el archivo'
+        if errores:
+            resultado.rechazar(linea, errores)
+            continue
+        dnis.add(datos['dni'])
+        emails.add(datos['email'])
+        validas.append((linea, datos))
+
+    dnis_existentes = set(Persona.objects.filter(dni__in=dnis).values_list('dni', flat=True))
+    # Los emails del archivo ya están en minúsculas; los guardados pueden no estarlo
+    emails_existentes = set(
+        CustomUser.objects.annotate(normalizado=Lower('email'))
+        .filter(normalizado__in=emails).values_list('normalizado', flat=True)
+    ) | set(
+        CustomUser.objects.annotate(normalizado=Lower('username'))
+        .filter(normalizado__in=emails).values_list('normalizado', flat=True)
+    )
+    profesiones = set(Profesion.objects.filter(
+        pk__in={datos['profesion_id'] for _, datos in validas} - {None}
+    ).values_list('pk', flat=True))
+
+    filas = []
+    for linea, datos in validas:
+        if datos['dni'] in dnis_existentes:
+            resultado.rechazar(linea, {'dni': 'Ya registrado'})
+        elif datos['email'] in emails_existentes:
+            resultado.rechazar(linea, {'email': 'Ya registrado'})
+        elif datos['profesion_id'] is not None and datos['profesion_id'] not in profesiones:
+            resultado.rechazar(linea, {'profesion': 'No existe la profesión'})
+        else:
+            filas.append(datos)
+    return filas
+
+
+# ←–– Escritura con bulk_create (cualquier motor) ––→
+
+def _escribir_orm(filas, modelo, password, rol_id):
+    usuarios = CustomUser.objects.bulk_create([
+        CustomUser(
+            password=password, username=f['email'], email=f['email'],
+            first_name=f['nombre'][:150], last_name=f['apellido_paterno'][:150], rol_id=rol_id,
+        )
+        for f in filas
+    ])
+    personas = Persona.objects.bulk_create([
+        Persona(
+            nombre=f['nombre'], apellido_paterno=f['apellido_paterno'],
+            apellido_materno=f['apellido_materno'], dni=f['dni'],
+            fecha_nacimiento=f['fecha_nacimiento'], genero=f['genero'],
+            nacionalidad=f['nacionalidad'], telefono=f['telefono'], usuario=usuario,
+        )
+        for f, usuario in zip(filas, usuarios)
+    ])
+    if modelo is Profesor:
+        registros = [Profesor(persona=p, profesion_id=f['profesion_id']) for f, p in zip(filas, personas)]
+    else:
+        registros = [Estudiante(persona=p) for p in personas]
+    return len(modelo.objects.bulk_create(registros))
+
+
+# ←–– Escritura con COPY (PostgreSQL) ––→
+
+STAGING = 'silabo_importacion_staging'
+
+
+def _copy(cursor, filas):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for f in filas:
+        writer.writerow([
+            '' if f[col] is None else f[col].isoformat() if isinstance(f[col], date) else f[col]
+            for col in COLUMNAS_STAGING
+        ])
+    buffer.seek(0)
+    sql = f"COPY {STAGING} ({', '.join(COLUMNAS_STAGING)}) FROM STDIN WITH (FORMAT csv)"
+    raw = cursor.cursor
+    if hasattr(raw, 'copy_expert'):  # psycopg2
+        raw.copy_expert(sql, buffer)
+    else:  # psycopg 3
+        with raw.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+
+def _escribir_copy(filas, modelo, password, rol_id):
+    usuario_t = CustomUser._meta.db_table
+    persona_t = Persona._meta.db_table
+    destino_t = modelo._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            CREATE TEMP TABLE IF NOT EXISTS {STAGING} (
+                dni varchar(8), email varchar(254), nombre varchar(200),
+                apellido_paterno varchar(200), apellido_materno varchar(200),
+                fecha_nacimiento date, genero varchar(1), nacionalidad varchar(50),
+                telefono varchar(20), profesion_id bigint
+            ) ON COMMIT DELETE ROWS
+        """)
+        _copy(cursor, filas)
+        cursor.execute(f"""
+            INSERT INTO {usuario_t} (password, is_superuser, username, first_name, last_name,
+                                     email, is_staff, is_active, date_joined, rol_id, activo)
+            SELECT %s, false, s.email, left(s.nombre, 150), left(s.apellido_paterno, 150),
+                   s.email, false, true, now(), %s, true
+            FROM {STAGING} s
+            ON CONFLICT DO NOTHING
+        """, [password, rol_id])
+        cursor.execute(f"""
+            INSERT INTO {persona_t} (nombre, apellido_paterno, apellido_materno, dni,
+                                     fecha_nacimiento, genero, nacionalidad, telefono,
+                                     usuario_id, activo)
+            SELECT s.nombre, s.apellido_paterno, s.apellido_materno, s.dni, s.fecha_nacimiento,
+                   s.genero, s.nacionalidad, coalesce(s.telefono, ''), u.id, true
+            FROM {STAGING} s
+            JOIN {usuario_t} u ON u.email = s.email
+            WHERE NOT EXISTS (SELECT 1 FROM {persona_t} p WHERE p.dni = s.dni)
+        """)
+        if modelo is Profesor:
+            cursor.execute(f"""
+                INSERT INTO {destino_t} (persona_id, profesion_id, activo)
+                SELECT p.id, s.profesion_id, true
+                FROM {STAGING} s
+                JOIN {persona_t} p ON p.dni = s.dni
+                WHERE NOT EXISTS (SELECT 1 FROM {destino_t} d WHERE d.persona_id = p.id)
+            """)
+        else:
+            cursor.execute(f"""
+                INSERT INTO {destino_t} (persona_id, fecha_creacion, activo)
+                SELECT p.id, now(), true
+                FROM {STAGING} s
+                JOIN {persona_t} p ON p.dni = s.dni
+                WHERE NOT EXISTS (SELECT 1 FROM {destino_t} d WHERE d.persona_id = p.id)
+            """)
+        return cursor.rowcount
+
+
+def importar_csv(archivo, tipo='estudiante', tamano_bloque=2000, password=None, rol_id=None):
+    """
+    Importa personas (con su usuario y su registro de estudiante o profesor)
+    desde un archivo de texto CSV. Las filas rechazadas se reportan sin
+    abortar la carga.
+
+    Si no se indica `password`, las cuentas se crean con contraseña
+    inutilizable. La contraseña se cifra una sola vez para todo el archivo.
+    """
+    modelo = TIPOS[tipo]
+    reader = csv.DictReader(archivo)
+    faltantes = [c for c in COLUMNAS_REQUERIDAS if c not in (reader.fieldnames or [])]
+    if faltantes:
+        raise ValueError(f"Faltan columnas: {', '.join(faltantes)}")
+
+    password = make_password(password)
+    escribir = _escribir_copy if connection.vendor == 'postgresql' else _escribir_orm
+    resultado = ResultadoImportacion()
+    filas = enumerate(reader, start=2)  # la línea 1 es la cabecera
+
+    while True:
+        bloque = list(islice(filas, tamano_bloque))
+        if not bloque:
+            break
+        resultado.procesadas += len(bloque)
+        depuradas = _depurar_bloque(bloque, resultado)
+        if depuradas:
+            with transaction.atomic():
+                resultado.insertadas += escribir(depuradas, modelo, password, rol_id)
+
+    if resultado.insertadas:
+        for model in (CustomUser, Persona, modelo):
+            notificar_cambio_masivo(model, [], accion='importar')
+    return resultado
@@ -0,0 +1,71 @@
+from .models import Universidad, Facultad, Departamento, Carrera, PlanCurricular, SemestrePlan, Curso
+
+
+# ─────────────────────────────────────────────
+#  Árbol de la estructura académica
+# ─────────────────────────────────────────────
+#
+# universidad → facultad → departamento → carrera → plan → semestre → curso.
+# Cada nivel se lee con una consulta (`values()`, sin serializers) filtrada
+# por los ids del nivel anterior, y el árbol se arma en memoria. Sólo entran
+# nodos activos cuyos ancestros también lo son. La vista cachea la respuesta
+# con las versiones de los siete modelos.
+
+# nivel: (modelo, campo del padre, clave de los hijos en el padre, campos, orden)
+NIVELES = {
+    'universidad': (Universidad, None, 'universidades', ('id', 'nombre', 'acronimo'), 'nombre'),
+    'facultad': (Facultad, 'universidad', 'facultades', ('id', 'nombre'), 'nombre'),
+    'departamento': (Departamento, 'facultad', 'departamentos', ('id', 'nombre'), 'nombre'),
+    'carrera': (Carrera, 'departamento', 'carreras', ('id', 'nombre'), 'nombre'),
+    'plan': (PlanCurricular, 'carrera', 'planes', ('id', 'tag', 'fecha_culminacion'), 'tag'),
+    'semestre': (SemestrePlan, 'plan', 'semestres', ('id', 'nombre', 'semestre_academico_id'), 'nombre'),
+    'curso': (Curso, 'semestre', 'cursos', ('id', 'codigo', 'nombre', 'creditos'), 'codigo'),
+}
+
+MODELOS = tuple(model for model, *_ in NIVELES.values())
+
+
+def _ancestros_activos(nivel):
+    """
+    Filtro `activo` de todos los ancestros de `nivel`, p. ej. para carrera:
+    departamento__activo, departamento__facultad__activo, ...
+    """
+    filtros, ruta = {}, []
+    campo_padre = NIVELES[nivel][1]
+    while campo_padre:
+        ruta.append(campo_padre)
+        filtros['__'.join(ruta) + '__activo'] = True
+        campo_padre = NIVELES[campo_padre][1]
+    return filtros
+
+
+def construir_jerarquia(raiz='universidad', raiz_id=None, hasta='curso'):
+    """
+    Árbol de nodos activos desde el nivel `raiz` (sólo el nodo `raiz_id` si
+    se indica) hasta el nivel `hasta`. Devuelve la lista de nodos raíz.
+    """
+    nombres = list(NIVELES)
+    niveles = nombres[nombres.index(raiz):nombres.index(hasta) + 1]
+    raices, padres = [], None
+    for posicion, nivel in enumerate(niveles):
+        model, campo_padre, clave, campos, orden = NIVELES[nivel]
+        filas = model.objects.filter(activo=True).order_by(orden, 'id')
+        if padres is None:
+            filas = filas.filter(**_ancestros_activos(nivel)).values(*campos)
+            if raiz_id is not None:
+                filas = filas.filter(pk=raiz_id)
+        else:
+            filas = filas.filter(**{f'{campo_padre}_id__in': list(padres)}).values(*campos, f'{campo_padre}_id')
+        hijos = NIVELES[niveles[posicion + 1]][2] if posicion + 1 < len(niveles) else None
+
+        nodos = {}
+        for fila in filas:
+            padre_id = fila.pop(f'{campo_padre}_id', None)
+            if hijos:
+                fila[hijos] = []
+            nodos[fila['id']] = fila
+            (raices if padres is None else padres[padre_id][clave]).append(fila)
+        if not nodos:
+            break
+        padres = nodos
+    return raices
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from silabo.avance import actualizar_avance
+
+
+class Command(BaseCommand):
+    help = (
+        "Actualiza el tablero de avance: recalcula los conteos de los sílabos modificados desde "
+        "la última ejecución y reconstruye el resumen por periodo, facultad y carrera. "
+        "Pensado para programarse cada pocos minutos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--completo', action='store_true', help="Recalcula todos los sílabos activos")
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        recalculados, retirados = actualizar_avance(completo=options['completo'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{recalculados} sílabos recalculados y {retirados} retirados "
+            f"en {time.perf_counter() - inicio:.2f} s"
+        ))
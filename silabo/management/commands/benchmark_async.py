@@ -0,0 +1,102 @@
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from silabo.models import CustomUser, Silabo
+
+
+RUTAS = {
+    'documento': 'silabos/{pk}/documento/',
+    'detalle': 'silabos/{pk}/',
+    'unidades': 'silabos/{pk}/unidades/',
+    'por_periodo': 'silabos/por_periodo/?periodo_id={periodo}',
+}
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[max(math.ceil(p * len(ordenados)) - 1, 0)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara peticiones por segundo y latencia p50/p99 de las lecturas de sílabos "
+        "bajo carga concurrente: WSGI con hilos (API sync) frente a ASGI (API async). "
+        "Las peticiones se procesan en el mismo proceso, sin red, contra la base configurada."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ruta', choices=sorted(RUTAS), default='documento')
+        parser.add_argument('--silabo', type=int, help="Id del sílabo (por defecto el primero activo)")
+        parser.add_argument('--usuario', help="username para el token (por defecto el primer usuario activo)")
+        parser.add_argument('--peticiones', type=int, default=200)
+        parser.add_argument('--concurrencia', type=int, default=20)
+
+    def handle(self, *args, **options):
+        silabo = (
+            Silabo.objects.filter(pk=options['silabo']) if options['silabo']
+            else Silabo.objects.filter(activo=True).order_by('id')
+        ).first()
+        usuarios = CustomUser.objects.filter(is_active=True)
+        if options['usuario']:
+            usuarios = usuarios.filter(username=options['usuario'])
+        usuario = usuarios.order_by('id').first()
+        if silabo is None or usuario is None:
+            raise CommandError("Se necesita al menos un sílabo y un usuario activo")
+
+        ruta = RUTAS[options['ruta']].format(pk=silabo.pk, periodo=silabo.periodo_lectivo_id)
+        cabeceras = {'authorization': f"Bearer {AccessToken.for_user(usuario)}"}
+        n, concurrencia = options['peticiones'], options['concurrencia']
+
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            resultados = [
+                ('WSGI (sync, hilos)', *self.wsgi(f"/silabo/{ruta}", cabeceras, n, concurrencia)),
+                ('ASGI (async)', *asyncio.run(self.asgi(f"/silabo/async/{ruta}", cabeceras, n, concurrencia))),
+            ]
+
+        self.stdout.write(f"GET {ruta} · {n} peticiones · concurrencia {concurrencia}\n")
+        self.stdout.write(f"{'modo':<20}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errores':>10}")
+        for modo, total, latencias, errores in resultados:
+            self.stdout.write(
+                f"{modo:<20}{n / total:>10.1f}{percentil(latencias, .50) * 1000:>10.1f}"
+                f"{percentil(latencias, .99) * 1000:>10.1f}{errores:>10}"
+            )
+
+    def wsgi(self, url, cabeceras, n, concurrencia):
+        local = threading.local()
+
+        def peticion(_):
+            if not hasattr(local, 'cliente'):
+                local.cliente = Client()
+            inicio = time.perf_counter()
+            status = local.cliente.get(url, headers=cabeceras).status_code
+            return time.perf_counter() - inicio, status
+
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+            medidas = list(pool.map(peticion, range(n)))
+        total = time.perf_counter() - inicio
+        return total, [m[0] for m in medidas], sum(m[1] != 200 for m in medidas)
+
+    async def asgi(self, url, cabeceras, n, concurrencia):
+        cliente = AsyncClient()
+        semaforo = asyncio.Semaphore(concurrencia)
+
+        async def peticion():
+            async with semaforo:
+                inicio = time.perf_counter()
+                status = (await cliente.get(url, headers=cabeceras)).status_code
+                return time.perf_counter() - inicio, status
+
+        inicio = time.perf_counter()
+        medidas = await asyncio.gather(*(peticion() for _ in range(n)))
+        total = time.perf_counter() - inicio
+        return total, [m[0] for m in medidas], sum(m[1] != 200 for m in medidas)
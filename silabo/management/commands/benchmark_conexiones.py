@@ -0,0 +1,69 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.utils import ConnectionHandler
+
+from silabo_s7_back.conexiones import MODOS, opciones_conexion
+
+from .benchmark_async import percentil
+
+
+CLAVES_DE_MODO = ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS', 'DISABLE_SERVER_SIDE_CURSORS')
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el costo por petición de obtener una conexión en cada DB_CONN_MODE. "
+        "Cada petición simulada repite lo que hace Django entre request_started y "
+        "request_finished: verificar/abrir la conexión, ejecutar SELECT 1 y liberarla."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--peticiones', type=int, default=200)
+        parser.add_argument('--modos', nargs='+', choices=MODOS, default=list(MODOS))
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        base = {k: v for k, v in settings.DATABASES[options['database']].items() if k not in CLAVES_DE_MODO}
+        base['OPTIONS'] = {k: v for k, v in base.get('OPTIONS', {}).items() if k != 'pool'}
+        n = options['peticiones']
+
+        self.stdout.write(f"{n} peticiones por modo contra {base.get('HOST') or base['NAME']}\n")
+        self.stdout.write(f"{'modo':<12}{'media ms':>10}{'p50 ms':>10}{'p99 ms':>10}{'conexiones':>12}")
+        for modo in options['modos']:
+            if modo == 'pool' and 'postgresql' not in base['ENGINE']:
+                self.stdout.write(f"{modo:<12}  (requiere PostgreSQL con psycopg 3)")
+                continue
+            tiempos, conexiones = self.medir(base, modo, n)
+            self.stdout.write(
+                f"{modo:<12}{sum(tiempos) / n * 1000:>10.2f}{percentil(tiempos, .50) * 1000:>10.2f}"
+                f"{percentil(tiempos, .99) * 1000:>10.2f}{conexiones:>12}"
+            )
+
+    def medir(self, base, modo, n):
+        """
+        Devuelve la duración de cada petición y cuántas veces hubo que abrir
+        (o, con pool, tomar del pool) una conexión
+        """
+        configuracion = {**base, **opciones_conexion(modo)}
+        configuracion['OPTIONS'] = {**base['OPTIONS'], **configuracion.get('OPTIONS', {})}
+        conexion = ConnectionHandler({'default': configuracion})['default']
+
+        tiempos, conexiones = [], 0
+        try:
+            for _ in range(n):
+                inicio = time.perf_counter()
+                conexion.close_if_unusable_or_obsolete()
+                if conexion.connection is None:
+                    conexiones += 1
+                with conexion.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                    cursor.fetchone()
+                conexion.close_if_unusable_or_obsolete()
+                tiempos.append(time.perf_counter() - inicio)
+        finally:
+            conexion.close()
+            if modo == 'pool':
+                conexion.close_pool()
+        return tiempos, conexiones
@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from silabo.clonacion import clonar_silabos, dias_entre, pendientes_de_clonar, semestre_de_periodo
+from silabo.models import PeriodoLectivo, SemestreAcademico, Silabo
+
+
+class Command(BaseCommand):
+    help = (
+        "Copia todos los sílabos activos de un periodo lectivo a otro (con unidades, semanas, "
+        "contenidos, bibliografías, actividades y criterios) en una sola transacción. "
+        "Omite los cursos que ya tienen sílabo del mismo profesor en el periodo destino."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('origen', type=int, help="Id del periodo lectivo de origen")
+        parser.add_argument('destino', type=int, help="Id del periodo lectivo de destino")
+        parser.add_argument('--facultad', type=int)
+        parser.add_argument('--carrera', type=int)
+        parser.add_argument('--semestre-origen', type=int, help="SemestreAcademico de origen (por defecto, por nombre)")
+        parser.add_argument('--semestre-destino', type=int, help="SemestreAcademico de destino (por defecto, por nombre)")
+        parser.add_argument('--dry-run', action='store_true', help="Sólo informa cuántos sílabos se copiarían")
+
+    def handle(self, *args, **options):
+        origen = self.obtener(PeriodoLectivo, options['origen'])
+        destino = self.obtener(PeriodoLectivo, options['destino'])
+        if origen == destino:
+            raise CommandError("El periodo de destino debe ser distinto del de origen")
+
+        silabos = Silabo.objects.filter(periodo_lectivo=origen, activo=True)
+        if options['facultad']:
+            silabos = silabos.filter(facultad_id=options['facultad'])
+        if options['carrera']:
+            silabos = silabos.filter(carrera_id=options['carrera'])
+        silabos = pendientes_de_clonar(silabos, destino)
+
+        dias = dias_entre(
+            self.obtener(SemestreAcademico, options['semestre_origen']) or semestre_de_periodo(origen),
+            self.obtener(SemestreAcademico, options['semestre_destino']) or semestre_de_periodo(destino),
+        )
+        if options['dry_run']:
+            self.stdout.write(f"{silabos.count()} sílabos por copiar; fechas desplazadas {dias} días")
+            return
+
+        inicio = time.perf_counter()
+        _, copiados = clonar_silabos(silabos, origen, destino, dias)
+        for modelo, total in copiados.items():
+            self.stdout.write(f"{modelo:<24}{total:>8}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{copiados['silabo']} sílabos copiados de {origen} a {destino} "
+            f"(fechas desplazadas {dias} días) en {time.perf_counter() - inicio:.2f} s"
+        ))
+
+    def obtener(self, model, pk):
+        if pk is None:
+            return None
+        try:
+            return model.objects.get(pk=pk)
+        except model.DoesNotExist:
+            raise CommandError(f"No existe {model._meta.verbose_name} con id {pk}")
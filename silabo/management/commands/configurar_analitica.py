@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from silabo.analitica import sql_horas_totales
+
+
+class Command(BaseCommand):
+    help = "Agrega la columna generada Curso.horas_totales a una base existente (PostgreSQL)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sql', action='store_true', help="Sólo imprime el DDL, no lo ejecuta")
+
+    def handle(self, *args, **options):
+        sentencias = sql_horas_totales()
+        if options['sql']:
+            for sentencia in sentencias:
+                self.stdout.write(sentencia + ';\n')
+            return
+        if connection.vendor != 'postgresql':
+            raise CommandError("El DDL es de PostgreSQL; en otros motores usar --sql como referencia")
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            for sentencia in sentencias:
+                cursor.execute(sentencia)
+        self.stdout.write(self.style.SUCCESS(f"Analítica configurada ({len(sentencias)} sentencias)"))
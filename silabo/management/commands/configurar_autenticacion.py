@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from silabo.autenticacion import sql_revision_token
+
+
+class Command(BaseCommand):
+    help = "Agrega la columna CustomUser.revision_token (revocación de JWT) a una base existente (PostgreSQL)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sql', action='store_true', help="Sólo imprime el DDL, no lo ejecuta")
+
+    def handle(self, *args, **options):
+        sentencias = sql_revision_token()
+        if options['sql']:
+            for sentencia in sentencias:
+                self.stdout.write(sentencia + ';\n')
+            return
+        if connection.vendor != 'postgresql':
+            raise CommandError("El DDL es de PostgreSQL; en otros motores usar --sql como referencia")
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            for sentencia in sentencias:
+                cursor.execute(sentencia)
+        self.stdout.write(self.style.SUCCESS(f"Autenticación configurada ({len(sentencias)} sentencias)"))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from silabo.busqueda import sql_configuracion
+
+
+class Command(BaseCommand):
+    help = "Crea las columnas tsvector e índices GIN de la búsqueda de texto completo (PostgreSQL)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sql', action='store_true', help="Sólo imprime el DDL, no lo ejecuta")
+
+    def handle(self, *args, **options):
+        sentencias = sql_configuracion()
+        if options['sql']:
+            for sentencia in sentencias:
+                self.stdout.write(sentencia + ';\n')
+            return
+        if connection.vendor != 'postgresql':
+            raise CommandError("La búsqueda indexada requiere PostgreSQL; en otros motores se usa el índice en memoria")
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            for sentencia in sentencias:
+                cursor.execute(sentencia)
+        self.stdout.write(self.style.SUCCESS(f"Búsqueda configurada ({len(sentencias)} sentencias)"))
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from silabo.models import Persona
+from silabo.signals import notificar_cambio_masivo
+
+
+class Command(BaseCommand):
+    help = (
+        "Desactiva las personas activas con DNI repetido, conservando la que tiene "
+        "más vínculos (usuario, estudiante, profesor) y, a igualdad, la más antigua. "
+        "Debe ejecutarse antes de crear la restricción persona_dni_activo_unico."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Sólo informa, no modifica")
+
+    def handle(self, *args, **options):
+        repetidos = (
+            Persona.objects.filter(activo=True)
+            .values('dni').annotate(total=Count('id')).filter(total__gt=1)
+            .values_list('dni', flat=True)
+        )
+        candidatas = (
+            Persona.objects.filter(activo=True, dni__in=list(repetidos))
+            .values_list('id', 'dni', 'usuario_id', 'estudiante__id', 'profesor__id')
+            .order_by('dni', 'id')
+        )
+
+        conservar, desactivar = {}, []
+        for pk, dni, *vinculos in candidatas:
+            puntaje = sum(v is not None for v in vinculos)
+            actual = conservar.get(dni)
+            if actual is None:
+                conservar[dni] = (puntaje, pk)
+            elif puntaje > actual[0]:
+                desactivar.append(actual[1])
+                conservar[dni] = (puntaje, pk)
+            else:
+                desactivar.append(pk)
+
+        for dni, (_, pk) in sorted(conservar.items()):
+            self.stdout.write(f"{dni}: se conserva la persona {pk}")
+        if options['dry_run'] or not desactivar:
+            self.stdout.write(f"{len(desactivar)} personas por desactivar")
+            return
+
+        with transaction.atomic():
+            Persona.objects.filter(pk__in=desactivar).update(activo=False)
+            notificar_cambio_masivo(Persona, desactivar)
+        self.stdout.write(self.style.SUCCESS(f"{len(desactivar)} personas desactivadas"))
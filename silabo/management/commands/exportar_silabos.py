@@ -0,0 +1,27 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from silabo.exportacion import FORMATOS, GENERADORES, silabos_para_exportar
+
+
+class Command(BaseCommand):
+    help = "Exporta sílabos completos (con su árbol) en NDJSON o CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--periodo', type=int, help="Id del periodo lectivo")
+        parser.add_argument('--facultad', type=int, help="Id de la facultad")
+        parser.add_argument('--carrera', type=int, help="Id de la carrera")
+        parser.add_argument('--formato', choices=FORMATOS, default='ndjson')
+        parser.add_argument('--salida', help="Archivo de salida (por defecto stdout)")
+        parser.add_argument('--bloque', type=int, default=200, help="Sílabos por bloque")
+
+    def handle(self, *args, **options):
+        queryset = silabos_para_exportar(options['periodo'], options['facultad'], options['carrera'])
+        lineas = GENERADORES[options['formato']](queryset, options['bloque'])
+
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8', newline='') as salida:
+                salida.writelines(lineas)
+        else:
+            sys.stdout.writelines(lineas)
@@ -0,0 +1,22 @@
+import gzip
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera el esquema OpenAPI (openapi.json, openapi.yaml y sus .gz) en OPENAPI_DIR. "
+        "Debe volver a ejecutarse cada vez que cambian las rutas o los serializers."
+    )
+
+    def handle(self, *args, **options):
+        from silabo_s7_back.docs import CODECS, generar
+
+        settings.OPENAPI_DIR.mkdir(parents=True, exist_ok=True)
+        for formato in CODECS:
+            datos = generar(formato)
+            ruta = settings.OPENAPI_DIR / f'openapi.{formato}'
+            ruta.write_bytes(datos)
+            ruta.with_name(ruta.name + '.gz').write_bytes(gzip.compress(datos, 9, mtime=0))
+            self.stdout.write(f"{ruta} ({len(datos) // 1024} KB)")
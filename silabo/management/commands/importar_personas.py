@@ -0,0 +1,34 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from silabo.importacion import importar_csv, TIPOS
+
+
+class Command(BaseCommand):
+    help = "Importa estudiantes o profesores desde un CSV (dni, email, nombre, apellidos, ...)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help="Ruta del CSV (UTF-8, con cabecera)")
+        parser.add_argument('--tipo', choices=sorted(TIPOS), default='estudiante')
+        parser.add_argument('--bloque', type=int, default=2000, help="Filas por bloque")
+        parser.add_argument('--password', default=None, help="Contraseña inicial para todas las cuentas")
+        parser.add_argument('--rol', type=int, default=None, help="Id del rol de las cuentas creadas")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['archivo'], encoding='utf-8-sig', newline='') as archivo:
+                resultado = importar_csv(
+                    archivo, tipo=options['tipo'], tamano_bloque=options['bloque'],
+                    password=options['password'], rol_id=options['rol'],
+                )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        datos = resultado.as_dict()
+        self.stdout.write(self.style.SUCCESS(
+            f"Procesadas: {datos['procesadas']}  Insertadas: {datos['insertadas']}  "
+            f"Rechazadas: {datos['rechazadas']}"
+        ))
+        for rechazo in datos['rechazos']:
+            self.stdout.write(json.dumps(rechazo, ensure_ascii=False))
@@ -0,0 +1,79 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from silabo.actividad import (
+    aplicar_retencion, corte_retencion, crear_particiones, esta_particionada, inicio_de_mes,
+    rango_a_particionar, reconstruir_resumen, sql_particionar, sumar_meses, TABLA,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Mantenimiento de LogProcesos: crea las particiones mensuales de los próximos meses "
+        "(PostgreSQL), elimina los logs fuera del período de retención y, opcionalmente, "
+        "particiona la tabla o reconstruye el resumen diario de actividad"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--particionar', action='store_true',
+            help="Convierte la tabla de logs en una particionada por mes (una sola vez, PostgreSQL)",
+        )
+        parser.add_argument('--sql', action='store_true', help="Con --particionar, sólo imprime el DDL")
+        parser.add_argument('--meses-adelante', type=int, default=3, help="Particiones futuras a mantener creadas")
+        parser.add_argument(
+            '--retencion', type=int,
+            help="Meses de logs a conservar además del actual (por defecto SILABO_LOGS_RETENCION_MESES)",
+        )
+        parser.add_argument(
+            '--reconstruir-resumen', action='store_true',
+            help="Recalcula LogActividadDiaria a partir de los logs conservados",
+        )
+
+    def handle(self, *args, **options):
+        if options['particionar']:
+            self.particionar(options)
+            if options['sql']:
+                return
+
+        if options['reconstruir_resumen']:
+            total = reconstruir_resumen()
+            self.stdout.write(f"Resumen reconstruido a partir de {total} logs")
+
+        if esta_particionada():
+            hasta = sumar_meses(inicio_de_mes(date.today()), options['meses_adelante'])
+            with transaction.atomic():
+                creadas = crear_particiones(hasta)
+            for nombre in creadas:
+                self.stdout.write(f"Partición creada: {nombre}")
+
+        corte = corte_retencion(meses=options['retencion'])
+        with transaction.atomic():
+            eliminadas = aplicar_retencion(corte)
+        if isinstance(eliminadas, list):
+            for nombre in eliminadas:
+                self.stdout.write(f"Partición eliminada: {nombre}")
+        else:
+            self.stdout.write(f"{eliminadas} logs anteriores a {corte} eliminados")
+        self.stdout.write(self.style.SUCCESS("Mantenimiento de logs terminado"))
+
+    def particionar(self, options):
+        desde, hasta = rango_a_particionar(options['meses_adelante'])
+        sentencias = sql_particionar(desde, hasta)
+        if options['sql']:
+            for sentencia in sentencias:
+                self.stdout.write(sentencia + ';\n')
+            return
+        if connection.vendor != 'postgresql':
+            raise CommandError("El particionado requiere PostgreSQL; en otros motores sólo se aplica la retención")
+        if esta_particionada():
+            self.stdout.write("La tabla de logs ya está particionada")
+            return
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {TABLA} IN ACCESS EXCLUSIVE MODE")
+            for sentencia in sentencias:
+                cursor.execute(sentencia)
+        self.stdout.write(self.style.SUCCESS(f"Tabla de logs particionada de {desde} a {hasta}"))
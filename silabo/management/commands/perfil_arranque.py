@@ -0,0 +1,103 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Se ejecuta en un intérprete nuevo, igual que un lambda en frío: importa el
+# punto de entrada WSGI y atiende dos peticiones sin pasar por la red.
+PROCESO_EN_FRIO = r"""
+import io, json, sys, time
+inicio = time.perf_counter()
+from silabo_s7_back.wsgi import application
+listo = time.perf_counter()
+
+def peticion(ruta, host):
+    ruta, _, query = ruta.partition('?')
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': ruta, 'QUERY_STRING': query,
+        'SERVER_NAME': host, 'SERVER_PORT': '80', 'HTTP_HOST': host,
+        'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr, 'wsgi.url_scheme': 'http',
+    }
+    estado = []
+    t = time.perf_counter()
+    cuerpo = b''.join(application(environ, lambda s, h, *a: estado.append(s)))
+    return time.perf_counter() - t, estado[0]
+
+primera, estado = peticion(sys.argv[1], sys.argv[2])
+segunda, _ = peticion(sys.argv[1], sys.argv[2])
+print(json.dumps({
+    'importar_wsgi': listo - inicio, 'primera': primera, 'segunda': segunda, 'estado': estado,
+    'modulos': len(sys.modules),
+}))
+"""
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def tiempos_por_paquete(stderr):
+    """
+    Suma el tiempo propio (self) de cada módulo importado por paquete raíz
+    """
+    paquetes = defaultdict(int)
+    for linea in stderr.splitlines():
+        coincidencia = IMPORTTIME_RE.match(linea)
+        if coincidencia:
+            propio, _, _, modulo = coincidencia.groups()
+            paquetes[modulo.split('.', 1)[0]] += int(propio)
+    return sorted(paquetes.items(), key=lambda p: -p[1])
+
+
+class Command(BaseCommand):
+    help = (
+        "Perfil de arranque en frío del punto de entrada WSGI: desglose de tiempo de "
+        "importación por paquete (python -X importtime) y tiempo hasta la primera respuesta"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ruta', default='/silabo/', help="Ruta de la primera petición")
+        parser.add_argument('--top', type=int, default=20, help="Paquetes a listar")
+        parser.add_argument('--api-only', action='store_true', help="Ejecuta con DJANGO_API_ONLY=True")
+        parser.add_argument(
+            '--max-ms', type=float,
+            help="Falla si el tiempo hasta la primera respuesta supera este valor (para CI)",
+        )
+
+    def handle(self, *args, **options):
+        host = next((h for h in settings.ALLOWED_HOSTS if h and h != '*' and not h.startswith('.')), 'localhost')
+        entorno = dict(os.environ)
+        if options['api_only']:
+            entorno['DJANGO_API_ONLY'] = 'True'
+
+        inicio = time.perf_counter()
+        proceso = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROCESO_EN_FRIO, options['ruta'], host],
+            cwd=settings.BASE_DIR, env=entorno, capture_output=True, text=True,
+        )
+        total = time.perf_counter() - inicio
+        if proceso.returncode != 0:
+            raise CommandError(proceso.stderr.strip().splitlines()[-1])
+        resultado = json.loads(proceso.stdout.strip().splitlines()[-1])
+        paquetes = tiempos_por_paquete(proceso.stderr)
+
+        self.stdout.write(f"{'paquete':<28}{'ms':>10}")
+        for paquete, microsegundos in paquetes[:options['top']]:
+            self.stdout.write(f"{paquete:<28}{microsegundos / 1000:>10.1f}")
+        self.stdout.write('')
+        self.stdout.write(f"módulos cargados            {resultado['modulos']:>10}")
+        self.stdout.write(f"importar wsgi (ms)          {resultado['importar_wsgi'] * 1000:>10.1f}")
+        self.stdout.write(f"primera petición (ms)       {resultado['primera'] * 1000:>10.1f}  [{resultado['estado']}]")
+        self.stdout.write(f"segunda petición (ms)       {resultado['segunda'] * 1000:>10.1f}")
+        self.stdout.write(f"proceso hasta 1ª resp. (ms) {total * 1000:>10.1f}")
+
+        primera_respuesta = (resultado['importar_wsgi'] + resultado['primera']) * 1000
+        if options['max_ms'] and primera_respuesta > options['max_ms']:
+            raise CommandError(
+                f"Arranque en frío de {primera_respuesta:.0f} ms supera el máximo de {options['max_ms']:.0f} ms"
+            )
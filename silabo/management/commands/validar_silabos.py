@@ -0,0 +1,51 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from silabo.models import PeriodoLectivo, SemestreAcademico
+from silabo.validacion import validar_periodo
+
+
+class Command(BaseCommand):
+    help = (
+        "Valida todos los sílabos activos de un periodo lectivo (pesos de criterios, fechas "
+        "dentro del semestre académico, unidades superpuestas, semanas consecutivas y "
+        "jerarquía facultad/carrera) e imprime los problemas por sílabo"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('periodo', type=int, help="Id del periodo lectivo")
+        parser.add_argument('--semestre-academico', type=int, help="Ventana de fechas (por defecto, por nombre)")
+        parser.add_argument('--facultad', type=int)
+        parser.add_argument('--carrera', type=int)
+        parser.add_argument('--json', action='store_true', help="Imprime el reporte completo en JSON")
+        parser.add_argument('--fallar', action='store_true', help="Termina con error si hay problemas (para CI)")
+
+    def handle(self, *args, **options):
+        try:
+            periodo = PeriodoLectivo.objects.get(pk=options['periodo'])
+            semestre = (
+                SemestreAcademico.objects.get(pk=options['semestre_academico'])
+                if options['semestre_academico'] else None
+            )
+        except (PeriodoLectivo.DoesNotExist, SemestreAcademico.DoesNotExist) as error:
+            raise CommandError(str(error))
+
+        inicio = time.perf_counter()
+        reporte = validar_periodo(periodo, semestre, options['facultad'], options['carrera'])
+        duracion = time.perf_counter() - inicio
+
+        if options['json']:
+            self.stdout.write(json.dumps(reporte, ensure_ascii=False, indent=2))
+        else:
+            for resultado in reporte['resultados']:
+                self.stdout.write(f"Sílabo {resultado['silabo']} ({resultado['nombre']})")
+                for problema in resultado['problemas']:
+                    self.stdout.write(f"  [{problema['regla']}] {problema['mensaje']}")
+            self.stdout.write(
+                f"{reporte['silabos']} sílabos validados en {duracion:.2f} s: "
+                f"{reporte['con_problemas']} con problemas ({reporte['problemas']} en total)"
+            )
+        if options['fallar'] and reporte['problemas']:
+            raise CommandError(f"{reporte['con_problemas']} sílabos con problemas")
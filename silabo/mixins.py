@@ -0,0 +1,355 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from .cache import invalidar_modelo, respuesta_cacheada
+from .consultas import optimizar
+from .models import Silabo
+from .signals import RUTAS_SILABO, notificar_cambio_masivo, silabos_actuales, tocar_silabos
+
+
+class EagerLoadingMixin:
+    """
+    Aplica automáticamente `select_related`/`prefetch_related` según los
+    campos anidados del serializer de la acción en curso.
+
+    Si la petición usa `?fields=`/`?expand=`, el plan se calcula sobre el
+    serializer ya podado, de modo que las relaciones no pedidas no se cargan.
+    """
+
+    def serializer_para_carga(self):
+        params = self.request.query_params
+        if self.request.method in SAFE_METHODS and ('fields' in params or 'expand' in params):
+            return self.get_serializer()
+        return self.get_serializer_class()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return optimizar(queryset, self.serializer_para_carga())
+
+    def serializar(self, serializer_class, queryset):
+        """
+        Serializa un queryset relacionado (acciones de jerarquía) con el
+        contexto de la petición y su plan de carga
+        """
+        serializer = serializer_class(queryset, many=True, context=self.get_serializer_context())
+        serializer.instance = optimizar(queryset, serializer)
+        return serializer.data
+
+
+class CachedResponseMixin:
+    """
+    Cachea `list` y `retrieve` con claves versionadas por los modelos de
+    `cache_modelos` (ver cache.py). Pensado para catálogos de referencia.
+    """
+    cache_modelos = ()
+
+    def get_cache_modelos(self):
+        return self.cache_modelos or (self.get_queryset().model,)
+
+    def list(self, request, *args, **kwargs):
+        return respuesta_cacheada(
+            request, self.get_cache_modelos(),
+            lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return respuesta_cacheada(
+            request, self.get_cache_modelos(),
+            lambda: super(CachedResponseMixin, self).retrieve(request, *args, **kwargs),
+        )
+
+
+class BulkModelMixin:
+    """
+    Operaciones masivas para cualquier ModelViewSet:
+
+    - POST   /recurso/        con una lista → `bulk_create`
+    - PATCH  /recurso/bulk/   lista de objetos con `id` → `bulk_update`
+    - DELETE /recurso/bulk/   {"ids": [...]} → baja lógica (`activo=False`)
+
+    Todo se ejecuta en una transacción. Si algún elemento no es válido no se
+    escribe nada y se responde 400 con los errores por índice. Los
+    serializers con `create`/`update` propios (escrituras anidadas, hash de
+    contraseña) se guardan elemento a elemento dentro de la misma transacción.
+    """
+    bulk_batch_size = 500
+
+    def create(self, request, *args, **kwargs):
+        if isinstance(request.data, list):
+            return self.bulk_create(request)
+        return super().create(request, *args, **kwargs)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        _refrescar_generados(serializer.instance._meta.model, [serializer.instance])
+
+    # ←–– Validación ––→
+    def _validar_lote(self, items, instancias=None):
+        """
+        Valida cada elemento con un único serializer hijo. Devuelve la lista
+        de validated_data y la lista de errores por índice.
+        """
+        child = self.get_serializer(partial=instancias is not None)
+        _precargar_pk(child, items)
+        validos, errores = [], []
+        for indice, item in enumerate(items):
+            child.instance = instancias[indice] if instancias is not None else None
+            child.initial_data = item
+            try:
+                validos.append(child.run_validation(item))
+            except ValidationError as exc:
+                errores.append({'indice': indice, 'errores': exc.detail})
+        if not errores:
+            errores = self.validar_lote(instancias, validos)
+        return child, validos, errores
+
+    def validar_lote(self, instancias, validos):
+        """
+        Reglas que dependen de todo el lote (p. ej. ciclos entre elementos).
+        Devuelve los errores por índice; por defecto ninguno.
+        """
+        return []
+
+    def _respuesta_lote(self, model, pks, status_code):
+        serializer = self.get_serializer(many=True)
+        queryset = optimizar(model._default_manager.filter(pk__in=pks).order_by('pk'), serializer)
+        serializer.instance = queryset
+        return Response(serializer.data, status=status_code)
+
+    # ←–– Creación ––→
+    def bulk_create(self, request):
+        items = request.data
+        if not items or not all(isinstance(item, dict) for item in items):
+            return Response({'error': 'Se espera una lista de objetos'}, status=status.HTTP_400_BAD_REQUEST)
+
+        child, validos, errores = self._validar_lote(items)
+        if errores:
+            return Response({'errores': errores}, status=status.HTTP_400_BAD_REQUEST)
+
+        model = child.Meta.model
+        try:
+            with transaction.atomic():
+                if _tiene_escritura_propia(child, 'create'):
+                    pks = [child.create(data).pk for data in validos]
+                else:
+                    pks = self._insertar(model, validos)
+        except IntegrityError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return self._respuesta_lote(model, pks, status.HTTP_201_CREATED)
+
+    def _insertar(self, model, validos):
+        nombres_m2m = _campos_m2m(model)
+        objetos, relaciones = [], []
+        for data in validos:
+            relaciones.append({nombre: data.pop(nombre) for nombre in nombres_m2m if nombre in data})
+            objetos.append(model(**data))
+        model._default_manager.bulk_create(objetos, batch_size=self.bulk_batch_size)
+        _escribir_m2m(model, objetos, relaciones, self.bulk_batch_size)
+        pks = [obj.pk for obj in objetos]
+        notificar_cambio_masivo(model, pks, accion='crear')
+        return pks
+
+    # ←–– Actualización ––→
+    @action(detail=False, methods=['patch'], url_path='bulk')
+    def bulk_update(self, request):
+        """
+        Actualización parcial masiva: lista de objetos con `id`
+        """
+        items = request.data
+        if (not isinstance(items, list) or not items
+                or not all(isinstance(item, dict) and 'id' in item for item in items)):
+            return Response({'error': 'Se espera una lista de objetos con id'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.get_queryset()
+        try:
+            pks = _convertir_pks(queryset.model, [item['id'] for item in items])
+        except DjangoValidationError:
+            return Response({'error': 'Los id deben ser válidos'}, status=status.HTTP_400_BAD_REQUEST)
+
+        existentes = queryset.in_bulk(pks)
+        instancias, errores = [], []
+        for indice, pk in enumerate(pks):
+            instancia = existentes.get(pk)
+            if instancia is None:
+                errores.append({'indice': indice, 'errores': {'id': ['No encontrado']}})
+            instancias.append(instancia)
+        if errores:
+            return Response({'errores': errores}, status=status.HTTP_400_BAD_REQUEST)
+
+        child, validos, errores = self._validar_lote(items, instancias)
+        if errores:
+            return Response({'errores': errores}, status=status.HTTP_400_BAD_REQUEST)
+
+        model = child.Meta.model
+        try:
+            with transaction.atomic():
+                if _tiene_escritura_propia(child, 'update'):
+                    for instancia, data in zip(instancias, validos):
+                        child.update(instancia, data)
+                else:
+                    self._actualizar(model, instancias, validos)
+        except IntegrityError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return self._respuesta_lote(model, [i.pk for i in instancias], status.HTTP_200_OK)
+
+    def _actualizar(self, model, instancias, validos):
+        nombres_m2m = _campos_m2m(model)
+        campos, relaciones = set(), []
+        for instancia, data in zip(instancias, validos):
+            relaciones.append({nombre: data.pop(nombre) for nombre in nombres_m2m if nombre in data})
+            for campo, valor in data.items():
+                setattr(instancia, campo, valor)
+                campos.add(model._meta.get_field(campo).name)
+
+        # bulk_update no ejecuta pre_save: los auto_now se asignan a mano
+        ahora = timezone.now()
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False):
+                for instancia in instancias:
+                    setattr(instancia, field.attname, ahora)
+                campos.add(field.name)
+
+        # Los elementos que cambian de padre dejan de estar en su sílabo anterior
+        anteriores = set()
+        if model in RUTAS_SILABO and any(model._meta.get_field(campo).many_to_one for campo in campos):
+            anteriores = silabos_actuales(model, [i.pk for i in instancias])
+
+        if campos:
+            model._default_manager.bulk_update(instancias, sorted(campos), batch_size=self.bulk_batch_size)
+        _escribir_m2m(model, instancias, relaciones, self.bulk_batch_size, reemplazar=True)
+        _refrescar_generados(model, instancias)
+        notificar_cambio_masivo(model, [i.pk for i in instancias])
+        if anteriores:
+            tocar_silabos(Silabo.objects.filter(pk__in=anteriores))
+
+    # ←–– Baja lógica ––→
+    @bulk_update.mapping.delete
+    def bulk_destroy(self, request):
+        """
+        Baja lógica masiva: {"ids": [...]}. Los modelos sin `activo` se eliminan.
+        """
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or not ids:
+            return Response({'error': 'ids es requerido'}, status=status.HTTP_400_BAD_REQUEST)
+
+        model = self.get_queryset().model
+        try:
+            pks = _convertir_pks(model, ids)
+        except DjangoValidationError:
+            return Response({'error': 'Los ids deben ser válidos'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.get_queryset().filter(pk__in=pks)
+        encontrados = set(queryset.values_list('pk', flat=True))
+        with transaction.atomic():
+            if any(f.name == 'activo' for f in model._meta.concrete_fields):
+                queryset.update(activo=False)
+                notificar_cambio_masivo(model, list(encontrados), accion='eliminar')
+            else:
+                queryset.delete()
+        return Response({
+            'eliminados': len(encontrados),
+            'no_encontrados': [pk for pk, convertido in zip(ids, pks) if convertido not in encontrados],
+        })
+
+
+def _convertir_pks(model, valores):
+    """
+    Convierte los ids con el campo pk del modelo; DjangoValidationError si
+    alguno no es válido
+    """
+    campo = model._meta.pk
+    pks = [campo.to_python(valor) for valor in valores]
+    if None in pks:
+        raise DjangoValidationError('id requerido')
+    return pks
+
+
+def _normalizar_pk(valor):
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return valor
+
+
+def _tiene_escritura_propia(serializer, metodo):
+    return getattr(type(serializer), metodo) is not getattr(serializers.ModelSerializer, metodo)
+
+
+def _refrescar_generados(model, instancias):
+    """
+    Relee las columnas generadas (p. ej. Curso.horas_totales): Django no las
+    actualiza en la instancia tras un UPDATE. Una consulta para todo el lote.
+    """
+    campos = [f.attname for f in model._meta.concrete_fields if isinstance(f, models.GeneratedField)]
+    if not campos:
+        return
+    valores = model._default_manager.filter(pk__in=[i.pk for i in instancias]).values('pk', *campos)
+    valores = {fila.pop('pk'): fila for fila in valores}
+    for instancia in instancias:
+        for campo, valor in valores.get(instancia.pk, {}).items():
+            setattr(instancia, campo, valor)
+
+
+def _campos_m2m(model):
+    return [f.name for f in model._meta.many_to_many]
+
+
+def _escribir_m2m(model, objetos, relaciones, batch_size, reemplazar=False):
+    """
+    Escribe las relaciones M2M de todos los objetos directamente en la
+    tabla intermedia: un DELETE (si se reemplazan) y un INSERT por campo
+    """
+    for field in model._meta.many_to_many:
+        afectados = [(obj, rel[field.name]) for obj, rel in zip(objetos, relaciones) if field.name in rel]
+        if not afectados:
+            continue
+        through = field.remote_field.through
+        origen = field.m2m_field_name()
+        destino = field.m2m_reverse_field_name()
+        if reemplazar:
+            through._default_manager.filter(**{f"{origen}__in": [obj.pk for obj, _ in afectados]}).delete()
+        filas = [
+            through(**{f"{origen}_id": obj.pk, f"{destino}_id": relacionado.pk})
+            for obj, relacionados in afectados
+            for relacionado in relacionados
+        ]
+        through._default_manager.bulk_create(filas, batch_size=batch_size, ignore_conflicts=True)
+        invalidar_modelo(model)
+
+
+def _precargar_pk(serializer, items):
+    """
+    Resuelve de una vez los PrimaryKeyRelatedField de todo el lote (una
+    consulta por campo en lugar de una por elemento)
+    """
+    for nombre, field in serializer.fields.items():
+        if field.read_only:
+            continue
+        if isinstance(field, serializers.ManyRelatedField):
+            relacion = field.child_relation
+            valores = {v for item in items for v in (item.get(nombre) or []) if not isinstance(v, (dict, list))}
+        else:
+            relacion = field
+            valores = {item.get(nombre) for item in items if not isinstance(item.get(nombre), (dict, list))}
+        if not isinstance(relacion, serializers.PrimaryKeyRelatedField) or relacion.pk_field is not None:
+            continue
+        valores.discard(None)
+        if not valores:
+            continue
+        try:
+            objetos = relacion.get_queryset().in_bulk({_normalizar_pk(v) for v in valores})
+        except (TypeError, ValueError, DjangoValidationError):
+            continue
+        original = relacion.to_internal_value
+
+        def to_internal_value(data, objetos=objetos, original=original):
+            objeto = objetos.get(_normalizar_pk(data))
+            return objeto if objeto is not None else original(data)
+
+        relacion.to_internal_value = to_internal_value
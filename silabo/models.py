@@ -18,6 +18,8 @@ class CustomUser(AbstractUser):
 
     rol = models.ForeignKey(Rol, on_delete=models.SET_NULL, null=True, related_name="usuarios")
     activo = models.BooleanField(default=True)
+    # Marca de revocación de los JWT (ver autenticacion.py)
+    revision_token = models.BigIntegerField(default=0)
 
     USERNAME_FIELD = 'email'  # <-- ESTA LÍNEA ES CLAVE
     REQUIRED_FIELDS = ['username']  # Solo si aún quieres que username exista
@@ -30,7 +32,7 @@ class Persona(models.Model):
     nombre = models.CharField(max_length=200)
     apellido_paterno = models.CharField(max_length=200)
     apellido_materno = models.CharField(max_length=200)
-    dni = models.CharField(max_length=8)
+    dni = models.CharField(max_length=8, db_index=True)
     fecha_nacimiento = models.DateField()
     genero = models.CharField(max_length=1, choices=[("M", "Masculino"), ("F", "Femenino")])
     nacionalidad = models.CharField(max_length=50)
@@ -38,6 +40,15 @@ class Persona(models.Model):
     usuario = models.OneToOneField(CustomUser, on_delete=models.SET_NULL, null=True, related_name="persona")
     activo = models.BooleanField(default=True)
 
+    class Meta:
+        constraints = [
+            # Un DNI sólo puede estar activo una vez; los duplicados históricos
+            # se desactivan con `python manage.py deduplicar_dni`
+            models.UniqueConstraint(
+                fields=["dni"], condition=models.Q(activo=True), name="persona_dni_activo_unico"
+            ),
+        ]
+
     def __str__(self):
         return f"{self.apellido_paterno} {self.apellido_materno}, {self.nombre}"
 
@@ -47,10 +58,42 @@ class LogProcesos(models.Model):
     accion = models.TextField()
     usuario = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, related_name="logs")
 
+    class Meta:
+        indexes = [
+            # Paginación keyset de LogProcesosViewSet: ORDER BY fecha DESC, id DESC
+            models.Index(fields=["-fecha", "-id"], name="log_fecha_id_idx"),
+        ]
+
     def __str__(self):
         return f"{self.fecha} - {self.accion[:50]}"
 
 
+class LogActividadDiaria(models.Model):
+    """
+    Resumen de LogProcesos por día, usuario y tipo de acción (ver actividad.py)
+    """
+    fecha = models.DateField()
+    usuario = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, related_name="actividad_diaria")
+    accion = models.CharField(max_length=100)
+    total = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # usuario es NULL en las acciones del sistema: sin nulls_distinct=False
+            # PostgreSQL admitiría una fila repetida por cada acumulación
+            models.UniqueConstraint(
+                fields=["fecha", "usuario", "accion"], name="actividad_fecha_usuario_accion_unica",
+                nulls_distinct=False,
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["usuario", "fecha"], name="actividad_usuario_fecha_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.fecha} - {self.accion}: {self.total}"
+
+
 # ─────────────────────────────────────────────
 #  PROFESIONES Y PROFESORES
 # ─────────────────────────────────────────────
@@ -212,9 +255,15 @@ class Curso(models.Model):
     prerrequisitos = models.ManyToManyField("self", symmetrical=False, blank=True, related_name="requeridos_por")
     activo = models.BooleanField(default=True)
 
-    @property
-    def horas_totales(self):
-        return self.horas_teoria + self.horas_practica + self.horas_laboratorio + self.horas_teopra
+    # Columna calculada por la base de datos: se puede filtrar, ordenar y sumar en SQL
+    horas_totales = models.GeneratedField(
+        expression=(
+            models.F("horas_teoria") + models.F("horas_practica")
+            + models.F("horas_laboratorio") + models.F("horas_teopra")
+        ),
+        output_field=models.PositiveIntegerField(),
+        db_persist=True,
+    )
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
@@ -270,12 +319,23 @@ class Silabo(models.Model):
     sumilla = models.TextField(null=True)
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_modificacion = models.DateTimeField(auto_now=True)
+    # Última modificación del sílabo o de cualquier elemento de su árbol
+    # (unidades, semanas, contenidos, bibliografías, actividades, criterios)
+    fecha_modificacion_arbol = models.DateTimeField(auto_now=True, null=True)
     profesor = models.ForeignKey(Profesor, on_delete=models.CASCADE, related_name="silabos")
     facultad = models.ForeignKey(Facultad, on_delete=models.CASCADE, related_name="silabos")
     carrera = models.ForeignKey(Carrera, on_delete=models.CASCADE, related_name="silabos")
     curso = models.ForeignKey(Curso, on_delete=models.CASCADE, related_name="silabos")
     activo = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            # Paginación keyset de por_periodo / por_profesor / por_curso
+            models.Index(fields=["periodo_lectivo", "-id"], name="silabo_periodo_id_idx"),
+            models.Index(fields=["profesor", "-id"], name="silabo_profesor_id_idx"),
+            models.Index(fields=["curso", "-id"], name="silabo_curso_id_idx"),
+        ]
+
     def __str__(self):
         return f"Silabo {self.periodo_lectivo} - {self.curso}"
 
@@ -352,4 +412,58 @@ class CriterioEvaluacion(models.Model):
     activo = models.BooleanField(default=True)
 
     def __str__(self):
-        return self.nombre
\ No newline at end of file
+        return self.nombre
+
+
+# ─────────────────────────────────────────────
+#  REPORTES MATERIALIZADOS (ver avance.py)
+# ─────────────────────────────────────────────
+
+class AvanceSilabo(models.Model):
+    """
+    Conteos del árbol de cada sílabo activo, recalculados cuando cambia
+    `Silabo.fecha_modificacion_arbol`
+    """
+    silabo = models.OneToOneField(Silabo, on_delete=models.CASCADE, primary_key=True, related_name="avance")
+    periodo_lectivo = models.ForeignKey(PeriodoLectivo, on_delete=models.CASCADE, related_name="+")
+    facultad = models.ForeignKey(Facultad, on_delete=models.CASCADE, related_name="+")
+    carrera = models.ForeignKey(Carrera, on_delete=models.CASCADE, related_name="+")
+    curso = models.ForeignKey(Curso, on_delete=models.CASCADE, related_name="+")
+    profesor = models.ForeignKey(Profesor, on_delete=models.CASCADE, related_name="+")
+    unidades = models.PositiveIntegerField(default=0)
+    semanas = models.PositiveIntegerField(default=0)
+    contenidos = models.PositiveIntegerField(default=0)
+    bibliografias = models.PositiveIntegerField(default=0)
+    actividades = models.PositiveIntegerField(default=0)
+    criterios = models.PositiveIntegerField(default=0)
+    peso_criterios = models.FloatField(default=0)
+    porcentaje = models.PositiveSmallIntegerField(default=0)
+    completo = models.BooleanField(default=False)
+    fecha_arbol = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["periodo_lectivo", "carrera", "porcentaje"], name="avance_periodo_carrera_idx"),
+        ]
+
+
+class ResumenAvance(models.Model):
+    """
+    Totales por periodo, facultad y carrera: cargas asignadas, cuántas
+    tienen sílabo y el avance de esos sílabos
+    """
+    periodo_lectivo = models.ForeignKey(PeriodoLectivo, on_delete=models.CASCADE, related_name="+")
+    facultad = models.ForeignKey(Facultad, on_delete=models.CASCADE, null=True, related_name="+")
+    carrera = models.ForeignKey(Carrera, on_delete=models.CASCADE, null=True, related_name="+")
+    cargas = models.PositiveIntegerField(default=0)
+    cargas_con_silabo = models.PositiveIntegerField(default=0)
+    silabos = models.PositiveIntegerField(default=0)
+    completos = models.PositiveIntegerField(default=0)
+    porcentaje_promedio = models.FloatField(default=0)
+    actualizado = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["periodo_lectivo", "facultad", "carrera"], name="resumen_avance_unico"),
+        ]
+
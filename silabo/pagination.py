@@ -0,0 +1,130 @@
+import json
+from base64 import b64decode, b64encode
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Paginación por clave compuesta (keyset).
+
+    A diferencia de `CursorPagination`, el cursor guarda los valores de
+    *todas* las columnas de `ordering`, por lo que cada página se obtiene con
+    un `WHERE (a, b) < (x, y) ... LIMIT n` sobre el índice, sin OFFSET ni
+    `COUNT(*)`: la página 1000 cuesta lo mismo que la primera.
+    La última columna de `ordering` debe ser única (normalmente `id`).
+    """
+    ordering = ('-id',)
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+        posicion = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        if posicion is not None:
+            queryset = queryset.filter(self._despues_de(posicion))
+
+        filas = list(queryset[:self.page_size + 1])
+        self.has_next = len(filas) > self.page_size
+        self.page = filas[:self.page_size]
+        self.siguiente = self._posicion(self.page[-1]) if self.has_next else None
+        return self.page
+
+    def _campos(self):
+        return [(campo.lstrip('-'), campo.startswith('-')) for campo in self.ordering]
+
+    def _posicion(self, instancia):
+        return [str(getattr(instancia, campo)) for campo, _ in self._campos()]
+
+    def _despues_de(self, posicion):
+        """
+        Construye (a < x) OR (a = x AND b < y) OR ... según el orden de cada campo
+        """
+        campos = self._campos()
+        condicion = Q()
+        iguales = {}
+        for (campo, desc), valor in zip(campos, posicion):
+            lookup = f"{campo}__lt" if desc else f"{campo}__gt"
+            condicion |= Q(**iguales, **{lookup: valor})
+            iguales[campo] = valor
+        return condicion
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            posicion = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        campos = self._campos()
+        if not isinstance(posicion, list) or len(posicion) != len(campos):
+            raise NotFound(self.invalid_cursor_message)
+        # El cursor llega del cliente: cada valor se convierte al tipo de su campo
+        try:
+            valores = [self.model._meta.get_field(campo).to_python(valor) for (campo, _), valor in zip(campos, posicion)]
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        if None in valores:
+            raise NotFound(self.invalid_cursor_message)
+        return valores
+
+    def encode_cursor(self, posicion):
+        encoded = b64encode(json.dumps(posicion).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.siguiente)
+
+    def get_previous_link(self):
+        return None
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class OptionalKeysetPagination(KeysetPagination):
+    """
+    Keyset opcional: sólo pagina cuando el cliente envía `cursor` o
+    `page_size`; sin ellos la respuesta sigue siendo la lista completa.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+
+class LogPagination(KeysetPagination):
+    """
+    Logs del sistema, del más reciente al más antiguo
+    """
+    ordering = ('-fecha', '-id')
@@ -1,17 +1,72 @@
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from .models import *
+from .grafo import obtener_grafo
+
+
+def _lista_param(valor):
+    return {v.strip() for v in valor.split(',') if v.strip()} if valor else set()
+
+
+class DynamicFieldsMixin:
+    """
+    Permite elegir columnas (`?fields=id,nombre`) y expandir relaciones
+    anidadas (`?expand=curso_detalle,curso_detalle.area_detalle`).
+
+    Sin ninguno de los dos parámetros se devuelve la representación completa.
+    Con cualquiera de ellos, los campos anidados (`*_detalle` y serializers
+    anidados) sólo se incluyen si se piden en `expand`, en cualquier nivel.
+    Sólo aplica a lecturas; las escrituras usan siempre todos los campos.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return
+        params = request.query_params
+        if 'fields' not in params and 'expand' not in params:
+            return
+        campos = _lista_param(params.get('fields')) or None
+        self.podar_campos(campos, _lista_param(params.get('expand')))
+
+    @staticmethod
+    def es_expandible(nombre, field):
+        return nombre.endswith('_detalle') or isinstance(field, serializers.BaseSerializer)
+
+    def podar_campos(self, campos, expand):
+        """
+        Elimina de `self.fields` lo no solicitado y repite el proceso en los
+        serializers anidados que quedan, con la parte de `expand` que les toca.
+        """
+        expand_directo = {e.split('.', 1)[0] for e in expand}
+        for nombre, field in list(self.fields.items()):
+            expandible = self.es_expandible(nombre, field)
+            if campos is not None:
+                mantener = nombre in campos or nombre in expand_directo
+            else:
+                mantener = not expandible or nombre in expand_directo
+            if not mantener:
+                self.fields.pop(nombre)
+                continue
+
+            anidado = field.child if isinstance(field, serializers.ListSerializer) else field
+            if isinstance(anidado, DynamicFieldsMixin):
+                prefijo = nombre + '.'
+                sub_expand = {e[len(prefijo):] for e in expand if e.startswith(prefijo)}
+                anidado.podar_campos(None, sub_expand)
 
 # ─────────────────────────────────────────────
 #  SEGURIDAD
 # ─────────────────────────────────────────────
 
-class RolSerializer(serializers.ModelSerializer):
+class RolSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Rol
         fields = "__all__"
 
 
-class CustomUserSerializer(serializers.ModelSerializer):
+class CustomUserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True, style={'input_type': 'password'})
     rol_detalle = RolSerializer(source='rol', read_only=True)
 
@@ -43,7 +98,7 @@ class CustomUserSerializer(serializers.ModelSerializer):
         return instance
 
 
-class PersonaSerializer(serializers.ModelSerializer):
+class PersonaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     usuario = CustomUserSerializer()
 
     class Meta:
@@ -70,7 +125,16 @@ class PersonaSerializer(serializers.ModelSerializer):
         return instance
 
 
-class LogProcesosSerializer(serializers.ModelSerializer):
+class ImportacionPersonasSerializer(serializers.Serializer):
+    """
+    Formulario de PersonaViewSet.importar
+    """
+    archivo = serializers.FileField()
+    tipo = serializers.ChoiceField(choices=["estudiante", "profesor"], default="estudiante")
+    rol = serializers.PrimaryKeyRelatedField(queryset=Rol.objects.all(), required=False, allow_null=True)
+
+
+class LogProcesosSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     usuario_detalle = CustomUserSerializer(source='usuario', read_only=True)
 
     class Meta:
@@ -82,13 +146,13 @@ class LogProcesosSerializer(serializers.ModelSerializer):
 #  Estructura académica
 # ─────────────────────────────────────────────
 
-class UniversidadSerializer(serializers.ModelSerializer):
+class UniversidadSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Universidad
         fields = "__all__"
 
 
-class FacultadSerializer(serializers.ModelSerializer):
+class FacultadSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     universidad = serializers.PrimaryKeyRelatedField(queryset=Universidad.objects.all())
     universidad_detalle = UniversidadSerializer(source='universidad', read_only=True)
 
@@ -97,7 +161,7 @@ class FacultadSerializer(serializers.ModelSerializer):
         fields = ['id', 'nombre', 'descripcion', 'activo', 'universidad', 'universidad_detalle']
 
 
-class DepartamentoSerializer(serializers.ModelSerializer):
+class DepartamentoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     facultad = serializers.PrimaryKeyRelatedField(queryset=Facultad.objects.all())
     facultad_detalle = FacultadSerializer(source='facultad', read_only=True)
 
@@ -106,7 +170,7 @@ class DepartamentoSerializer(serializers.ModelSerializer):
         fields = ['id', 'nombre', 'activo', 'facultad', 'facultad_detalle']
         
 
-class CarreraSerializer(serializers.ModelSerializer):
+class CarreraSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     departamento = serializers.PrimaryKeyRelatedField(queryset=Departamento.objects.all())
     departamento_detalle = DepartamentoSerializer(source='departamento', read_only=True)
 
@@ -119,7 +183,7 @@ class CarreraSerializer(serializers.ModelSerializer):
 #  Planes de estudio y periodos
 # ─────────────────────────────────────────────
 
-class PlanCurricularSerializer(serializers.ModelSerializer):
+class PlanCurricularSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     carrera = serializers.PrimaryKeyRelatedField(queryset=Carrera.objects.all())
     carrera_detalle = CarreraSerializer(source='carrera', read_only=True)
 
@@ -128,13 +192,13 @@ class PlanCurricularSerializer(serializers.ModelSerializer):
         fields = ['id', 'tag', 'activo', 'fecha_culminacion', 'carrera', 'carrera_detalle']
 
 
-class SemestreAcademicoSerializer(serializers.ModelSerializer):
+class SemestreAcademicoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = SemestreAcademico
         fields = "__all__"
 
 
-class SemestrePlanSerializer(serializers.ModelSerializer):
+class SemestrePlanSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     plan = serializers.PrimaryKeyRelatedField(queryset=PlanCurricular.objects.all())
     plan_detalle = PlanCurricularSerializer(source='plan', read_only=True)
     semestre_academico = serializers.PrimaryKeyRelatedField(queryset=SemestreAcademico.objects.all())
@@ -150,19 +214,19 @@ class SemestrePlanSerializer(serializers.ModelSerializer):
 #  Cursos y prerrequisitos
 # ─────────────────────────────────────────────
 
-class AreaSerializer(serializers.ModelSerializer):
+class AreaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Area
         fields = "__all__"
 
 
-class TipoCursoSerializer(serializers.ModelSerializer):
+class TipoCursoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = TipoCurso
         fields = "__all__"
 
 
-class CursoSerializer(serializers.ModelSerializer):
+class CursoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     area = serializers.PrimaryKeyRelatedField(queryset=Area.objects.all())
     area_detalle = AreaSerializer(source='area', read_only=True)
     
@@ -188,18 +252,37 @@ class CursoSerializer(serializers.ModelSerializer):
                   'semestre', 'semestre_detalle',
                   'prerrequisitos', 'prerrequisitos_detalle']
 
+    def validate(self, attrs):
+        prerrequisitos = attrs.get('prerrequisitos')
+        if prerrequisitos is None or self.instance is None:
+            return attrs
+
+        curso = self.instance
+        ids = [p.pk for p in prerrequisitos]
+        if curso.pk in ids:
+            raise serializers.ValidationError(
+                {'prerrequisitos': 'Un curso no puede ser prerrequisito de sí mismo'}
+            )
+        semestre = attrs.get('semestre', curso.semestre)
+        if semestre is not None and semestre.plan_id is not None:
+            if obtener_grafo(semestre.plan_id).crearia_ciclo(curso.pk, ids):
+                raise serializers.ValidationError(
+                    {'prerrequisitos': 'Los prerrequisitos forman un ciclo'}
+                )
+        return attrs
+
 
 # ─────────────────────────────────────────────
 #  Profesores y carga académica
 # ─────────────────────────────────────────────
 
-class ProfesionSerializer(serializers.ModelSerializer):
+class ProfesionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Profesion
         fields = "__all__"
 
 
-class ProfesorSerializer(serializers.ModelSerializer):
+class ProfesorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     persona = PersonaSerializer()
     profesion_detalle = ProfesionSerializer(source='profesion', read_only=True)
 
@@ -225,7 +308,7 @@ class ProfesorSerializer(serializers.ModelSerializer):
         return instance
 
 
-class CargaCursoSerializer(serializers.ModelSerializer):
+class CargaCursoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     profesor = serializers.PrimaryKeyRelatedField(queryset=Profesor.objects.all())
     profesor_detalle = ProfesorSerializer(source='profesor', read_only=True)
     curso = serializers.PrimaryKeyRelatedField(queryset=Curso.objects.all())
@@ -237,7 +320,7 @@ class CargaCursoSerializer(serializers.ModelSerializer):
                  "detalles", "activo"]
 
 
-class GrupoSerializer(serializers.ModelSerializer):
+class GrupoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     curso = serializers.PrimaryKeyRelatedField(queryset=Curso.objects.all())
     curso_detalle = CursoSerializer(source='curso', read_only=True)
 
@@ -250,7 +333,7 @@ class GrupoSerializer(serializers.ModelSerializer):
 #  Estudiantes
 # ─────────────────────────────────────────────
 
-class EstudianteSerializer(serializers.ModelSerializer):
+class EstudianteSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     persona = PersonaSerializer()
 
     class Meta:
@@ -275,35 +358,60 @@ class EstudianteSerializer(serializers.ModelSerializer):
         return instance
 
 
+class EstudianteResumenSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Estudiante
+        fields = ["id", "fecha_creacion", "activo"]
+
+
+class ProfesorResumenSerializer(serializers.ModelSerializer):
+    profesion_detalle = ProfesionSerializer(source='profesion', read_only=True)
+
+    class Meta:
+        model = Profesor
+        fields = ["id", "profesion", "profesion_detalle", "activo"]
+
+
+class PersonaVinculosSerializer(PersonaSerializer):
+    """
+    Persona con su usuario, estudiante y profesor (búsqueda masiva por DNI)
+    """
+    estudiante = EstudianteResumenSerializer(read_only=True)
+    profesor = ProfesorResumenSerializer(read_only=True)
+
+    class Meta(PersonaSerializer.Meta):
+        fields = PersonaSerializer.Meta.fields + ["estudiante", "profesor"]
+
+
 # ─────────────────────────────────────────────
 #  Modelos complementarios para el sílabo
 # ─────────────────────────────────────────────
 
-class PeriodoLectivoSerializer(serializers.ModelSerializer):
+class PeriodoLectivoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = PeriodoLectivo
         fields = "__all__"
 
 
-class MetodologiaSerializer(serializers.ModelSerializer):
+class MetodologiaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Metodologia
         fields = "__all__"
 
 
-class BibliografiaSerializer(serializers.ModelSerializer):
+class BibliografiaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Bibliografia
         fields = "__all__"
 
 
-class SemanaSerializer(serializers.ModelSerializer):
+class SemanaSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Semana
         fields = "__all__"
 
 
-class ContenidoEspecificoSerializer(serializers.ModelSerializer):
+class ContenidoEspecificoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     semana = serializers.PrimaryKeyRelatedField(queryset=Semana.objects.all())
     semana_detalle = SemanaSerializer(source='semana', read_only=True)
 
@@ -312,7 +420,7 @@ class ContenidoEspecificoSerializer(serializers.ModelSerializer):
         fields = ["id", "contenido", "activo", "semana", "semana_detalle"]
 
 
-class UnidadSerializer(serializers.ModelSerializer):
+class UnidadSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     metodologia = serializers.CharField()  # Como es TextField en el modelo
     silabo = serializers.PrimaryKeyRelatedField(queryset=Silabo.objects.all())
     silabo_detalle = serializers.StringRelatedField(source='silabo', read_only=True)
@@ -323,7 +431,7 @@ class UnidadSerializer(serializers.ModelSerializer):
                  "activo", "silabo", "silabo_detalle"]
 
 
-class ActividadSerializer(serializers.ModelSerializer):
+class ActividadSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     silabo = serializers.PrimaryKeyRelatedField(queryset=Silabo.objects.all())
     silabo_detalle = serializers.StringRelatedField(source='silabo', read_only=True)
 
@@ -332,7 +440,7 @@ class ActividadSerializer(serializers.ModelSerializer):
         fields = ["id", "nombre", "descripcion", "activo", "silabo", "silabo_detalle"]
 
 
-class CriterioEvaluacionSerializer(serializers.ModelSerializer):
+class CriterioEvaluacionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     silabo = serializers.PrimaryKeyRelatedField(queryset=Silabo.objects.all())
     silabo_detalle = serializers.StringRelatedField(source='silabo', read_only=True)
 
@@ -346,7 +454,7 @@ class CriterioEvaluacionSerializer(serializers.ModelSerializer):
 #  Silabos
 # ─────────────────────────────────────────────
 
-class SilaboSerializer(serializers.ModelSerializer):
+class SilaboSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     periodo_lectivo = serializers.PrimaryKeyRelatedField(queryset=PeriodoLectivo.objects.all())
     periodo_lectivo_detalle = PeriodoLectivoSerializer(source='periodo_lectivo', read_only=True)
 
@@ -369,11 +477,160 @@ class SilaboSerializer(serializers.ModelSerializer):
         fields = [
             "id", "nombre", "competencia_curso", "competencia_perfil_egreso", 
             "competencia_profesional", "sumilla", "fecha_creacion", 
-            "fecha_modificacion", "activo",
+            "fecha_modificacion", "fecha_modificacion_arbol", "activo",
             "periodo_lectivo", "periodo_lectivo_detalle",
             "profesor", "profesor_detalle",
             "facultad", "facultad_detalle",
             "carrera", "carrera_detalle",
             "curso", "curso_detalle"
         ]
-        read_only_fields = ["fecha_creacion", "fecha_modificacion"]
\ No newline at end of file
+        read_only_fields = ["fecha_creacion", "fecha_modificacion", "fecha_modificacion_arbol"]
+
+
+class ClonacionSilaboSerializer(serializers.Serializer):
+    """
+    Parámetros de SilaboViewSet.clonar. Sin semestres, se buscan los
+    SemestreAcademico con el mismo nombre que cada periodo lectivo.
+    """
+    periodo_lectivo = serializers.PrimaryKeyRelatedField(queryset=PeriodoLectivo.objects.all())
+    semestre_origen = serializers.PrimaryKeyRelatedField(queryset=SemestreAcademico.objects.all(), required=False)
+    semestre_destino = serializers.PrimaryKeyRelatedField(queryset=SemestreAcademico.objects.all(), required=False)
+    profesor = serializers.PrimaryKeyRelatedField(queryset=Profesor.objects.all(), required=False)
+
+# ─────────────────────────────────────────────
+#  Documento completo del sílabo
+# ─────────────────────────────────────────────
+
+class ContenidoDocumentoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = ContenidoEspecifico
+        fields = ["id", "contenido", "activo"]
+
+
+class SemanaDocumentoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    contenidos = ContenidoDocumentoSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Semana
+        fields = ["id", "numero", "activo", "contenidos"]
+
+
+class BibliografiaDocumentoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Bibliografia
+        fields = ["id", "autor", "libro", "fecha", "link", "nombre", "activo"]
+
+
+class UnidadDocumentoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    semanas = SemanaDocumentoSerializer(many=True, read_only=True)
+    bibliografias = BibliografiaDocumentoSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Unidad
+        fields = ["id", "numero", "inicio", "final", "descripcion", "metodologia",
+                  "activo", "semanas", "bibliografias"]
+
+
+class ActividadDocumentoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Actividad
+        fields = ["id", "nombre", "descripcion", "activo"]
+
+
+class CriterioDocumentoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = CriterioEvaluacion
+        fields = ["id", "nombre", "peso", "fecha_inicio", "fecha_fin",
+                  "descripcion", "activo"]
+
+
+class SilaboDocumentoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Sílabo con todo su árbol. Debe usarse sobre un queryset con
+    `consultas.prefetch_documento()` para mantener fijo el número de consultas.
+    """
+    unidades = UnidadDocumentoSerializer(many=True, read_only=True)
+    actividades = ActividadDocumentoSerializer(many=True, read_only=True)
+    criterios_evaluacion = CriterioDocumentoSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Silabo
+        fields = [
+            "id", "nombre", "competencia_curso", "competencia_perfil_egreso",
+            "competencia_profesional", "sumilla", "fecha_creacion",
+            "fecha_modificacion", "fecha_modificacion_arbol", "activo",
+            "periodo_lectivo", "profesor", "facultad", "carrera", "curso",
+            "unidades", "actividades", "criterios_evaluacion"
+        ]
+        read_only_fields = ["fecha_creacion", "fecha_modificacion", "fecha_modificacion_arbol"]
+
+
+# ←–– Escritura del documento (PUT silabos/{id}/documento/) ––→
+# Sin `id` la fila es nueva; las filas activas que no aparecen se dan de baja
+
+class ContenidoEscrituraSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = ContenidoEspecifico
+        fields = ["id", "contenido"]
+
+
+class SemanaEscrituraSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+    contenidos = ContenidoEscrituraSerializer(many=True)
+
+    class Meta:
+        model = Semana
+        fields = ["id", "numero", "contenidos"]
+
+
+class BibliografiaEscrituraSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = Bibliografia
+        fields = ["id", "autor", "libro", "fecha", "link", "nombre"]
+
+
+class UnidadEscrituraSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+    semanas = SemanaEscrituraSerializer(many=True)
+    bibliografias = BibliografiaEscrituraSerializer(many=True)
+
+    class Meta:
+        model = Unidad
+        fields = ["id", "numero", "inicio", "final", "descripcion", "metodologia", "semanas", "bibliografias"]
+
+
+class ActividadEscrituraSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = Actividad
+        fields = ["id", "nombre", "descripcion"]
+
+
+class CriterioEscrituraSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = CriterioEvaluacion
+        fields = ["id", "nombre", "peso", "fecha_inicio", "fecha_fin", "descripcion"]
+
+
+class SilaboDocumentoEscrituraSerializer(serializers.ModelSerializer):
+    """
+    Documento completo: todas las listas son obligatorias, porque una lista
+    vacía da de baja los elementos que contenía
+    """
+    unidades = UnidadEscrituraSerializer(many=True)
+    actividades = ActividadEscrituraSerializer(many=True)
+    criterios_evaluacion = CriterioEscrituraSerializer(many=True)
+
+    class Meta:
+        model = Silabo
+        fields = [
+            "nombre", "competencia_curso", "competencia_perfil_egreso", "competencia_profesional",
+            "sumilla", "unidades", "actividades", "criterios_evaluacion",
+        ]
@@ -0,0 +1,209 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save, pre_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .actividad import acumular
+from .auditoria import registrar
+from .autenticacion import CAMPOS_TOKEN, revocar
+from .cache import invalidar_modelo
+from .grafo import PrerrequisitoThrough, aplicar_cambio, invalidar_grafos, plan_de_curso
+from .models import (
+    CustomUser, Curso, SemestrePlan, Silabo, Unidad, Semana, ContenidoEspecifico, Bibliografia,
+    Actividad, CriterioEvaluacion, LogProcesos, LogActividadDiaria, AvanceSilabo, ResumenAvance,
+)
+
+
+def _es_de_la_app(sender):
+    return sender._meta.app_label == 'silabo'
+
+
+# ─────────────────────────────────────────────
+#  Invalidación de la caché versionada
+# ─────────────────────────────────────────────
+#
+# La versión se incrementa al confirmar la transacción: si se incrementara
+# antes, una lectura concurrente podría volver a cachear los datos viejos
+# con la versión nueva.
+
+def invalidar_al_confirmar(model):
+    transaction.on_commit(lambda: invalidar_modelo(model))
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidar_cache(sender, **kwargs):
+    if _es_de_la_app(sender):
+        invalidar_al_confirmar(sender)
+
+
+@receiver(m2m_changed)
+def invalidar_cache_m2m(sender, instance, action, **kwargs):
+    if action.startswith('post_') and _es_de_la_app(type(instance)):
+        invalidar_al_confirmar(type(instance))
+
+
+# ─────────────────────────────────────────────
+#  Sello de modificación del árbol del sílabo
+# ─────────────────────────────────────────────
+
+# Ruta desde Silabo hasta cada modelo hijo
+RUTAS_SILABO = {
+    Unidad: 'unidades',
+    Actividad: 'actividades',
+    CriterioEvaluacion: 'criterios_evaluacion',
+    Semana: 'unidades__semanas',
+    Bibliografia: 'unidades__bibliografias',
+    ContenidoEspecifico: 'unidades__semanas__contenidos',
+}
+
+
+def silabos_de(model, pks):
+    """
+    Queryset de los sílabos que contienen las filas `pks` de `model`
+    """
+    return Silabo.objects.filter(**{f"{RUTAS_SILABO[model]}__in": pks})
+
+
+def tocar_silabos(queryset):
+    """
+    Actualiza `fecha_modificacion_arbol` con un único UPDATE
+    """
+    return queryset.update(fecha_modificacion_arbol=timezone.now())
+
+
+def tocar_arbol(model, pks):
+    tocar_silabos(silabos_de(model, pks))
+
+
+def silabos_actuales(model, pks):
+    """
+    Ids de los sílabos que contienen hoy las filas `pks` (antes de moverlas)
+    """
+    return set(silabos_de(model, pks).values_list('pk', flat=True))
+
+
+@receiver(pre_save)
+def recordar_silabo_anterior(sender, instance, **kwargs):
+    # Si el elemento pasa a otro sílabo, el anterior también cambia
+    if sender in RUTAS_SILABO and instance.pk is not None and not instance._state.adding:
+        instance._silabos_anteriores = silabos_actuales(sender, [instance.pk])
+
+
+@receiver(post_save)
+@receiver(pre_delete)
+def tocar_arbol_silabo(sender, instance, **kwargs):
+    if sender not in RUTAS_SILABO:
+        return
+    anteriores = instance.__dict__.pop('_silabos_anteriores', set())
+    if hasattr(instance, 'silabo_id'):
+        ids = anteriores | ({instance.silabo_id} if instance.silabo_id is not None else set())
+        if ids:
+            tocar_silabos(Silabo.objects.filter(pk__in=ids))
+    elif anteriores:
+        tocar_silabos(Silabo.objects.filter(pk__in=anteriores | silabos_actuales(sender, [instance.pk])))
+    else:
+        tocar_arbol(sender, [instance.pk])
+
+
+# ─────────────────────────────────────────────
+#  Grafo de prerrequisitos
+# ─────────────────────────────────────────────
+
+@receiver(post_save, sender=Curso)
+@receiver(post_delete, sender=Curso)
+@receiver(post_save, sender=SemestrePlan)
+@receiver(post_delete, sender=SemestrePlan)
+def invalidar_grafo(sender, **kwargs):
+    transaction.on_commit(invalidar_grafos)
+
+
+@receiver(m2m_changed, sender=PrerrequisitoThrough)
+def actualizar_grafo(sender, instance, action, reverse, pk_set, **kwargs):
+    # Como la caché, el grafo del proceso cambia sólo al confirmar: si la
+    # transacción se revierte queda intacto
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse or action == 'post_clear':
+        transaction.on_commit(invalidar_grafos)
+        return
+    plan_id = plan_de_curso(instance)
+    if plan_id is None:
+        return
+    enlaces = set(pk_set)
+    if action == 'post_add':
+        transaction.on_commit(lambda: aplicar_cambio(plan_id, instance.pk, agregados=enlaces))
+    else:
+        transaction.on_commit(lambda: aplicar_cambio(plan_id, instance.pk, quitados=enlaces))
+
+
+# ─────────────────────────────────────────────
+#  Revocación de tokens JWT
+# ─────────────────────────────────────────────
+
+@receiver(pre_save, sender=CustomUser)
+def revocar_tokens_si_cambian_claims(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+    anterior = sender.objects.filter(pk=instance.pk).values(*CAMPOS_TOKEN).first()
+    if anterior and any(anterior[c] != getattr(instance, c) for c in CAMPOS_TOKEN):
+        # La instancia lleva la marca nueva para que el save no la pise
+        revocar(instance.pk, instancia=instance)
+
+
+@receiver(post_delete, sender=CustomUser)
+def revocar_tokens_al_borrar(sender, instance, **kwargs):
+    revocar(instance.pk)
+
+
+# ─────────────────────────────────────────────
+#  Auditoría
+# ─────────────────────────────────────────────
+
+# Modelos que no se auditan
+SIN_AUDITORIA = {LogProcesos, LogActividadDiaria, AvanceSilabo, ResumenAvance}
+
+
+def _auditable(sender):
+    return _es_de_la_app(sender) and sender not in SIN_AUDITORIA
+
+
+@receiver(post_save)
+def auditar_guardado(sender, instance, created, raw=False, **kwargs):
+    if _auditable(sender) and not raw:
+        registrar('crear' if created else 'actualizar', sender, [instance.pk])
+
+
+@receiver(post_delete)
+def auditar_borrado(sender, instance, **kwargs):
+    if _auditable(sender):
+        registrar('eliminar', sender, [instance.pk])
+
+
+@receiver(post_save, sender=LogProcesos)
+def acumular_log(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        acumular([instance])
+
+
+# ─────────────────────────────────────────────
+#  Escrituras masivas
+# ─────────────────────────────────────────────
+
+def notificar_cambio_masivo(model, pks, accion='actualizar', tocar=True):
+    """
+    Equivalente a las señales anteriores para escrituras que no las
+    disparan (`bulk_create`, `bulk_update`, `QuerySet.update()`). Con
+    `tocar=False` el llamador actualiza él mismo el sello de los sílabos.
+    """
+    if _auditable(model):
+        registrar(accion, model, pks)
+    if model is LogProcesos and accion == 'crear':
+        acumular(LogProcesos.objects.filter(pk__in=pks))
+    invalidar_al_confirmar(model)
+    if model is Curso:
+        transaction.on_commit(invalidar_grafos)
+    if model is CustomUser:
+        revocar(*pks)
+    if tocar and model in RUTAS_SILABO and pks:
+        tocar_arbol(model, pks)
@@ -1,3 +1,1249 @@
-from django.test import TestCase
+import io
+from datetime import date
 
-# Create your tests here.
+from django.db import connection
+from django.db.models import F
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from .models import *
+
+
+def crear_estructura():
+    """
+    Crea la estructura académica mínima para registrar un sílabo
+    """
+    rol = Rol.objects.create(nombre="Docente")
+    usuario = CustomUser.objects.create_user(
+        username="docente", email="docente@uni.edu", password="clave-segura", rol=rol
+    )
+    persona = Persona.objects.create(
+        nombre="Ana", apellido_paterno="Quispe", apellido_materno="Mamani",
+        dni="12345678", fecha_nacimiento=date(1980, 1, 1), genero="F",
+        nacionalidad="Peruana", usuario=usuario,
+    )
+    profesor = Profesor.objects.create(persona=persona)
+    universidad = Universidad.objects.create(nombre="UNSA")
+    facultad = Facultad.objects.create(nombre="Ingeniería", universidad=universidad)
+    departamento = Departamento.objects.create(nombre="Sistemas", facultad=facultad)
+    carrera = Carrera.objects.create(nombre="Ingeniería de Sistemas", departamento=departamento)
+    plan = PlanCurricular.objects.create(tag="2023", carrera=carrera)
+    semestre_academico = SemestreAcademico.objects.create(
+        nombre="2025-I", anio_academico=2025, periodo="I",
+        fecha_inicio=date(2025, 3, 1), fecha_fin=date(2025, 7, 15), semanas=17,
+    )
+    semestre = SemestrePlan.objects.create(
+        nombre="I", detalles="", plan=plan, semestre_academico=semestre_academico
+    )
+    curso = Curso.objects.create(
+        codigo="IS101", nombre="Programación", horas_teoria=2, horas_practica=2,
+        horas_laboratorio=2, creditos=4, semestre=semestre,
+    )
+    periodo = PeriodoLectivo.objects.create(periodo="2025-I")
+    return {
+        "usuario": usuario, "profesor": profesor, "facultad": facultad,
+        "carrera": carrera, "curso": curso, "periodo": periodo,
+        "semestre_academico": semestre_academico,
+    }
+
+
+def crear_silabo(estructura):
+    return Silabo.objects.create(
+        nombre="Programación 2025-I", periodo_lectivo=estructura["periodo"],
+        profesor=estructura["profesor"], facultad=estructura["facultad"],
+        carrera=estructura["carrera"], curso=estructura["curso"],
+    )
+
+
+def poblar_silabo(silabo, unidades):
+    """
+    Agrega `unidades` unidades con dos semanas (numeradas en todo el sílabo),
+    dos contenidos por semana, una bibliografía, una actividad y un criterio
+    por unidad
+    """
+    for n in range(1, unidades + 1):
+        unidad = Unidad.objects.create(
+            numero=n, inicio=date(2025, 3, 1), final=date(2025, 4, 1),
+            descripcion=f"Unidad {n}", metodologia="Expositiva", silabo=silabo,
+        )
+        Bibliografia.objects.create(autor="Knuth", libro="TAOCP", fecha=date(1968, 1, 1), unidad=unidad)
+        Actividad.objects.create(nombre=f"Actividad {n}", descripcion="-", silabo=silabo)
+        CriterioEvaluacion.objects.create(
+            nombre=f"Examen {n}", peso=10, fecha_inicio=date(2025, 3, 1),
+            fecha_fin=date(2025, 4, 1), descripcion="-", silabo=silabo,
+        )
+        for numero in (2 * n - 1, 2 * n):
+            semana = Semana.objects.create(numero=numero, unidad=unidad)
+            ContenidoEspecifico.objects.create(contenido="Tema A", semana=semana)
+            ContenidoEspecifico.objects.create(contenido="Tema B", semana=semana)
+
+
+class SilaboDocumentoTests(TestCase):
+
+    def setUp(self):
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+
+    def consultas_documento(self, silabo):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f"/silabo/silabos/{silabo.id}/documento/")
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+    def test_documento_incluye_arbol_completo(self):
+        silabo = crear_silabo(self.estructura)
+        poblar_silabo(silabo, 2)
+
+        response, _ = self.consultas_documento(silabo)
+
+        self.assertEqual(len(response.data["unidades"]), 2)
+        unidad = response.data["unidades"][0]
+        self.assertEqual(len(unidad["semanas"]), 2)
+        self.assertEqual(len(unidad["semanas"][0]["contenidos"]), 2)
+        self.assertEqual(len(unidad["bibliografias"]), 1)
+        self.assertEqual(len(response.data["actividades"]), 2)
+        self.assertEqual(len(response.data["criterios_evaluacion"]), 2)
+
+    def test_documento_consultas_constantes(self):
+        pequeno = crear_silabo(self.estructura)
+        poblar_silabo(pequeno, 1)
+        grande = crear_silabo(self.estructura)
+        poblar_silabo(grande, 6)
+
+        _, consultas_pequeno = self.consultas_documento(pequeno)
+        _, consultas_grande = self.consultas_documento(grande)
+
+        self.assertEqual(consultas_pequeno, consultas_grande)
+
+
+class CargaAnticipadaTests(TestCase):
+
+    def setUp(self):
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+
+    def consultas_listado(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_listado_silabos_consultas_constantes(self):
+        crear_silabo(self.estructura)
+        una = self.consultas_listado("/silabo/silabos/")
+        for _ in range(4):
+            crear_silabo(self.estructura)
+        varias = self.consultas_listado("/silabo/silabos/")
+        self.assertEqual(una, varias)
+
+    def test_plan_incluye_prerrequisitos(self):
+        from .consultas import plan_de_carga
+        from .serializers import CursoSerializer
+
+        select, prefetch = plan_de_carga(CursoSerializer)
+        self.assertIn("semestre__plan__carrera__departamento__facultad__universidad", select)
+        self.assertIn("prerrequisitos", prefetch)
+
+
+class PaginacionKeysetTests(TestCase):
+
+    def setUp(self):
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+
+    def test_logs_recorre_todas_las_paginas_sin_count(self):
+        usuario = self.estructura["usuario"]
+        for n in range(7):
+            # Varias entradas comparten fecha: el id desempata
+            LogProcesos.objects.create(fecha=date(2025, 3, 1 + n % 2), accion=f"accion {n}", usuario=usuario)
+
+        vistos = []
+        url = "/silabo/logs/?page_size=3"
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(any("COUNT(" in q["sql"] for q in ctx.captured_queries))
+            vistos.extend(fila["id"] for fila in response.data["results"])
+            url = response.data["next"]
+
+        esperados = list(LogProcesos.objects.order_by("-fecha", "-id").values_list("id", flat=True))
+        self.assertEqual(vistos, esperados)
+
+    def test_paginacion_opcional_en_silabos(self):
+        for _ in range(3):
+            crear_silabo(self.estructura)
+
+        response = self.client.get("/silabo/silabos/")
+        self.assertIsInstance(response.data, list)
+
+        response = self.client.get("/silabo/silabos/?page_size=2")
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
+
+    def test_cursor_alterado_es_404(self):
+        import base64
+        import json
+
+        def cursor(valores):
+            return base64.b64encode(json.dumps(valores).encode()).decode()
+
+        for url in (
+            f"/silabo/silabos/?cursor={cursor(['abc'])}",
+            f"/silabo/silabos/?cursor={cursor([None])}",
+            f"/silabo/logs/?cursor={cursor(['x', 'y'])}",
+            f"/silabo/logs/?cursor={cursor([[1], {}])}",
+        ):
+            self.assertEqual(self.client.get(url).status_code, 404, url)
+
+
+class CamposDinamicosTests(TestCase):
+
+    def setUp(self):
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+        CargaCurso.objects.create(profesor=self.estructura["profesor"], curso=self.estructura["curso"])
+
+    def test_fields_sin_relaciones_no_hace_join(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/silabo/cargas/?fields=id,curso,detalles")
+        self.assertEqual(set(response.data[0]), {"id", "curso", "detalles"})
+        self.assertFalse(any("JOIN" in q["sql"] for q in ctx.captured_queries))
+
+    def test_expand_anidado(self):
+        response = self.client.get("/silabo/cargas/?expand=curso_detalle.area_detalle")
+        fila = response.data[0]
+        self.assertNotIn("profesor_detalle", fila)
+        self.assertIn("area_detalle", fila["curso_detalle"])
+        self.assertNotIn("semestre_detalle", fila["curso_detalle"])
+
+    def test_sin_parametros_representacion_completa(self):
+        response = self.client.get("/silabo/cargas/")
+        self.assertIn("profesor_detalle", response.data[0])
+        self.assertIn("semestre_detalle", response.data[0]["curso_detalle"])
+
+
+class CacheCatalogosTests(TestCase):
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+
+    def test_segunda_lectura_sin_consultas_y_invalidacion(self):
+        self.client.get("/silabo/facultades/")
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/silabo/facultades/")
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(response.data[0]["universidad_detalle"]["nombre"], "UNSA")
+
+        universidad = self.estructura["facultad"].universidad
+        universidad.nombre = "Universidad Nacional de San Agustín"
+        with self.captureOnCommitCallbacks(execute=True):
+            universidad.save()
+
+        response = self.client.get("/silabo/facultades/")
+        self.assertEqual(response.data[0]["universidad_detalle"]["nombre"], universidad.nombre)
+
+    def test_estadisticas(self):
+        self.client.get("/silabo/areas/")
+        self.client.get("/silabo/areas/")
+        response = self.client.get("/silabo/cache/estadisticas/")
+        self.assertEqual(response.data["hits"], 1)
+        self.assertEqual(response.data["misses"], 1)
+
+
+class GetCondicionalSilaboTests(TestCase):
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+        self.silabo = crear_silabo(self.estructura)
+        poblar_silabo(self.silabo, 1)
+        self.url = f"/silabo/silabos/{self.silabo.id}/documento/"
+
+    def test_304_con_etag_vigente(self):
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_cambio_en_hijo_invalida_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        contenido = ContenidoEspecifico.objects.filter(semana__unidad__silabo=self.silabo).first()
+        contenido.contenido = "Tema actualizado"
+        contenido.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_mover_un_hijo_invalida_el_silabo_anterior(self):
+        otro = crear_silabo(self.estructura)
+        poblar_silabo(otro, 1)
+        destino = otro.unidades.get()
+        semanas = list(Semana.objects.filter(unidad__silabo=self.silabo))
+
+        etag = self.client.get(self.url)["ETag"]
+        semanas[0].unidad = destino
+        semanas[0].save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response["ETag"]
+        response = self.client.patch("/silabo/semanas/bulk/", [{"id": semanas[1].id, "unidad": destino.id}], format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class OperacionesMasivasTests(TestCase):
+
+    def setUp(self):
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+        self.area = Area.objects.create(codigo="FOR", nombre="Formación")
+        self.tipo = TipoCurso.objects.create(nombre="Obligatorio")
+
+    def curso(self, codigo, prerrequisitos=()):
+        return {
+            "codigo": codigo, "nombre": f"Curso {codigo}", "horas_teoria": 2,
+            "horas_practica": 2, "horas_laboratorio": 0, "creditos": 3,
+            "area": self.area.id, "tipo_curso": self.tipo.id,
+            "semestre": self.estructura["curso"].semestre_id,
+            "prerrequisitos": list(prerrequisitos),
+        }
+
+    def test_creacion_masiva_con_prerrequisitos(self):
+        base = self.estructura["curso"].id
+        datos = [self.curso(f"IS2{n:02d}", [base]) for n in range(20)]
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post("/silabo/cursos/", datos, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(len(response.data), 20)
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 2)
+        self.assertEqual(Curso.prerrequisitos.through.objects.filter(to_curso_id=base).count(), 20)
+
+    def test_errores_por_elemento_no_escriben_nada(self):
+        datos = [self.curso("IS300"), {**self.curso("IS301"), "creditos": "x"}]
+        response = self.client.post("/silabo/cursos/", datos, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["errores"][0]["indice"], 1)
+        self.assertIn("creditos", response.data["errores"][0]["errores"])
+        self.assertFalse(Curso.objects.filter(codigo="IS300").exists())
+
+    def test_actualizacion_y_baja_masiva(self):
+        silabo = crear_silabo(self.estructura)
+        poblar_silabo(silabo, 3)
+        ids = list(Semana.objects.values_list("id", flat=True))
+
+        response = self.client.patch(
+            "/silabo/semanas/bulk/", [{"id": pk, "numero": 10 + i} for i, pk in enumerate(ids)], format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(sorted(Semana.objects.values_list("numero", flat=True)), list(range(10, 10 + len(ids))))
+
+        response = self.client.delete("/silabo/semanas/bulk/", {"ids": ids[:2]}, format="json")
+        self.assertEqual(response.data["eliminados"], 2)
+        self.assertEqual(Semana.objects.filter(activo=False).count(), 2)
+
+        # Ids no numéricos: 400, no 500
+        response = self.client.patch("/silabo/semanas/bulk/", [{"id": "abc", "numero": 1}], format="json")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.delete("/silabo/semanas/bulk/", {"ids": [ids[2], "abc"]}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class ImportacionPersonasTests(TestCase):
+
+    CABECERA = "dni,email,nombre,apellido_paterno,apellido_materno,fecha_nacimiento,genero,nacionalidad,telefono\n"
+
+    def setUp(self):
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+
+    def test_importa_y_reporta_rechazos(self):
+        import io
+
+        from .importacion import importar_csv
+
+        filas = [f"{70000000 + n},alumno{n}@uni.edu,Alumno,Perez,Lopez,2005-01-01,M,Peruana,\n" for n in range(25)]
+        filas += [
+            "70000000,otro@uni.edu,Repetido,Perez,Lopez,2005-01-01,M,Peruana,\n",     # dni duplicado
+            "12345678,nuevo@uni.edu,Docente,Quispe,Mamani,1980-01-01,F,Peruana,\n",  # dni ya registrado
+            "123,malo@uni.edu,Malo,Perez,Lopez,2005-13-01,X,Peruana,\n",              # varios errores
+        ]
+        resultado = importar_csv(io.StringIO(self.CABECERA + "".join(filas)), tamano_bloque=10)
+
+        self.assertEqual(resultado.procesadas, 28)
+        self.assertEqual(resultado.insertadas, 25)
+        self.assertEqual(resultado.rechazadas, 3)
+        self.assertEqual(Estudiante.objects.count(), 25)
+        errores = {r["linea"]: r["errores"] for r in resultado.rechazos}
+        self.assertEqual(set(errores[29]), {"dni", "fecha_nacimiento", "genero"})
+        estudiante = Estudiante.objects.select_related("persona__usuario").get(persona__dni="70000003")
+        self.assertEqual(estudiante.persona.usuario.email, "alumno3@uni.edu")
+
+    def test_endpoint_importar(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        contenido = self.CABECERA + "70000001,prof@uni.edu,Luis,Rojas,Diaz,1975-05-05,M,Peruana,999\n"
+        archivo = SimpleUploadedFile("profesores.csv", contenido.encode("utf-8"), content_type="text/csv")
+        response = self.client.post("/silabo/personas/importar/", {"archivo": archivo, "tipo": "profesor"})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["insertadas"], 1)
+        self.assertTrue(Profesor.objects.filter(persona__dni="70000001").exists())
+
+    def test_profesion_inexistente_se_rechaza_por_fila(self):
+        import io
+
+        from .importacion import importar_csv
+        from .models import Profesion
+
+        profesion = Profesion.objects.create(nombre="Ingeniero")
+        cabecera = self.CABECERA.replace("telefono", "telefono,profesion")
+        filas = [
+            f"70000001,a@uni.edu,Luis,Rojas,Diaz,1975-05-05,M,Peruana,,{profesion.id}\n",
+            "70000002,b@uni.edu,Ana,Rojas,Diaz,1975-05-05,F,Peruana,,999\n",
+        ]
+        resultado = importar_csv(io.StringIO(cabecera + "".join(filas)), tipo="profesor")
+        self.assertEqual((resultado.insertadas, resultado.rechazadas), (1, 1))
+        self.assertEqual(resultado.rechazos[0]["errores"], {"profesion": "No existe la profesión"})
+        self.assertEqual(Profesor.objects.get(persona__dni="70000001").profesion_id, profesion.id)
+
+    def test_rol_inexistente_y_emails_sin_distinguir_mayusculas(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        contenido = self.CABECERA + "70000001,Docente@Uni.edu,Luis,Rojas,Diaz,1975-05-05,M,Peruana,\n"
+        archivo = SimpleUploadedFile("profesores.csv", contenido.encode("utf-8"), content_type="text/csv")
+        response = self.client.post("/silabo/personas/importar/", {"archivo": archivo, "rol": 999})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("rol", response.data)
+
+        # docente@uni.edu ya existe (crear_estructura)
+        archivo = SimpleUploadedFile("profesores.csv", contenido.encode("utf-8"), content_type="text/csv")
+        response = self.client.post("/silabo/personas/importar/", {"archivo": archivo})
+        self.assertEqual((response.data["insertadas"], response.data["rechazadas"]), (0, 1))
+
+
+class GrafoPrerrequisitosTests(TestCase):
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+        base = self.estructura["curso"]
+        self.plan = base.semestre.plan
+        segundo = SemestrePlan.objects.create(nombre="II", detalles="", plan=self.plan)
+        self.a = base
+        self.b = self.crear_curso("IS102", segundo, [self.a])
+        self.c = self.crear_curso("IS103", segundo, [self.b])
+
+    def crear_curso(self, codigo, semestre, prerrequisitos):
+        curso = Curso.objects.create(
+            codigo=codigo, nombre=codigo, horas_teoria=2, horas_practica=2,
+            horas_laboratorio=0, creditos=3, semestre=semestre,
+        )
+        curso.prerrequisitos.set(prerrequisitos)
+        return curso
+
+    def test_cierres_transitivos(self):
+        response = self.client.get(f"/silabo/cursos/{self.c.id}/prerrequisitos/?transitivo=true")
+        self.assertEqual({c["id"] for c in response.data}, {self.a.id, self.b.id})
+        response = self.client.get(f"/silabo/cursos/{self.a.id}/cursos_dependientes/?transitivo=true")
+        self.assertEqual({c["id"] for c in response.data}, {self.b.id, self.c.id})
+
+    def test_rechaza_ciclo(self):
+        response = self.client.patch(
+            f"/silabo/cursos/{self.a.id}/", {"prerrequisitos": [self.c.id]}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("prerrequisitos", response.data)
+
+    def test_rechaza_ciclo_dentro_del_lote(self):
+        otro = self.crear_curso("IS104", self.a.semestre, [])
+        response = self.client.patch("/silabo/cursos/bulk/", [
+            {"id": self.a.id, "prerrequisitos": [otro.id]},
+            {"id": otro.id, "prerrequisitos": [self.a.id]},
+        ], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error["indice"] for error in response.data["errores"]], [0, 1])
+        self.assertFalse(self.a.prerrequisitos.exists())
+
+    def test_semestres_ordenados_por_numero(self):
+        from .grafo import GrafoPrerrequisitos, numero_de_semestre
+
+        self.assertEqual([numero_de_semestre(n) for n in ("IV", "Semestre 3", "X ciclo", "Verano")], [4, 3, 10, None])
+        # Creado después, pero es el semestre 0 del plan
+        cero = SemestrePlan.objects.create(nombre="0", detalles="", plan=self.plan)
+        d = self.crear_curso("IS100", cero, [])
+        grafo = GrafoPrerrequisitos.construir(self.plan.id)
+        self.assertLess(grafo.semestres[d.id], grafo.semestres[self.a.id])
+
+    def test_resumen_del_plan_y_actualizacion_incremental(self):
+        response = self.client.get(f"/silabo/planes/{self.plan.id}/grafo/")
+        self.assertEqual(response.data["orden_topologico"], [self.a.id, self.b.id, self.c.id])
+        self.assertEqual(response.data["ruta_critica"]["semestres"], 3)
+        self.assertEqual(response.data["ciclos"], [])
+        # b y c están en el mismo semestre
+        self.assertEqual(
+            response.data["inconsistencias"],
+            [{"curso": self.c.id, "prerrequisito": self.b.id, "tipo": "mismo_semestre"}],
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.c.prerrequisitos.remove(self.b)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f"/silabo/planes/{self.plan.id}/grafo/")
+        self.assertEqual(response.data["ruta_critica"]["semestres"], 2)
+        self.assertEqual(response.data["inconsistencias"], [])
+        # Sólo la consulta del plan: el grafo se actualizó en memoria
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        # Un cambio revertido no toca el grafo del proceso
+        from django.db import transaction
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.c.prerrequisitos.add(self.b)
+                transaction.set_rollback(True)
+        response = self.client.get(f"/silabo/planes/{self.plan.id}/grafo/")
+        self.assertEqual(response.data["ruta_critica"]["semestres"], 2)
+
+
+class ExportacionSilabosTests(TestCase):
+
+    def setUp(self):
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+        for _ in range(3):
+            poblar_silabo(crear_silabo(self.estructura), 2)
+
+    def test_ndjson_en_streaming(self):
+        import json
+
+        response = self.client.get(f"/silabo/silabos/exportar/?periodo_id={self.estructura['periodo'].id}")
+        self.assertTrue(response.streaming)
+        lineas = b"".join(response.streaming_content).decode("utf-8").splitlines()
+        self.assertEqual(len(lineas), 3)
+        documento = json.loads(lineas[0])
+        self.assertEqual(len(documento["unidades"]), 2)
+        self.assertEqual(len(documento["unidades"][0]["semanas"][0]["contenidos"]), 2)
+
+    def test_csv(self):
+        response = self.client.get("/silabo/silabos/exportar/?formato=csv")
+        lineas = b"".join(response.streaming_content).decode("utf-8").splitlines()
+        self.assertEqual(len(lineas), 4)
+        self.assertTrue(lineas[0].startswith("id,nombre"))
+
+
+class BusquedaTextoTests(TestCase):
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+        self.silabo = crear_silabo(self.estructura)
+        poblar_silabo(self.silabo, 1)
+        semana = Semana.objects.filter(unidad__silabo=self.silabo).first()
+        ContenidoEspecifico.objects.create(contenido="Árboles de decisión y recursión", semana=semana)
+        otro = crear_silabo(self.estructura)
+        otro.sumilla = "Introducción a la programación"
+        otro.save()
+
+    def test_busqueda_con_tildes_y_plurales(self):
+        response = self.client.get("/silabo/search/?q=arbol recursion")
+        self.assertEqual(response.data["motor"], "memoria")
+        self.assertEqual([r["silabo"] for r in response.data["resultados"]], [self.silabo.id])
+
+        # Al cambiar el contenido se reconstruye el índice
+        ContenidoEspecifico.objects.filter(contenido__startswith="Árboles").update(activo=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            ContenidoEspecifico.objects.filter(activo=False).first().save()
+        response = self.client.get("/silabo/search/?q=arboles")
+        self.assertEqual(response.data["resultados"], [])
+
+    def test_ranking_y_filtros(self):
+        response = self.client.get("/silabo/search/?q=programacion")
+        # Ambos sílabos coinciden por el nombre del curso; el de la sumilla pesa más
+        self.assertEqual(response.data["count"], 2)
+        self.assertNotEqual(response.data["resultados"][0]["silabo"], self.silabo.id)
+
+        response = self.client.get("/silabo/search/?q=programacion&periodo_id=999")
+        self.assertEqual(response.data["resultados"], [])
+        self.assertEqual(self.client.get("/silabo/search/").status_code, 400)
+        self.assertEqual(self.client.get("/silabo/search/?q=programacion&periodo_id=abc").status_code, 400)
+        response = self.client.get("/silabo/search/?q=programacion&limite=-5")
+        self.assertEqual(response.data["count"], 1)
+
+
+class BusquedaDniTests(TestCase):
+
+    def setUp(self):
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+        for n in range(3):
+            persona = Persona.objects.create(
+                nombre=f"Alumno {n}", apellido_paterno="Condori", apellido_materno="Huamán",
+                dni=f"7000000{n}", fecha_nacimiento=date(2004, 1, 1), genero="M",
+                nacionalidad="Peruana",
+            )
+            Estudiante.objects.create(persona=persona)
+
+    def test_lote_en_una_consulta(self):
+        dnis = ["70000000", "70000002", "12345678", "99999999"]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post("/silabo/personas/buscar_por_dnis/", {"dnis": dnis}, format="json")
+        self.assertEqual(len(ctx.captured_queries), 1)
+        resultados = response.data["resultados"]
+        self.assertEqual(set(resultados), {"70000000", "70000002", "12345678"})
+        self.assertIsNotNone(resultados["70000000"]["estudiante"])
+        self.assertIsNone(resultados["70000000"]["profesor"])
+        self.assertEqual(resultados["12345678"]["profesor"]["id"], self.estructura["profesor"].id)
+        self.assertEqual(resultados["12345678"]["usuario"]["rol_detalle"]["nombre"], "Docente")
+        self.assertEqual(response.data["no_encontrados"], ["99999999"])
+
+    def test_estudiante_por_dni_una_consulta(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/silabo/estudiantes/buscar_por_dni/?dni=70000001")
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(response.data["persona"]["nombre"], "Alumno 1")
+
+    def test_dni_activo_unico_y_deduplicacion(self):
+        from django.core.management import call_command
+        from django.db import IntegrityError, transaction
+
+        with transaction.atomic(), self.assertRaises(IntegrityError):
+            Persona.objects.create(
+                nombre="Otro", apellido_paterno="X", apellido_materno="Y", dni="70000000",
+                fecha_nacimiento=date(2000, 1, 1), genero="M", nacionalidad="Peruana",
+            )
+        duplicada = Persona.objects.create(
+            nombre="Otro", apellido_paterno="X", apellido_materno="Y", dni="70000000",
+            fecha_nacimiento=date(2000, 1, 1), genero="M", nacionalidad="Peruana", activo=False,
+        )
+        call_command("deduplicar_dni", stdout=io.StringIO())
+        self.assertFalse(Persona.objects.get(pk=duplicada.pk).activo)
+        self.assertEqual(Persona.objects.filter(dni="70000000", activo=True).count(), 1)
+
+
+class LecturaAsincronaTests(TestCase):
+
+    def setUp(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        self.estructura = crear_estructura()
+        self.silabo = crear_silabo(self.estructura)
+        poblar_silabo(self.silabo, 2)
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+        self.token = str(AccessToken.for_user(self.estructura["usuario"]))
+
+    async def test_misma_representacion_que_la_api_sync(self):
+        from asgiref.sync import sync_to_async
+        from django.test import AsyncClient
+
+        cliente = AsyncClient()
+        cabeceras = {"authorization": f"Bearer {self.token}"}
+        rutas = [
+            f"silabos/{self.silabo.id}/documento/",
+            f"silabos/{self.silabo.id}/",
+            f"silabos/{self.silabo.id}/unidades/",
+            f"silabos/por_periodo/?periodo_id={self.estructura['periodo'].id}",
+            "silabos/",
+            f"universidades/{self.estructura['facultad'].universidad_id}/facultades/",
+            f"facultades/{self.estructura['facultad'].id}/departamentos/",
+            f"carreras/{self.estructura['carrera'].id}/planes_curriculares/",
+        ]
+        for ruta in rutas:
+            esperado = await sync_to_async(self.client.get)(f"/silabo/{ruta}")
+            response = await cliente.get(f"/silabo/async/{ruta}", headers=cabeceras)
+            self.assertEqual(response.status_code, 200, ruta)
+            self.assertEqual(response.json(), esperado.json(), ruta)
+
+        response = await cliente.get("/silabo/async/silabos/999/documento/", headers=cabeceras)
+        self.assertEqual(response.status_code, 404)
+        response = await cliente.get("/silabo/async/silabos/por_curso/", headers=cabeceras)
+        self.assertEqual(response.status_code, 400)
+        response = await cliente.get("/silabo/async/departamentos/999/carreras/", headers=cabeceras)
+        self.assertEqual(response.status_code, 404)
+
+    async def test_requiere_autenticacion(self):
+        from django.test import AsyncClient
+
+        response = await AsyncClient().get("/silabo/async/silabos/")
+        self.assertEqual(response.status_code, 401)
+
+
+class EsquemaOpenAPITests(TestCase):
+
+    def test_artefacto_coincide_con_el_router(self):
+        import json
+        from django.conf import settings
+        from silabo_s7_back.docs import generar
+        from .urls import router
+
+        artefacto = json.loads((settings.OPENAPI_DIR / "openapi.json").read_bytes())
+        self.assertEqual(
+            artefacto, json.loads(generar("json")),
+            "Esquema desactualizado: ejecutar python manage.py generar_esquema",
+        )
+        for prefijo, _, _ in router.registry:
+            self.assertIn(f"/{prefijo}/", artefacto["paths"])
+
+    def test_servido_comprimido_y_condicional(self):
+        import gzip
+        from django.conf import settings
+
+        response = self.client.get("/swagger.json", HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            gzip.decompress(response.content), (settings.OPENAPI_DIR / "openapi.json").read_bytes()
+        )
+        response = self.client.get("/swagger.json", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get("/swagger/").status_code, 200)
+
+
+class AutenticacionClaimsTests(TestCase):
+
+    def setUp(self):
+        from .autenticacion import _memo
+
+        # Los ids se reutilizan entre pruebas: se descartan marcas recordadas
+        _memo.clear()
+        self.estructura = crear_estructura()
+        self.usuario = self.estructura["usuario"]
+        response = self.client.post(
+            "/silabo/token/", {"email": "docente@uni.edu", "password": "clave-segura"},
+            content_type="application/json",
+        )
+        self.tokens = response.json()
+        self.cabecera = f"Bearer {self.tokens['access']}"
+
+    def test_sin_consultas_de_autenticacion(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        token = AccessToken(self.tokens["access"])
+        self.assertEqual(token["rol_nombre"], "Docente")
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/silabo/cache/estadisticas/", HTTP_AUTHORIZATION=self.cabecera)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_desactivar_revoca_y_refresh_requiere_login(self):
+        self.usuario.activo = False
+        self.usuario.save()
+        response = self.client.get("/silabo/cache/estadisticas/", HTTP_AUTHORIZATION=self.cabecera)
+        self.assertEqual(response.status_code, 401)
+        response = self.client.post(
+            "/silabo/token/refresh/", {"refresh": self.tokens["refresh"]}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_login_en_el_mismo_segundo_que_la_revocacion(self):
+        self.usuario.set_password("otra-clave")
+        self.usuario.save()
+        self.assertEqual(
+            self.client.get("/silabo/cache/estadisticas/", HTTP_AUTHORIZATION=self.cabecera).status_code, 401
+        )
+        response = self.client.post(
+            "/silabo/token/", {"email": "docente@uni.edu", "password": "otra-clave"},
+            content_type="application/json",
+        )
+        cabecera = f"Bearer {response.json()['access']}"
+        self.assertEqual(self.client.get("/silabo/cache/estadisticas/", HTTP_AUTHORIZATION=cabecera).status_code, 200)
+
+    def test_revocacion_sobrevive_a_la_cache(self):
+        from django.core.cache import cache
+        from .autenticacion import _memo
+
+        self.usuario.set_password("otra-clave")
+        self.usuario.save()
+        # Otra instancia (o locmem descartando entradas) no comparte la memoria
+        cache.clear()
+        _memo.clear()
+        response = self.client.get("/silabo/cache/estadisticas/", HTTP_AUTHORIZATION=self.cabecera)
+        self.assertEqual(response.status_code, 401)
+
+    def test_cambio_ajeno_a_los_claims_no_revoca(self):
+        self.usuario.first_name = "Ana"
+        self.usuario.save()
+        response = self.client.get("/silabo/cache/estadisticas/", HTTP_AUTHORIZATION=self.cabecera)
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(SILABO_AUDITORIA_HILO=False)
+class AuditoriaTests(TestCase):
+
+    def setUp(self):
+        from .auditoria import escritor
+
+        self.escritor = escritor
+        self.escritor.vaciar()
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+        self.silabo = crear_silabo(self.estructura)
+        poblar_silabo(self.silabo, 2)
+
+    def test_la_peticion_no_escribe_auditoria(self):
+        ids = list(Semana.objects.values_list("id", flat=True))
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.patch(
+                    "/silabo/semanas/bulk/", [{"id": pk, "numero": 5} for pk in ids], format="json"
+                )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertFalse([q for q in ctx.captured_queries if "silabo_logprocesos" in q["sql"].lower()])
+        self.assertEqual(self.escritor.pendientes(), len(ids))
+
+        self.assertEqual(self.escritor.vaciar(), len(ids))
+        logs = LogProcesos.objects.filter(accion__startswith="actualizar silabo.semana #")
+        self.assertEqual(logs.count(), len(ids))
+        self.assertEqual({log.usuario_id for log in logs}, {self.estructura["usuario"].id})
+
+    def test_senales_registran_alta_y_baja(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f"/silabo/actividades/{Actividad.objects.first().pk}/")
+        self.assertIn(response.status_code, (200, 204))
+        self.escritor.vaciar()
+        self.assertTrue(LogProcesos.objects.filter(accion__contains="silabo.actividad #").exists())
+
+    @override_settings(SILABO_AUDITORIA_SINCRONA=True)
+    def test_modo_sincrono_escribe_al_confirmar(self):
+        ids = list(Semana.objects.values_list("id", flat=True))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                "/silabo/semanas/bulk/", [{"id": pk, "numero": 5} for pk in ids], format="json"
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.escritor.pendientes(), 0)
+        self.assertEqual(LogProcesos.objects.filter(accion__startswith="actualizar silabo.semana #").count(), len(ids))
+
+
+@override_settings(SILABO_AUDITORIA_HILO=False)
+class ActividadLogsTests(TestCase):
+
+    def setUp(self):
+        from .auditoria import escritor
+
+        self.estructura = crear_estructura()
+        self.usuario = self.estructura["usuario"]
+        self.client = APIClient()
+        self.client.force_authenticate(self.usuario)
+        escritor.vaciar()
+        hoy = date.today()
+        escritor.cola.put(LogProcesos(fecha=hoy, accion="crear silabo.unidad #1", usuario=self.usuario))
+        escritor.cola.put(LogProcesos(fecha=hoy, accion="crear silabo.unidad #2", usuario=self.usuario))
+        escritor.cola.put(LogProcesos(fecha=date(2000, 1, 5), accion="eliminar silabo.semana #7", usuario=self.usuario))
+        escritor.vaciar()
+
+    def test_estadisticas_leen_el_resumen(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/silabo/logs/estadisticas/?agrupar=accion,usuario")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [
+            {"accion": "crear silabo.unidad", "usuario": self.usuario.id, "total": 2},
+            {"accion": "eliminar silabo.semana", "usuario": self.usuario.id, "total": 1},
+        ])
+        self.assertFalse([q for q in ctx.captured_queries if "silabo_logprocesos" in q["sql"]])
+        response = self.client.get("/silabo/logs/estadisticas/?agrupar=mes")
+        self.assertEqual(response.status_code, 400)
+
+    def test_retencion_conserva_el_resumen(self):
+        from django.core.management import call_command
+
+        call_command("mantener_logs", stdout=io.StringIO())
+        self.assertEqual(LogProcesos.objects.count(), 2)
+        response = self.client.get("/silabo/logs/estadisticas/?agrupar=&hasta=2000-12-31")
+        self.assertEqual(response.data, [{"total": 1}])
+
+
+class ClonacionSilabosTests(TestCase):
+
+    def setUp(self):
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+        self.silabo = crear_silabo(self.estructura)
+        poblar_silabo(self.silabo, 2)
+        Unidad.objects.filter(numero=2).update(activo=False)
+        self.destino = PeriodoLectivo.objects.create(periodo="2025-II")
+        SemestreAcademico.objects.create(
+            nombre="2025-II", anio_academico=2025, periodo="II",
+            fecha_inicio=date(2025, 8, 15), fecha_fin=date(2025, 12, 20), semanas=17,
+        )
+
+    def test_clonar_copia_el_arbol_activo_y_desplaza_fechas(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                f"/silabo/silabos/{self.silabo.id}/clonar/", {"periodo_lectivo": self.destino.id}, format="json"
+            )
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertLess(len(ctx.captured_queries), 40)
+        self.assertEqual(response.data["desplazamiento_dias"], 167)
+        self.assertEqual(response.data["copiados"]["unidad"], 1)
+        self.assertEqual(response.data["copiados"]["contenidoespecifico"], 4)
+
+        nuevo = Silabo.objects.get(pk=response.data["silabo"])
+        self.assertEqual(nuevo.nombre, "Programación 2025-II")
+        self.assertEqual(nuevo.periodo_lectivo, self.destino)
+        unidad = nuevo.unidades.get()
+        self.assertEqual((unidad.inicio, unidad.final), (date(2025, 8, 15), date(2025, 9, 15)))
+        self.assertEqual(ContenidoEspecifico.objects.filter(semana__unidad__silabo=nuevo).count(), 4)
+        self.assertEqual(nuevo.criterios_evaluacion.count(), 2)
+
+        response = self.client.post(
+            f"/silabo/silabos/{self.silabo.id}/clonar/", {"periodo_lectivo": self.destino.id}, format="json"
+        )
+        self.assertEqual(response.status_code, 409)
+
+    def test_comando_omite_los_ya_copiados(self):
+        from django.core.management import call_command
+
+        salida = io.StringIO()
+        call_command("clonar_periodo", self.estructura["periodo"].id, self.destino.id, stdout=salida)
+        call_command("clonar_periodo", self.estructura["periodo"].id, self.destino.id, stdout=salida)
+        self.assertEqual(Silabo.objects.filter(periodo_lectivo=self.destino).count(), 1)
+
+    @override_settings(SILABO_AUDITORIA_HILO=False)
+    def test_auditoria_con_los_ids_copiados(self):
+        from .auditoria import escritor
+
+        escritor.vaciar()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/silabo/silabos/{self.silabo.id}/clonar/", {"periodo_lectivo": self.destino.id}, format="json"
+            )
+        escritor.vaciar()
+        unidad = Silabo.objects.get(pk=response.data["silabo"]).unidades.get()
+        acciones = set(LogProcesos.objects.filter(accion__startswith="clonar").values_list("accion", flat=True))
+        self.assertIn(f"clonar silabo.unidad #{unidad.id}", acciones)
+        self.assertFalse([accion for accion in acciones if accion.endswith("(masivo)")])
+
+
+class DocumentoEscrituraTests(TestCase):
+
+    def setUp(self):
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+        self.silabo = crear_silabo(self.estructura)
+        poblar_silabo(self.silabo, 2)
+        self.url = f"/silabo/silabos/{self.silabo.id}/documento/"
+
+    def escrituras(self, documento):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.put(self.url, documento, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        return response, [q["sql"] for q in ctx.captured_queries if q["sql"].startswith(("INSERT", "UPDATE"))]
+
+    def test_documento_sin_cambios_no_escribe(self):
+        documento = self.client.get(self.url).json()
+        response, escrituras = self.escrituras(documento)
+        self.assertEqual(escrituras, [])
+        self.assertEqual(response.data, documento)
+
+    def test_diferencias_en_una_transaccion(self):
+        documento = self.client.get(self.url).json()
+        unidad = documento["unidades"][0]
+        unidad["descripcion"] = "Unidad renombrada"
+        unidad["semanas"][0]["contenidos"].pop()
+        unidad["semanas"].append({"numero": 3, "contenidos": [{"contenido": "Tema C"}]})
+        del documento["criterios_evaluacion"][1]
+
+        response, escrituras = self.escrituras(documento)
+        # Unidad, semana y contenido nuevos; unidad cambiada; bajas de contenido y criterio
+        self.assertLessEqual(len([sql for sql in escrituras if "logprocesos" not in sql]), 8)
+        self.assertEqual(response.data["unidades"][0]["descripcion"], "Unidad renombrada")
+        self.assertEqual(len(response.data["unidades"][0]["semanas"]), 3)
+        self.assertEqual(response.data["unidades"][0]["semanas"][2]["contenidos"][0]["contenido"], "Tema C")
+        self.assertEqual(len(response.data["criterios_evaluacion"]), 1)
+        self.assertEqual(ContenidoEspecifico.objects.filter(activo=False).count(), 1)
+
+    def test_id_de_otro_silabo_no_escribe_nada(self):
+        otro = crear_silabo(self.estructura)
+        poblar_silabo(otro, 1)
+        documento = self.client.get(self.url).json()
+        documento["unidades"][0]["descripcion"] = "Cambio"
+        documento["actividades"].append({"id": otro.actividades.get().id, "nombre": "x", "descripcion": "-"})
+        response = self.client.put(self.url, documento, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("actividades[2].id", response.data)
+        self.assertFalse(Unidad.objects.filter(descripcion="Cambio").exists())
+
+    def test_listas_obligatorias(self):
+        response = self.client.put(self.url, {"nombre": "x"}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {"unidades", "actividades", "criterios_evaluacion"})
+        self.assertFalse(Unidad.objects.filter(activo=False).exists())
+
+
+class ValidacionPeriodoTests(TestCase):
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+        self.silabo = crear_silabo(self.estructura)
+        poblar_silabo(self.silabo, 2)
+        # Pesos 10 + 10: se completan a 100
+        CriterioEvaluacion.objects.filter(silabo=self.silabo).update(peso=50)
+        primera, segunda = self.silabo.unidades.order_by("numero")
+        Unidad.objects.filter(pk=segunda.pk).update(inicio=date(2025, 4, 2), final=date(2025, 5, 1))
+        self.url = f"/silabo/periodos-lectivos/{self.estructura['periodo'].id}/validar/"
+
+    def test_silabo_consistente_no_tiene_problemas(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["silabos"], 1)
+        self.assertEqual(response.data["resultados"], [])
+
+    def test_filtros_no_enteros(self):
+        self.assertEqual(self.client.get(self.url + "?facultad_id=abc").status_code, 400)
+        self.assertEqual(self.client.get(self.url + "?semestre_academico=x").status_code, 400)
+
+    def test_reglas_en_lote(self):
+        otro = crear_silabo(self.estructura)
+        poblar_silabo(otro, 2)
+        Unidad.objects.filter(silabo=otro, numero=2).update(final=date(2025, 9, 1))
+        Semana.objects.filter(unidad__silabo=otro, numero=2).update(numero=4)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertLessEqual(len(ctx.captured_queries), 8)
+        self.assertEqual(response.data["con_problemas"], 1)
+        reglas = sorted(p["regla"] for p in response.data["resultados"][0]["problemas"])
+        self.assertEqual(reglas, ["pesos", "semanas", "semanas", "unidades_semestre", "unidades_superpuestas"])
+
+    def test_hueco_de_semanas_entre_unidades(self):
+        Semana.objects.filter(unidad__silabo=self.silabo, unidad__numero=2).update(numero=F("numero") + 1)
+        response = self.client.get(self.url)
+        problemas = response.data["resultados"][0]["problemas"]
+        self.assertEqual(problemas, [{"regla": "semanas", "mensaje": "Faltan semanas entre la 2 y la 4 (unidad 2)"}])
+
+    def test_comando(self):
+        from django.core.management import call_command
+
+        salida = io.StringIO()
+        call_command("validar_silabos", self.estructura["periodo"].id, stdout=salida)
+        self.assertIn("1 sílabos validados", salida.getvalue())
+
+
+class AnaliticaCargaTests(TestCase):
+
+    def setUp(self):
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+        self.profesor = self.estructura["profesor"]
+        curso = self.estructura["curso"]
+        otro = Curso.objects.create(
+            codigo="IS102", nombre="Algoritmos", horas_teoria=4, horas_practica=2,
+            horas_laboratorio=0, creditos=3, semestre=curso.semestre,
+        )
+        CargaCurso.objects.create(profesor=self.profesor, curso=curso)
+        CargaCurso.objects.create(profesor=self.profesor, curso=otro)
+
+    def test_horas_totales_en_sql(self):
+        self.assertEqual(self.estructura["curso"].horas_totales, 6)
+        self.assertEqual(list(Curso.objects.filter(horas_totales__gt=6).values_list("codigo", flat=True)), [])
+        self.assertEqual(Curso.objects.order_by("-horas_totales").first().horas_totales, 6)
+
+    def test_horas_totales_tras_actualizar(self):
+        curso = self.estructura["curso"]
+        response = self.client.patch(f"/silabo/cursos/{curso.id}/", {"horas_teoria": 10}, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["horas_totales"], 14)
+        response = self.client.patch("/silabo/cursos/bulk/", [{"id": curso.id, "horas_practica": 0}], format="json")
+        self.assertEqual(response.data[0]["horas_totales"], 12)
+
+    def test_analitica_agrupada(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/silabo/cargas/analitica/?max_horas=10")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len([q for q in ctx.captured_queries if "silabo_cargacurso" in q["sql"]]), 1)
+        fila = response.data["resultados"][0]
+        self.assertEqual((fila["id"], fila["horas"], fila["creditos"], fila["cargas"]), (self.profesor.id, 12, 7, 2))
+        self.assertEqual(fila["estado"], "sobrecarga")
+
+        response = self.client.get("/silabo/cargas/analitica/?agrupar=facultad")
+        self.assertEqual(response.data["resultados"][0]["nombre"], "Ingeniería")
+        self.assertEqual(response.data["resultados"][0]["profesores"], 1)
+        self.assertEqual(response.data["resultados"][0]["sobrecargados"], 0)
+
+
+class AvanceSilabosTests(TestCase):
+
+    def setUp(self):
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+        self.silabo = crear_silabo(self.estructura)
+        poblar_silabo(self.silabo, 2)
+        CriterioEvaluacion.objects.filter(silabo=self.silabo).update(peso=50)
+        Silabo.objects.filter(pk=self.silabo.pk).update(sumilla="Fundamentos de programación")
+        CargaCurso.objects.create(profesor=self.estructura["profesor"], curso=self.estructura["curso"])
+
+    def test_actualizacion_incremental(self):
+        from .avance import actualizar_avance
+
+        self.assertEqual(actualizar_avance(), (1, 0))
+        avance = AvanceSilabo.objects.get(pk=self.silabo.pk)
+        self.assertEqual((avance.unidades, avance.semanas, avance.contenidos), (2, 4, 8))
+        self.assertTrue(avance.completo)
+        self.assertEqual(actualizar_avance(), (0, 0))
+
+        # Dar de baja un criterio toca el sílabo: se recalcula sólo él
+        criterio = CriterioEvaluacion.objects.filter(silabo=self.silabo).first()
+        criterio.activo = False
+        criterio.save()
+        self.assertEqual(actualizar_avance(), (1, 0))
+        avance.refresh_from_db()
+        self.assertEqual((avance.criterios, avance.peso_criterios, avance.completo), (1, 50, False))
+
+    def test_tablero_con_detalle(self):
+        from django.core.management import call_command
+
+        call_command("actualizar_avance", stdout=io.StringIO())
+        periodo, facultad = self.estructura["periodo"].id, self.estructura["facultad"].id
+        response = self.client.get(f"/silabo/avance/?periodo_id={periodo}")
+        self.assertEqual(response.data["nivel"], "facultad")
+        fila = response.data["resultados"][0]
+        self.assertEqual((fila["cargas"], fila["cargas_con_silabo"], fila["completos"]), (1, 1, 1))
+        self.assertEqual(fila["porcentaje_promedio"], 100)
+
+        response = self.client.get(f"/silabo/avance/?periodo_id={periodo}&facultad_id={facultad}")
+        self.assertEqual(response.data["resultados"][0]["nombre"], "Ingeniería de Sistemas")
+
+        response = self.client.get(f"/silabo/avance/?periodo_id={periodo}&carrera_id={self.estructura['carrera'].id}")
+        self.assertEqual(response.data["nivel"], "silabo")
+        self.assertEqual(response.data["resultados"][0]["silabo_id"], self.silabo.pk)
+
+        response = self.client.get(f"/silabo/avance/?silabo_id={self.silabo.pk}")
+        self.assertEqual(response.data["porcentaje"], 100)
+
+    def test_sin_sello_de_arbol_no_queda_pendiente(self):
+        from .avance import actualizar_avance
+
+        Silabo.objects.filter(pk=self.silabo.pk).update(fecha_modificacion_arbol=None)
+        self.assertEqual(actualizar_avance(), (1, 0))
+        self.assertEqual(actualizar_avance(), (0, 0))
+
+    @override_settings(CRON_SECRET="secreto")
+    def test_actualizacion_desde_el_cron(self):
+        cliente = APIClient()
+        self.assertEqual(cliente.get("/silabo/avance/actualizar/").status_code, 401)
+        response = cliente.get("/silabo/avance/actualizar/", HTTP_AUTHORIZATION="Bearer secreto")
+        self.assertEqual(response.data, {"recalculados": 1, "retirados": 0})
+        with override_settings(CRON_SECRET=None):
+            self.assertEqual(cliente.get("/silabo/avance/actualizar/").status_code, 404)
+
+
+class JerarquiaTests(TestCase):
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.estructura = crear_estructura()
+        self.client = APIClient()
+        self.client.force_authenticate(self.estructura["usuario"])
+
+    def test_arbol_con_una_consulta_por_nivel(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/silabo/jerarquia/")
+        self.assertEqual(response.status_code, 200)
+        consultas = [q["sql"] for q in ctx.captured_queries if "silabo_" in q["sql"] and "SELECT" in q["sql"]]
+        self.assertEqual(len(consultas), 7)
+        universidad = response.data["resultados"][0]
+        curso = universidad["facultades"][0]["departamentos"][0]["carreras"][0]["planes"][0]["semestres"][0]["cursos"][0]
+        self.assertEqual(curso["codigo"], "IS101")
+
+        # Cacheada hasta la próxima escritura
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get("/silabo/jerarquia/")
+        self.assertFalse([q for q in ctx.captured_queries if "silabo_curso" in q["sql"]])
+        self.estructura["carrera"].activo = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.estructura["carrera"].save()
+        response = self.client.get("/silabo/jerarquia/")
+        self.assertEqual(response.data["resultados"][0]["facultades"][0]["departamentos"][0]["carreras"], [])
+
+    def test_raiz_y_profundidad(self):
+        carrera = self.estructura["carrera"]
+        response = self.client.get(f"/silabo/jerarquia/?raiz=carrera&id={carrera.id}&hasta=plan")
+        self.assertEqual(response.data["resultados"], [
+            {"id": carrera.id, "nombre": carrera.nombre, "planes": [
+                {"id": carrera.planes.get().id, "tag": "2023", "fecha_culminacion": None},
+            ]},
+        ])
+        self.assertEqual(self.client.get("/silabo/jerarquia/?raiz=carrera&id=999").status_code, 404)
+
+        # Con un ancestro inactivo la raíz tampoco se muestra
+        facultad = self.estructura["facultad"]
+        facultad.activo = False
+        with self.captureOnCommitCallbacks(execute=True):
+            facultad.save()
+        self.assertEqual(self.client.get(f"/silabo/jerarquia/?raiz=carrera&id={carrera.id}").status_code, 404)
+        self.assertEqual(self.client.get("/silabo/jerarquia/?raiz=carrera").data["resultados"], [])
+        self.assertEqual(self.client.get("/silabo/jerarquia/?raiz=curso&hasta=carrera").status_code, 400)
+
+
+class ConexionesTests(SimpleTestCase):
+
+    def test_opciones_conexion(self):
+        from django.core.exceptions import ImproperlyConfigured
+        from silabo_s7_back.conexiones import modo_por_defecto, opciones_conexion
+
+        self.assertEqual(modo_por_defecto({"VERCEL": "1"}), "serverless")
+        self.assertEqual(modo_por_defecto({}), "persistent")
+
+        serverless = opciones_conexion("serverless", {})
+        self.assertEqual(serverless["CONN_MAX_AGE"], 0)
+        self.assertTrue(serverless["DISABLE_SERVER_SIDE_CURSORS"])
+        # Sin sentencias preparadas: el pooler en modo transacción cambia la conexión
+        self.assertEqual(serverless["OPTIONS"], {"prepare_threshold": None})
+
+        persistente = opciones_conexion("persistent", {"DB_CONN_MAX_AGE": "30"})
+        self.assertEqual(persistente["CONN_MAX_AGE"], 30)
+        self.assertNotIn("OPTIONS", persistente)
+
+        pool = opciones_conexion("pool", {"DB_CONN_HEALTH_CHECKS": "False"})
+        self.assertEqual(pool["CONN_MAX_AGE"], 0)
+        self.assertEqual(pool["OPTIONS"]["pool"]["max_size"], 10)
+
+        with self.assertRaises(ImproperlyConfigured):
+            opciones_conexion("otro", {})
@@ -1,5 +1,8 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from .views import *
+from . import views_async
 
 router = DefaultRouter()
 
@@ -63,4 +66,33 @@ router.register(r'criterios', CriterioEvaluacionViewSet)
 # ─────────────────────────────────────────────
 router.register(r'silabos', SilaboViewSet)
 
-urlpatterns = router.urls
\ No newline at end of file
+urlpatterns = router.urls + [
+    path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('cache/estadisticas/', CacheEstadisticasView.as_view(), name='cache-estadisticas'),
+    path('search/', BusquedaView.as_view(), name='busqueda'),
+    path('avance/', AvanceView.as_view(), name='avance'),
+    path('avance/actualizar/', ActualizarAvanceView.as_view(), name='avance-actualizar'),
+    path('jerarquia/', JerarquiaView.as_view(), name='jerarquia'),
+
+    # Lecturas asíncronas (ASGI), misma representación que las de la API sync
+    path('async/silabos/', views_async.silabo_lista, name='async-silabo-list'),
+    path('async/silabos/por_profesor/', views_async.silabo_por_profesor, name='async-silabo-por-profesor'),
+    path('async/silabos/por_curso/', views_async.silabo_por_curso, name='async-silabo-por-curso'),
+    path('async/silabos/por_periodo/', views_async.silabo_por_periodo, name='async-silabo-por-periodo'),
+    path('async/silabos/<int:pk>/', views_async.silabo_detalle, name='async-silabo-detail'),
+    path('async/silabos/<int:pk>/documento/', views_async.silabo_documento, name='async-silabo-documento'),
+    path('async/silabos/<int:pk>/unidades/', views_async.silabo_unidades, name='async-silabo-unidades'),
+    path('async/silabos/<int:pk>/actividades_completas/', views_async.silabo_actividades,
+         name='async-silabo-actividades-completas'),
+    path('async/silabos/<int:pk>/criterios_evaluacion_completos/', views_async.silabo_criterios,
+         name='async-silabo-criterios-evaluacion-completos'),
+    path('async/universidades/<int:pk>/facultades/', views_async.universidad_facultades,
+         name='async-universidad-facultades'),
+    path('async/facultades/<int:pk>/departamentos/', views_async.facultad_departamentos,
+         name='async-facultad-departamentos'),
+    path('async/departamentos/<int:pk>/carreras/', views_async.departamento_carreras,
+         name='async-departamento-carreras'),
+    path('async/carreras/<int:pk>/planes_curriculares/', views_async.carrera_planes,
+         name='async-carrera-planes-curriculares'),
+]
\ No newline at end of file
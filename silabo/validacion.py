@@ -0,0 +1,179 @@
+from collections import defaultdict
+
+from django.db.models import Count, F, Q, Sum, Value, Window
+from django.db.models.functions import Lag
+
+from .clonacion import semestre_de_periodo
+from .models import Silabo, Unidad, Semana, CriterioEvaluacion
+
+
+# ─────────────────────────────────────────────
+#  Validación de los sílabos de un periodo
+# ─────────────────────────────────────────────
+#
+# Cada regla se evalúa para todos los sílabos del periodo a la vez: una
+# consulta de sílabos con su jerarquía, una agregación por modelo y una
+# función de ventana para las unidades superpuestas. El costo no depende del
+# número de sílabos sino del número de reglas.
+#
+# La ventana de fechas es el SemestreAcademico indicado o, si no se indica,
+# el que tiene el nombre del periodo; si no existe, la del semestre del plan
+# al que pertenece el curso de cada sílabo.
+
+TOLERANCIA_PESO = 0.01
+PESO_TOTAL = 100
+
+RUTA_SEMESTRE = 'curso__semestre__semestre_academico'
+
+
+class Reporte:
+
+    def __init__(self, silabos):
+        self.silabos = silabos
+        self.problemas = defaultdict(list)
+
+    def agregar(self, silabo_id, regla, mensaje):
+        self.problemas[silabo_id].append({'regla': regla, 'mensaje': mensaje})
+
+    def as_dict(self):
+        return {
+            'silabos': len(self.silabos),
+            'con_problemas': len(self.problemas),
+            'problemas': sum(len(lista) for lista in self.problemas.values()),
+            'resultados': [
+                {'silabo': silabo_id, 'nombre': self.silabos[silabo_id]['nombre'], 'problemas': problemas}
+                for silabo_id, problemas in sorted(self.problemas.items())
+            ],
+        }
+
+
+def _ventana(semestre, prefijo):
+    """
+    Inicio y fin del semestre como expresiones: constantes si se conoce el
+    semestre del periodo, columnas del semestre del curso si no
+    """
+    if semestre is not None:
+        return Value(semestre.fecha_inicio), Value(semestre.fecha_fin)
+    return F(f'{prefijo}{RUTA_SEMESTRE}__fecha_inicio'), F(f'{prefijo}{RUTA_SEMESTRE}__fecha_fin')
+
+
+def _fuera_de_ventana(inicio, fin, desde, hasta):
+    return Q(**{f'{inicio}__lt': desde}) | Q(**{f'{fin}__gt': hasta})
+
+
+def _validar_jerarquia(reporte):
+    for silabo_id, silabo in reporte.silabos.items():
+        if silabo['plan_carrera'] is not None and silabo['carrera_id'] != silabo['plan_carrera']:
+            reporte.agregar(silabo_id, 'carrera', "La carrera no es la del plan curricular del curso")
+        if silabo['carrera_facultad'] is not None and silabo['facultad_id'] != silabo['carrera_facultad']:
+            reporte.agregar(silabo_id, 'facultad', "La facultad no es la de la carrera")
+
+
+def _validar_criterios(reporte, ids, semestre):
+    desde, hasta = _ventana(semestre, 'silabo__')
+    filas = (
+        CriterioEvaluacion.objects.filter(silabo_id__in=ids, activo=True)
+        .values('silabo_id')
+        .annotate(
+            peso_total=Sum('peso'),
+            invertidos=Count('id', filter=Q(fecha_inicio__gt=F('fecha_fin'))),
+            fuera=Count('id', filter=_fuera_de_ventana('fecha_inicio', 'fecha_fin', desde, hasta)),
+        )
+        .order_by()
+    )
+    con_criterios = set()
+    for fila in filas:
+        silabo_id = fila['silabo_id']
+        con_criterios.add(silabo_id)
+        if abs(fila['peso_total'] - PESO_TOTAL) > TOLERANCIA_PESO:
+            reporte.agregar(silabo_id, 'pesos', f"Los pesos de los criterios suman {fila['peso_total']:g}, no {PESO_TOTAL}")
+        if fila['invertidos']:
+            reporte.agregar(silabo_id, 'criterios_fechas', f"{fila['invertidos']} criterios terminan antes de empezar")
+        if fila['fuera']:
+            reporte.agregar(silabo_id, 'criterios_semestre', f"{fila['fuera']} criterios fuera del semestre académico")
+    for silabo_id in reporte.silabos:
+        if silabo_id not in con_criterios:
+            reporte.agregar(silabo_id, 'pesos', "No tiene criterios de evaluación")
+
+
+def _validar_unidades(reporte, ids, semestre):
+    desde, hasta = _ventana(semestre, 'silabo__')
+    filas = (
+        Unidad.objects.filter(silabo_id__in=ids, activo=True)
+        .values('silabo_id')
+        .annotate(
+            invertidas=Count('id', filter=Q(inicio__gt=F('final'))),
+            fuera=Count('id', filter=_fuera_de_ventana('inicio', 'final', desde, hasta)),
+        )
+        .order_by()
+    )
+    for fila in filas:
+        if fila['invertidas']:
+            reporte.agregar(fila['silabo_id'], 'unidades_fechas', f"{fila['invertidas']} unidades terminan antes de empezar")
+        if fila['fuera']:
+            reporte.agregar(fila['silabo_id'], 'unidades_semestre', f"{fila['fuera']} unidades fuera del semestre académico")
+
+    # Cada unidad contra la anterior del mismo sílabo, ordenadas por inicio
+    superpuestas = (
+        Unidad.objects.filter(silabo_id__in=ids, activo=True)
+        .annotate(final_anterior=Window(
+            Lag('final'), partition_by=F('silabo_id'), order_by=(F('inicio').asc(), F('id').asc()),
+        ))
+        .filter(inicio__lte=F('final_anterior'))
+        .values_list('silabo_id', 'numero')
+    )
+    for silabo_id, numero in superpuestas:
+        reporte.agregar(silabo_id, 'unidades_superpuestas', f"La unidad {numero} empieza antes de que termine la anterior")
+
+
+def _validar_semanas(reporte, ids):
+    # Las semanas se numeran en todo el sílabo: cada una contra la anterior,
+    # ordenadas por unidad y número, detecta huecos y repeticiones también
+    # entre el final de una unidad y el inicio de la siguiente
+    filas = (
+        Semana.objects.filter(unidad__silabo_id__in=ids, unidad__activo=True, activo=True)
+        .annotate(anterior=Window(
+            Lag('numero'), partition_by=F('unidad__silabo_id'),
+            order_by=(F('unidad__numero').asc(), F('numero').asc(), F('id').asc()),
+        ))
+        .values_list('unidad__silabo_id', 'unidad__numero', 'numero', 'anterior')
+    )
+    for silabo_id, unidad, numero, anterior in filas:
+        if anterior is None or numero == anterior + 1:
+            continue
+        if numero > anterior:
+            mensaje = f"Faltan semanas entre la {anterior} y la {numero} (unidad {unidad})"
+        elif numero == anterior:
+            mensaje = f"La semana {numero} está repetida (unidad {unidad})"
+        else:
+            mensaje = f"La semana {numero} de la unidad {unidad} no sigue a la {anterior}"
+        reporte.agregar(silabo_id, 'semanas', mensaje)
+
+
+def validar_periodo(periodo, semestre=None, facultad_id=None, carrera_id=None):
+    """
+    Valida los sílabos activos de `periodo` y devuelve el reporte
+    """
+    if semestre is None:
+        semestre = semestre_de_periodo(periodo)
+    silabos = Silabo.objects.filter(periodo_lectivo=periodo, activo=True)
+    if facultad_id:
+        silabos = silabos.filter(facultad_id=facultad_id)
+    if carrera_id:
+        silabos = silabos.filter(carrera_id=carrera_id)
+    # Las demás consultas filtran con esta subconsulta, no con la lista de ids
+    ids = silabos.values('id')
+    silabos = silabos.values(
+        'id', 'nombre', 'facultad_id', 'carrera_id',
+        plan_carrera=F('curso__semestre__plan__carrera_id'),
+        carrera_facultad=F('carrera__departamento__facultad_id'),
+    )
+    reporte = Reporte({fila['id']: fila for fila in silabos})
+    if reporte.silabos:
+        _validar_jerarquia(reporte)
+        _validar_criterios(reporte, ids, semestre)
+        _validar_unidades(reporte, ids, semestre)
+        _validar_semanas(reporte, ids)
+    resultado = reporte.as_dict()
+    resultado['semestre_academico'] = semestre.pk if semestre else None
+    return resultado
@@ -1,16 +1,48 @@
+import hmac
+import io
+
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.views import APIView
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import AllowAny
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_date
 from .models import *
 from .serializers import *
+from .avance import actualizar_avance, avance_de_silabo, tablero
+from .analitica import DIMENSIONES as DIMENSIONES_CARGA, analitica_de_carga, cargas_filtradas
+from .actividad import AGRUPACIONES as AGRUPACIONES_ACTIVIDAD, estadisticas_actividad
+from .clonacion import clonar_silabos, dias_entre, semestre_de_periodo
+from .condicional import condicional_silabo
+from .documento import guardar_documento
+from .consultas import prefetch_documento
+from .jerarquia import MODELOS as MODELOS_JERARQUIA, NIVELES as NIVELES_JERARQUIA, construir_jerarquia
+from .grafo import obtener_grafo, plan_de_curso
+from .exportacion import GENERADORES as EXPORTADORES, CONTENT_TYPES, silabos_para_exportar
+from .importacion import importar_csv
+from .busqueda import buscar
+from .cache import cache_respuesta, estadisticas
+from .mixins import EagerLoadingMixin, CachedResponseMixin, BulkModelMixin
+from .pagination import LogPagination, OptionalKeysetPagination
+from .validacion import validar_periodo
+
+
+class BaseModelViewSet(BulkModelMixin, EagerLoadingMixin, viewsets.ModelViewSet):
+    """
+    ModelViewSet base de la app: carga anticipada según el serializer y
+    operaciones masivas (ver mixins.py)
+    """
 
 
 # ─────────────────────────────────────────────
 #  SEGURIDAD
 # ─────────────────────────────────────────────
 
-class RolViewSet(viewsets.ModelViewSet):
+class RolViewSet(BaseModelViewSet):
     """
     CRUD completo para roles del sistema
     """
@@ -18,7 +50,7 @@ class RolViewSet(viewsets.ModelViewSet):
     serializer_class = RolSerializer
 
 
-class CustomUserViewSet(viewsets.ModelViewSet):
+class CustomUserViewSet(BaseModelViewSet):
     """
     CRUD completo para usuarios del sistema
     """
@@ -44,12 +76,39 @@ class CustomUserViewSet(viewsets.ModelViewSet):
             )
 
 
-class PersonaViewSet(viewsets.ModelViewSet):
+class PersonaViewSet(BaseModelViewSet):
     """
     CRUD completo para personas
     """
     queryset = Persona.objects.all()
     serializer_class = PersonaSerializer
+    pagination_class = OptionalKeysetPagination
+    MAX_DNIS = 1000
+
+    @action(detail=False, methods=['post'], parser_classes=[MultiPartParser])
+    def importar(self, request):
+        """
+        Importar estudiantes o profesores desde un CSV (campo `archivo`,
+        parámetro `tipo`: estudiante | profesor)
+        """
+        serializer = ImportacionPersonasSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        datos = serializer.validated_data
+        rol = datos.get('rol')
+        texto = io.TextIOWrapper(datos['archivo'].file, encoding='utf-8-sig', newline='')
+        try:
+            resultado = importar_csv(texto, tipo=datos['tipo'], rol_id=rol.pk if rol else None)
+        except (ValueError, UnicodeDecodeError) as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(resultado.as_dict())
+
+    def get_serializer_class(self):
+        if self.action == 'buscar_por_dnis':
+            return PersonaVinculosSerializer
+        if self.action == 'importar':
+            return ImportacionPersonasSerializer
+        return super().get_serializer_class()
 
     @action(detail=False, methods=['get'])
     def buscar_por_dni(self, request):
@@ -58,7 +117,13 @@ class PersonaViewSet(viewsets.ModelViewSet):
         """
         dni = request.query_params.get('dni')
         if dni:
-            persona = get_object_or_404(Persona, dni=dni)
+            # Con duplicados históricos se prefiere el registro activo
+            persona = (
+                self.filter_queryset(self.get_queryset())
+                .filter(dni=dni).order_by('-activo', 'id').first()
+            )
+            if persona is None:
+                return Response({'detail': 'No encontrado.'}, status=status.HTTP_404_NOT_FOUND)
             serializer = self.get_serializer(persona)
             return Response(serializer.data)
         else:
@@ -67,20 +132,84 @@ class PersonaViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+    @action(detail=False, methods=['get', 'post'])
+    def buscar_por_dnis(self, request):
+        """
+        Buscar varias personas activas por DNI (`dnis`: lista en el cuerpo o
+        separada por comas en la URL). Devuelve un mapa DNI → persona con su
+        usuario, estudiante y profesor, resuelto en una sola consulta.
+        """
+        if request.method == 'POST':
+            dnis = request.data.get('dnis') or []
+        else:
+            dnis = request.query_params.get('dnis', '').split(',')
+        if not isinstance(dnis, list):
+            return Response({'error': 'dnis debe ser una lista'}, status=status.HTTP_400_BAD_REQUEST)
+        dnis = list(dict.fromkeys(str(dni).strip() for dni in dnis if str(dni).strip()))
+        if not dnis:
+            return Response({'error': 'dnis es requerido'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(dnis) > self.MAX_DNIS:
+            return Response(
+                {'error': f'Máximo {self.MAX_DNIS} DNIs por petición'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        personas = self.filter_queryset(self.get_queryset()).filter(dni__in=dnis, activo=True)
+        encontrados = {
+            fila['dni']: fila for fila in self.get_serializer(personas, many=True).data
+        }
+        return Response({
+            'resultados': encontrados,
+            'no_encontrados': [dni for dni in dnis if dni not in encontrados],
+        })
+
 
-class LogProcesosViewSet(viewsets.ModelViewSet):
+class LogProcesosViewSet(BaseModelViewSet):
     """
     CRUD completo para logs del sistema
     """
-    queryset = LogProcesos.objects.all().order_by('-fecha')
+    queryset = LogProcesos.objects.all().order_by('-fecha', '-id')
     serializer_class = LogProcesosSerializer
+    pagination_class = LogPagination
+
+    @action(detail=False, methods=['get'])
+    def estadisticas(self, request):
+        """
+        Totales de actividad desde el resumen diario (no recorre los logs).
+        Parámetros: agrupar (fecha, usuario, accion separados por coma),
+        desde, hasta (AAAA-MM-DD), usuario, accion (prefijo)
+        """
+        params = request.query_params
+        agrupar = [campo for campo in params.get('agrupar', 'fecha').split(',') if campo]
+        if any(campo not in AGRUPACIONES_ACTIVIDAD for campo in agrupar):
+            return Response(
+                {'error': f"agrupar admite: {', '.join(AGRUPACIONES_ACTIVIDAD)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not params.get('usuario', '0').isdigit():
+            return Response({'error': 'usuario debe ser un entero'}, status=status.HTTP_400_BAD_REQUEST)
+        fechas = {}
+        for nombre in ('desde', 'hasta'):
+            if params.get(nombre):
+                try:
+                    fechas[nombre] = parse_date(params[nombre])
+                except ValueError:
+                    fechas[nombre] = None
+                if fechas[nombre] is None:
+                    return Response(
+                        {'error': f'{nombre} debe tener el formato AAAA-MM-DD'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+        return Response(estadisticas_actividad(
+            agrupar, usuario_id=params.get('usuario'), accion=params.get('accion'), **fechas
+        ))
 
 
 # ─────────────────────────────────────────────
 #  Estructura académica
 # ─────────────────────────────────────────────
 
-class UniversidadViewSet(viewsets.ModelViewSet):
+class UniversidadViewSet(CachedResponseMixin, BaseModelViewSet):
     """
     CRUD completo para universidades
     """
@@ -88,75 +217,78 @@ class UniversidadViewSet(viewsets.ModelViewSet):
     serializer_class = UniversidadSerializer
 
     @action(detail=True, methods=['get'])
+    @cache_respuesta(Facultad, Universidad)
     def facultades(self, request, pk=None):
         """
         Obtener todas las facultades de una universidad
         """
         universidad = self.get_object()
         facultades = universidad.facultades.filter(activo=True)
-        serializer = FacultadSerializer(facultades, many=True)
-        return Response(serializer.data)
+        return Response(self.serializar(FacultadSerializer, facultades))
 
 
-class FacultadViewSet(viewsets.ModelViewSet):
+class FacultadViewSet(CachedResponseMixin, BaseModelViewSet):
     """
     CRUD completo para facultades
     """
     queryset = Facultad.objects.all()
     serializer_class = FacultadSerializer
+    cache_modelos = (Facultad, Universidad)
 
     @action(detail=True, methods=['get'])
+    @cache_respuesta(Departamento, Facultad, Universidad)
     def departamentos(self, request, pk=None):
         """
         Obtener todos los departamentos de una facultad
         """
         facultad = self.get_object()
         departamentos = facultad.departamentos.filter(activo=True)
-        serializer = DepartamentoSerializer(departamentos, many=True)
-        return Response(serializer.data)
+        return Response(self.serializar(DepartamentoSerializer, departamentos))
 
 
-class DepartamentoViewSet(viewsets.ModelViewSet):
+class DepartamentoViewSet(CachedResponseMixin, BaseModelViewSet):
     """
     CRUD completo para departamentos
     """
     queryset = Departamento.objects.all()
     serializer_class = DepartamentoSerializer
+    cache_modelos = (Departamento, Facultad, Universidad)
 
     @action(detail=True, methods=['get'])
+    @cache_respuesta(Carrera, Departamento, Facultad, Universidad)
     def carreras(self, request, pk=None):
         """
         Obtener todas las carreras de un departamento
         """
         departamento = self.get_object()
         carreras = departamento.carreras.filter(activo=True)
-        serializer = CarreraSerializer(carreras, many=True)
-        return Response(serializer.data)
+        return Response(self.serializar(CarreraSerializer, carreras))
 
 
-class CarreraViewSet(viewsets.ModelViewSet):
+class CarreraViewSet(CachedResponseMixin, BaseModelViewSet):
     """
     CRUD completo para carreras
     """
     queryset = Carrera.objects.all()
     serializer_class = CarreraSerializer
+    cache_modelos = (Carrera, Departamento, Facultad, Universidad)
 
     @action(detail=True, methods=['get'])
+    @cache_respuesta(PlanCurricular, Carrera, Departamento, Facultad, Universidad)
     def planes_curriculares(self, request, pk=None):
         """
         Obtener todos los planes curriculares de una carrera
         """
         carrera = self.get_object()
         planes = carrera.planes.filter(activo=True)
-        serializer = PlanCurricularSerializer(planes, many=True)
-        return Response(serializer.data)
+        return Response(self.serializar(PlanCurricularSerializer, planes))
 
 
 # ─────────────────────────────────────────────
 #  Planes de estudio y periodos
 # ─────────────────────────────────────────────
 
-class PlanCurricularViewSet(viewsets.ModelViewSet):
+class PlanCurricularViewSet(BaseModelViewSet):
     """
     CRUD completo para planes curriculares
     """
@@ -170,11 +302,19 @@ class PlanCurricularViewSet(viewsets.ModelViewSet):
         """
         plan = self.get_object()
         semestres = plan.semestres.filter(activo=True)
-        serializer = SemestrePlanSerializer(semestres, many=True)
-        return Response(serializer.data)
+        return Response(self.serializar(SemestrePlanSerializer, semestres))
+
+    @action(detail=True, methods=['get'])
+    def grafo(self, request, pk=None):
+        """
+        Grafo de prerrequisitos del plan: orden topológico, ciclos,
+        ruta crítica en semestres e inconsistencias de ubicación
+        """
+        plan = self.get_object()
+        return Response(obtener_grafo(plan.pk).resumen())
 
 
-class SemestreAcademicoViewSet(viewsets.ModelViewSet):
+class SemestreAcademicoViewSet(BaseModelViewSet):
     """
     CRUD completo para semestres académicos
     """
@@ -182,7 +322,7 @@ class SemestreAcademicoViewSet(viewsets.ModelViewSet):
     serializer_class = SemestreAcademicoSerializer
 
 
-class SemestrePlanViewSet(viewsets.ModelViewSet):
+class SemestrePlanViewSet(BaseModelViewSet):
     """
     CRUD completo para semestres de plan
     """
@@ -196,15 +336,14 @@ class SemestrePlanViewSet(viewsets.ModelViewSet):
         """
         semestre = self.get_object()
         cursos = semestre.cursos.filter(activo=True)
-        serializer = CursoSerializer(cursos, many=True)
-        return Response(serializer.data)
+        return Response(self.serializar(CursoSerializer, cursos))
 
 
 # ─────────────────────────────────────────────
 #  Cursos y prerrequisitos
 # ─────────────────────────────────────────────
 
-class AreaViewSet(viewsets.ModelViewSet):
+class AreaViewSet(CachedResponseMixin, BaseModelViewSet):
     """
     CRUD completo para áreas
     """
@@ -218,11 +357,10 @@ class AreaViewSet(viewsets.ModelViewSet):
         """
         area = self.get_object()
         cursos = area.cursos.filter(activo=True)
-        serializer = CursoSerializer(cursos, many=True)
-        return Response(serializer.data)
+        return Response(self.serializar(CursoSerializer, cursos))
 
 
-class TipoCursoViewSet(viewsets.ModelViewSet):
+class TipoCursoViewSet(CachedResponseMixin, BaseModelViewSet):
     """
     CRUD completo para tipos de curso
     """
@@ -230,7 +368,7 @@ class TipoCursoViewSet(viewsets.ModelViewSet):
     serializer_class = TipoCursoSerializer
 
 
-class CursoViewSet(viewsets.ModelViewSet):
+class CursoViewSet(BaseModelViewSet):
     """
     CRUD completo para cursos:
     - GET    /cursos/          → lista
@@ -242,26 +380,67 @@ class CursoViewSet(viewsets.ModelViewSet):
     """
     queryset = Curso.objects.all()
     serializer_class = CursoSerializer
+    pagination_class = OptionalKeysetPagination
+
+    def validar_lote(self, instancias, validos):
+        """
+        En un PATCH masivo, los prerrequisitos de todos los elementos se
+        aplican juntos sobre una copia del grafo de cada plan antes de
+        buscar ciclos: A → B y B → A en el mismo lote se rechazan
+        """
+        if instancias is None:
+            return []
+        por_plan = {}
+        for indice, (curso, data) in enumerate(zip(instancias, validos)):
+            semestre = data.get('semestre', curso.semestre)
+            if 'prerrequisitos' in data and semestre is not None and semestre.plan_id is not None:
+                por_plan.setdefault(semestre.plan_id, []).append((indice, curso.pk, data['prerrequisitos']))
+
+        errores = []
+        for plan_id, cambios in por_plan.items():
+            grafo = obtener_grafo(plan_id).copia()
+            for _, curso_id, prerrequisitos in cambios:
+                grafo.quitar(curso_id, list(grafo.prerrequisitos.get(curso_id, ())))
+                grafo.agregar(curso_id, [p.pk for p in prerrequisitos])
+            errores.extend(
+                {'indice': indice, 'errores': {'prerrequisitos': ['Los prerrequisitos del lote forman un ciclo']}}
+                for indice, curso_id, _ in cambios
+                if grafo.crearia_ciclo(curso_id, grafo.prerrequisitos[curso_id])
+            )
+        return sorted(errores, key=lambda error: error['indice'])
+
+    @staticmethod
+    def _transitivo(request):
+        return request.query_params.get('transitivo', '').lower() in ('1', 'true')
+
+    @staticmethod
+    def _grafo(curso):
+        return obtener_grafo(plan_de_curso(curso))
 
     @action(detail=True, methods=['get'])
     def prerrequisitos(self, request, pk=None):
         """
-        Obtener prerrequisitos de un curso
+        Obtener prerrequisitos de un curso (`?transitivo=true` para toda la cadena)
         """
         curso = self.get_object()
-        prerrequisitos = curso.prerrequisitos.all()
-        serializer = CursoSerializer(prerrequisitos, many=True)
-        return Response(serializer.data)
+        if self._transitivo(request):
+            prerrequisitos = Curso.objects.filter(pk__in=self._grafo(curso).ancestros(curso.pk))
+        else:
+            prerrequisitos = curso.prerrequisitos.all()
+        return Response(self.serializar(CursoSerializer, prerrequisitos))
 
     @action(detail=True, methods=['get'])
     def cursos_dependientes(self, request, pk=None):
         """
         Obtener cursos que tienen este curso como prerrequisito
+        (`?transitivo=true` para todos los que dependen de él)
         """
         curso = self.get_object()
-        cursos_dependientes = curso.requeridos_por.all()
-        serializer = CursoSerializer(cursos_dependientes, many=True)
-        return Response(serializer.data)
+        if self._transitivo(request):
+            cursos_dependientes = Curso.objects.filter(pk__in=self._grafo(curso).descendientes(curso.pk))
+        else:
+            cursos_dependientes = curso.requeridos_por.all()
+        return Response(self.serializar(CursoSerializer, cursos_dependientes))
 
     @action(detail=True, methods=['get'])
     def grupos(self, request, pk=None):
@@ -270,15 +449,14 @@ class CursoViewSet(viewsets.ModelViewSet):
         """
         curso = self.get_object()
         grupos = curso.grupos.filter(activo=True)
-        serializer = GrupoSerializer(grupos, many=True)
-        return Response(serializer.data)
+        return Response(self.serializar(GrupoSerializer, grupos))
 
 
 # ─────────────────────────────────────────────
 #  Profesores y carga académica
 # ─────────────────────────────────────────────
 
-class ProfesionViewSet(viewsets.ModelViewSet):
+class ProfesionViewSet(CachedResponseMixin, BaseModelViewSet):
     """
     CRUD completo para profesiones
     """
@@ -286,7 +464,7 @@ class ProfesionViewSet(viewsets.ModelViewSet):
     serializer_class = ProfesionSerializer
 
 
-class ProfesorViewSet(viewsets.ModelViewSet):
+class ProfesorViewSet(BaseModelViewSet):
     """
     CRUD completo para profesores
     """
@@ -300,8 +478,7 @@ class ProfesorViewSet(viewsets.ModelViewSet):
         """
         profesor = self.get_object()
         cargas = profesor.cargas.filter(activo=True)
-        serializer = CargaCursoSerializer(cargas, many=True)
-        return Response(serializer.data)
+        return Response(self.serializar(CargaCursoSerializer, cargas))
 
     @action(detail=True, methods=['get'])
     def silabos(self, request, pk=None):
@@ -310,19 +487,51 @@ class ProfesorViewSet(viewsets.ModelViewSet):
         """
         profesor = self.get_object()
         silabos = profesor.silabos.filter(activo=True)
-        serializer = SilaboSerializer(silabos, many=True)
-        return Response(serializer.data)
+        return Response(self.serializar(SilaboSerializer, silabos))
 
 
-class CargaCursoViewSet(viewsets.ModelViewSet):
+class CargaCursoViewSet(BaseModelViewSet):
     """
     CRUD completo para carga de cursos
     """
     queryset = CargaCurso.objects.all()
     serializer_class = CargaCursoSerializer
 
-
-class GrupoViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'])
+    @cache_respuesta(
+        CargaCurso, Curso, Profesor, Persona, Silabo, SemestrePlan, PlanCurricular,
+        SemestreAcademico, Carrera, Departamento, Facultad,
+    )
+    def analitica(self, request):
+        """
+        Horas y créditos de carga docente agrupados por profesor,
+        departamento, facultad o semestre_academico (agrupar), con los
+        profesores en sobrecarga o subcarga según min_horas y max_horas.
+        Filtros: periodo_id, semestre_academico_id, facultad_id, departamento_id
+        """
+        params = request.query_params
+        agrupar = params.get('agrupar', 'profesor')
+        if agrupar not in DIMENSIONES_CARGA:
+            return Response(
+                {'error': f"agrupar admite: {', '.join(DIMENSIONES_CARGA)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            minimo = int(params['min_horas']) if params.get('min_horas') else None
+            maximo = int(params['max_horas']) if params.get('max_horas') else None
+        except ValueError:
+            return Response({'error': 'min_horas y max_horas deben ser enteros'}, status=status.HTTP_400_BAD_REQUEST)
+
+        cargas = cargas_filtradas(
+            periodo_id=params.get('periodo_id'),
+            semestre_academico_id=params.get('semestre_academico_id'),
+            facultad_id=params.get('facultad_id'),
+            departamento_id=params.get('departamento_id'),
+        )
+        return Response(analitica_de_carga(cargas, agrupar, minimo, maximo))
+
+
+class GrupoViewSet(BaseModelViewSet):
     """
     CRUD completo para grupos
     """
@@ -334,12 +543,13 @@ class GrupoViewSet(viewsets.ModelViewSet):
 #  Estudiantes
 # ─────────────────────────────────────────────
 
-class EstudianteViewSet(viewsets.ModelViewSet):
+class EstudianteViewSet(BaseModelViewSet):
     """
     CRUD completo para estudiantes
     """
     queryset = Estudiante.objects.all()
     serializer_class = EstudianteSerializer
+    pagination_class = OptionalKeysetPagination
 
     @action(detail=False, methods=['get'])
     def buscar_por_dni(self, request):
@@ -348,16 +558,18 @@ class EstudianteViewSet(viewsets.ModelViewSet):
         """
         dni = request.query_params.get('dni')
         if dni:
-            try:
-                persona = Persona.objects.get(dni=dni)
-                estudiante = persona.estudiante
-                serializer = self.get_serializer(estudiante)
-                return Response(serializer.data)
-            except (Persona.DoesNotExist, Estudiante.DoesNotExist):
+            # Un solo JOIN estudiante → persona → usuario
+            estudiante = (
+                self.filter_queryset(self.get_queryset())
+                .filter(persona__dni=dni).order_by('-persona__activo', 'id').first()
+            )
+            if estudiante is None:
                 return Response(
                     {'error': 'Estudiante no encontrado'}, 
                     status=status.HTTP_404_NOT_FOUND
                 )
+            serializer = self.get_serializer(estudiante)
+            return Response(serializer.data)
         else:
             return Response(
                 {'error': 'DNI es requerido'}, 
@@ -369,7 +581,7 @@ class EstudianteViewSet(viewsets.ModelViewSet):
 #  Modelos complementarios para el sílabo
 # ─────────────────────────────────────────────
 
-class PeriodoLectivoViewSet(viewsets.ModelViewSet):
+class PeriodoLectivoViewSet(CachedResponseMixin, BaseModelViewSet):
     """
     CRUD completo para periodos lectivos
     """
@@ -383,11 +595,38 @@ class PeriodoLectivoViewSet(viewsets.ModelViewSet):
         """
         periodo = self.get_object()
         silabos = periodo.silabos.filter(activo=True)
-        serializer = SilaboSerializer(silabos, many=True)
-        return Response(serializer.data)
+        return Response(self.serializar(SilaboSerializer, silabos))
+
+    @action(detail=True, methods=['get'])
+    @cache_respuesta(
+        Silabo, Unidad, Semana, CriterioEvaluacion, Curso, SemestrePlan, PlanCurricular,
+        SemestreAcademico, PeriodoLectivo, Carrera, Departamento,
+    )
+    def validar(self, request, pk=None):
+        """
+        Reporte de consistencia de los sílabos del periodo: pesos de los
+        criterios, fechas dentro del semestre académico, unidades superpuestas,
+        semanas consecutivas y facultad/carrera del plan del curso.
+        Filtros: semestre_academico, facultad_id, carrera_id
+        """
+        try:
+            filtros = {
+                campo: int(request.query_params[campo])
+                for campo in ('semestre_academico', 'facultad_id', 'carrera_id')
+                if request.query_params.get(campo)
+            }
+        except ValueError:
+            return Response({'error': 'Los filtros deben ser enteros'}, status=status.HTTP_400_BAD_REQUEST)
+
+        periodo = self.get_object()
+        semestre = None
+        if 'semestre_academico' in filtros:
+            semestre = get_object_or_404(SemestreAcademico, pk=filtros.pop('semestre_academico'))
+        reporte = validar_periodo(periodo, semestre, **filtros)
+        return Response({'periodo_lectivo': periodo.pk, **reporte})
 
 
-class MetodologiaViewSet(viewsets.ModelViewSet):
+class MetodologiaViewSet(CachedResponseMixin, BaseModelViewSet):
     """
     CRUD completo para metodologías
     """
@@ -395,7 +634,7 @@ class MetodologiaViewSet(viewsets.ModelViewSet):
     serializer_class = MetodologiaSerializer
 
 
-class BibliografiaViewSet(viewsets.ModelViewSet):
+class BibliografiaViewSet(BaseModelViewSet):
     """
     CRUD completo para bibliografías
     """
@@ -403,7 +642,7 @@ class BibliografiaViewSet(viewsets.ModelViewSet):
     serializer_class = BibliografiaSerializer
 
 
-class SemanaViewSet(viewsets.ModelViewSet):
+class SemanaViewSet(BaseModelViewSet):
     """
     CRUD completo para semanas
     """
@@ -417,11 +656,10 @@ class SemanaViewSet(viewsets.ModelViewSet):
         """
         semana = self.get_object()
         contenidos = semana.contenidos.filter(activo=True)
-        serializer = ContenidoEspecificoSerializer(contenidos, many=True)
-        return Response(serializer.data)
+        return Response(self.serializar(ContenidoEspecificoSerializer, contenidos))
 
 
-class ContenidoEspecificoViewSet(viewsets.ModelViewSet):
+class ContenidoEspecificoViewSet(BaseModelViewSet):
     """
     CRUD completo para contenidos específicos
     """
@@ -429,7 +667,7 @@ class ContenidoEspecificoViewSet(viewsets.ModelViewSet):
     serializer_class = ContenidoEspecificoSerializer
 
 
-class UnidadViewSet(viewsets.ModelViewSet):
+class UnidadViewSet(BaseModelViewSet):
     """
     CRUD completo para unidades.
     """
@@ -452,8 +690,7 @@ class UnidadViewSet(viewsets.ModelViewSet):
         """
         unidad = self.get_object()
         semanas = unidad.semanas.filter(activo=True).order_by('numero')
-        serializer = SemanaSerializer(semanas, many=True)
-        return Response(serializer.data)
+        return Response(self.serializar(SemanaSerializer, semanas))
 
     @action(detail=True, methods=['get'])
     def bibliografias(self, request, pk=None):
@@ -462,11 +699,10 @@ class UnidadViewSet(viewsets.ModelViewSet):
         """
         unidad = self.get_object()
         bibliografias = unidad.bibliografias.filter(activo=True)
-        serializer = BibliografiaSerializer(bibliografias, many=True)
-        return Response(serializer.data)
+        return Response(self.serializar(BibliografiaSerializer, bibliografias))
 
 
-class ActividadViewSet(viewsets.ModelViewSet):
+class ActividadViewSet(BaseModelViewSet):
     """
     CRUD completo para actividades
     """
@@ -481,19 +717,8 @@ class ActividadViewSet(viewsets.ModelViewSet):
             qs = qs.filter(silabo_id=silabo_id)
         return qs
 
-    def create(self, request, *args, **kwargs):
-        """
-        Crear actividad(es) – soporta creación múltiple
-        """
-        is_many = isinstance(request.data, list)
-        serializer = self.get_serializer(data=request.data, many=is_many)
-        serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
-        headers = self.get_success_headers(serializer.data)
-        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
-
 
-class CriterioEvaluacionViewSet(viewsets.ModelViewSet):
+class CriterioEvaluacionViewSet(BaseModelViewSet):
     """
     CRUD completo para criterios de evaluación
     """
@@ -508,58 +733,146 @@ class CriterioEvaluacionViewSet(viewsets.ModelViewSet):
             qs = qs.filter(silabo_id=silabo_id)
         return qs
 
-    def create(self, request, *args, **kwargs):
-        """
-        Crear criterio(s) de evaluación – soporta creación múltiple
-        """
-        is_many = isinstance(request.data, list)
-        serializer = self.get_serializer(data=request.data, many=is_many)
-        serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
-        headers = self.get_success_headers(serializer.data)
-        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
-
 
 # ─────────────────────────────────────────────
 #  Silabos
 # ─────────────────────────────────────────────
 
-class SilaboViewSet(viewsets.ModelViewSet):
+class SilaboViewSet(BaseModelViewSet):
     """
     CRUD completo para sílabos
     """
     queryset = Silabo.objects.all()
     serializer_class = SilaboSerializer
+    pagination_class = OptionalKeysetPagination
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action == 'documento':
+            qs = qs.prefetch_related(*prefetch_documento())
+        return qs
+
+    def get_serializer_class(self):
+        if self.action == 'documento' and self.request is not None and self.request.method == 'PUT':
+            return SilaboDocumentoEscrituraSerializer
+        if self.action == 'documento':
+            return SilaboDocumentoSerializer
+        if self.action == 'clonar':
+            return ClonacionSilaboSerializer
+        return super().get_serializer_class()
+
+    @condicional_silabo(
+        PeriodoLectivo, Profesor, Persona, CustomUser, Rol, Profesion,
+        Facultad, Universidad, Carrera, Departamento,
+        Curso, Area, TipoCurso, SemestrePlan, PlanCurricular, SemestreAcademico,
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(detail=True, methods=['get', 'put'])
+    @condicional_silabo()
+    def documento(self, request, pk=None):
+        """
+        Obtener el sílabo completo (unidades → semanas → contenidos,
+        bibliografías, actividades y criterios) en una sola petición, o
+        reemplazarlo con PUT en una transacción: sólo se escriben las filas
+        que cambiaron
+        """
+        silabo = self.get_object()
+        if request.method == 'PUT':
+            entrada = self.get_serializer(data=request.data)
+            entrada.is_valid(raise_exception=True)
+            guardar_documento(silabo, entrada.validated_data)
+            silabo = self.get_object()
+        serializer = SilaboDocumentoSerializer(silabo, context=self.get_serializer_context())
+        return Response(serializer.data)
+
+    @action(detail=True, methods=['post'])
+    def clonar(self, request, pk=None):
+        """
+        Copiar el sílabo con sus unidades, semanas, contenidos, bibliografías,
+        actividades y criterios a otro periodo lectivo, desplazando las fechas
+        al nuevo semestre académico
+        """
+        silabo = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        datos = serializer.validated_data
+        origen, destino = silabo.periodo_lectivo, datos['periodo_lectivo']
+        profesor = datos.get('profesor')
+
+        existente = Silabo.objects.filter(
+            periodo_lectivo=destino, curso_id=silabo.curso_id,
+            profesor=profesor or silabo.profesor_id, activo=True,
+        ).values_list('id', flat=True).first()
+        if existente:
+            return Response(
+                {'error': 'El profesor ya tiene un sílabo de este curso en el periodo', 'silabo': existente},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        dias = dias_entre(
+            datos.get('semestre_origen') or semestre_de_periodo(origen),
+            datos.get('semestre_destino') or semestre_de_periodo(destino),
+        )
+        mapa, copiados = clonar_silabos(
+            Silabo.objects.filter(pk=silabo.pk), origen, destino, dias,
+            profesor_id=profesor.pk if profesor else None,
+        )
+        return Response(
+            {'silabo': mapa[silabo.pk], 'copiados': copiados, 'desplazamiento_dias': dias},
+            status=status.HTTP_201_CREATED
+        )
 
     @action(detail=True, methods=['get'])
+    @condicional_silabo()
     def unidades(self, request, pk=None):
         """
         Obtener unidades de un sílabo
         """
         silabo = self.get_object()
-        unidades = silabo.actividades.filter(activo=True)  # Nota: revisar nombre de related_name
-        serializer = UnidadSerializer(unidades, many=True)
-        return Response(serializer.data)
+        unidades = silabo.unidades.filter(activo=True).order_by('numero')
+        return Response(self.serializar(UnidadSerializer, unidades))
 
     @action(detail=True, methods=['get'])
+    @condicional_silabo()
     def actividades_completas(self, request, pk=None):
         """
         Obtener actividades completas de un sílabo
         """
         silabo = self.get_object()
         actividades = silabo.actividades.filter(activo=True)
-        serializer = ActividadSerializer(actividades, many=True)
-        return Response(serializer.data)
+        return Response(self.serializar(ActividadSerializer, actividades))
 
     @action(detail=True, methods=['get'])
+    @condicional_silabo()
     def criterios_evaluacion_completos(self, request, pk=None):
         """
         Obtener criterios de evaluación completos de un sílabo
         """
         silabo = self.get_object()
-        criterios = silabo.actividades.filter(activo=True)  # Nota: revisar nombre de related_name
-        serializer = CriterioEvaluacionSerializer(criterios, many=True)
-        return Response(serializer.data)
+        criterios = silabo.criterios_evaluacion.filter(activo=True)
+        return Response(self.serializar(CriterioEvaluacionSerializer, criterios))
+
+    @action(detail=False, methods=['get'])
+    def exportar(self, request):
+        """
+        Exportar sílabos completos en streaming.
+        Filtros: periodo_id, facultad_id, carrera_id. formato: ndjson | csv
+        """
+        formato = request.query_params.get('formato', 'ndjson')
+        if formato not in EXPORTADORES:
+            return Response(
+                {'error': 'formato debe ser ndjson o csv'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        params = request.query_params
+        silabos = silabos_para_exportar(
+            params.get('periodo_id'), params.get('facultad_id'), params.get('carrera_id')
+        )
+        response = StreamingHttpResponse(EXPORTADORES[formato](silabos), content_type=CONTENT_TYPES[formato])
+        response['Content-Disposition'] = f'attachment; filename="silabos.{formato}"'
+        return response
 
     @action(detail=False, methods=['get'])
     def por_profesor(self, request):
@@ -568,7 +881,11 @@ class SilaboViewSet(viewsets.ModelViewSet):
         """
         profesor_id = request.query_params.get('profesor_id')
         if profesor_id:
-            silabos = self.queryset.filter(profesor_id=profesor_id, activo=True)
+            silabos = self.filter_queryset(self.get_queryset()).filter(profesor_id=profesor_id, activo=True)
+            page = self.paginate_queryset(silabos)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
             serializer = self.get_serializer(silabos, many=True)
             return Response(serializer.data)
         else:
@@ -584,7 +901,11 @@ class SilaboViewSet(viewsets.ModelViewSet):
         """
         curso_id = request.query_params.get('curso_id')
         if curso_id:
-            silabos = self.queryset.filter(curso_id=curso_id, activo=True)
+            silabos = self.filter_queryset(self.get_queryset()).filter(curso_id=curso_id, activo=True)
+            page = self.paginate_queryset(silabos)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
             serializer = self.get_serializer(silabos, many=True)
             return Response(serializer.data)
         else:
@@ -600,11 +921,158 @@ class SilaboViewSet(viewsets.ModelViewSet):
         """
         periodo_id = request.query_params.get('periodo_id')
         if periodo_id:
-            silabos = self.queryset.filter(periodo_lectivo_id=periodo_id, activo=True)
+            silabos = self.filter_queryset(self.get_queryset()).filter(periodo_lectivo_id=periodo_id, activo=True)
+            page = self.paginate_queryset(silabos)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
             serializer = self.get_serializer(silabos, many=True)
             return Response(serializer.data)
         else:
             return Response(
                 {'error': 'periodo_id es requerido'}, 
                 status=status.HTTP_400_BAD_REQUEST
-            )
\ No newline at end of file
+            )
+
+
+# ─────────────────────────────────────────────
+#  Caché
+# ─────────────────────────────────────────────
+
+class CacheEstadisticasView(APIView):
+    """
+    Aciertos y fallos de la caché de catálogos
+    """
+
+    def get(self, request):
+        return Response(estadisticas())
+
+
+class BusquedaView(APIView):
+    """
+    Búsqueda de texto completo en sílabos, cursos, unidades y contenidos.
+    Parámetros: q (obligatorio), periodo_id, carrera_id, limite (máx. 100)
+    """
+
+    def get(self, request):
+        consulta = request.query_params.get('q', '').strip()
+        if not consulta:
+            return Response({'error': 'Se requiere el parámetro q'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limite = max(1, min(int(request.query_params.get('limite', 20)), 100))
+            filtros = {
+                campo: int(request.query_params[campo])
+                for campo in ('periodo_id', 'carrera_id')
+                if request.query_params.get(campo)
+            }
+        except ValueError:
+            return Response(
+                {'error': 'limite, periodo_id y carrera_id deben ser enteros'}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        motor, coincidencias = buscar(consulta, limite=limite, **filtros)
+        silabos = Silabo.objects.select_related('curso', 'periodo_lectivo').in_bulk(
+            [silabo_id for silabo_id, _ in coincidencias]
+        )
+        resultados = [
+            {
+                'silabo': silabo_id,
+                'nombre': silabos[silabo_id].nombre,
+                'curso': {
+                    'id': silabos[silabo_id].curso_id,
+                    'codigo': silabos[silabo_id].curso.codigo,
+                    'nombre': silabos[silabo_id].curso.nombre,
+                },
+                'periodo_lectivo': str(silabos[silabo_id].periodo_lectivo),
+                'rank': round(rank, 6),
+            }
+            for silabo_id, rank in coincidencias if silabo_id in silabos
+        ]
+        return Response({'motor': motor, 'count': len(resultados), 'resultados': resultados})
+
+
+# ─────────────────────────────────────────────
+#  Avance de sílabos
+# ─────────────────────────────────────────────
+
+class AvanceView(APIView):
+    """
+    Tablero de avance de los sílabos, leído de las tablas que mantiene
+    `actualizar_avance`. Sin filtros, totales por periodo; con periodo_id,
+    por facultad; con facultad_id, por carrera; con carrera_id, cada sílabo.
+    silabo_id devuelve sólo la fila de ese sílabo.
+    """
+
+    def get(self, request):
+        try:
+            filtros = {
+                campo: int(request.query_params[campo])
+                for campo in ('periodo_id', 'facultad_id', 'carrera_id', 'silabo_id')
+                if request.query_params.get(campo)
+            }
+        except ValueError:
+            return Response({'error': 'Los filtros deben ser enteros'}, status=status.HTTP_400_BAD_REQUEST)
+
+        silabo_id = filtros.pop('silabo_id', None)
+        if silabo_id:
+            fila = avance_de_silabo(silabo_id)
+            if fila is None:
+                return Response({'error': 'El sílabo no tiene avance calculado'}, status=status.HTTP_404_NOT_FOUND)
+            return Response(fila)
+        return Response(tablero(**filtros))
+
+
+class ActualizarAvanceView(APIView):
+    """
+    Ejecuta `actualizar_avance` desde el cron de Vercel, que envía
+    `Authorization: Bearer <CRON_SECRET>`. Sin CRON_SECRET configurado no
+    está disponible.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    swagger_schema = None
+
+    def get(self, request):
+        secreto = getattr(settings, 'CRON_SECRET', None)
+        if not secreto:
+            return Response({'error': 'CRON_SECRET no está configurado'}, status=status.HTTP_404_NOT_FOUND)
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {secreto}'):
+            return Response({'error': 'No autorizado'}, status=status.HTTP_401_UNAUTHORIZED)
+        recalculados, retirados = actualizar_avance()
+        return Response({'recalculados': recalculados, 'retirados': retirados})
+
+
+# ─────────────────────────────────────────────
+#  Estructura académica
+# ─────────────────────────────────────────────
+
+class JerarquiaView(APIView):
+    """
+    Árbol activo universidad → facultad → departamento → carrera → plan →
+    semestre → curso, con una consulta por nivel y cacheado hasta la próxima
+    escritura en cualquiera de esos modelos. Parámetros: raiz (nivel del que
+    parte el árbol), id (nodo raíz), hasta (último nivel incluido)
+    """
+
+    @cache_respuesta(*MODELOS_JERARQUIA)
+    def get(self, request):
+        raiz = request.query_params.get('raiz', 'universidad')
+        hasta = request.query_params.get('hasta', 'curso')
+        if raiz not in NIVELES_JERARQUIA or hasta not in NIVELES_JERARQUIA:
+            return Response(
+                {'error': f"raiz y hasta admiten: {', '.join(NIVELES_JERARQUIA)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if list(NIVELES_JERARQUIA).index(hasta) < list(NIVELES_JERARQUIA).index(raiz):
+            return Response({'error': 'hasta no puede estar por encima de raiz'}, status=status.HTTP_400_BAD_REQUEST)
+        raiz_id = request.query_params.get('id')
+        if raiz_id is not None:
+            try:
+                raiz_id = int(raiz_id)
+            except ValueError:
+                return Response({'error': 'id debe ser un entero'}, status=status.HTTP_400_BAD_REQUEST)
+
+        arbol = construir_jerarquia(raiz, raiz_id, hasta)
+        if raiz_id is not None and not arbol:
+            return Response({'error': f'No existe {raiz} activo con id {raiz_id}'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'raiz': raiz, 'hasta': hasta, 'resultados': arbol})
@@ -0,0 +1,236 @@
+import asyncio
+from collections import defaultdict
+from functools import partial, wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import prefetch_related_objects
+from django.http import JsonResponse
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .consultas import plan_de_carga, prefetch_documento
+from .models import (
+    Universidad, Facultad, Departamento, Carrera, PlanCurricular,
+    Silabo, Unidad, Actividad, CriterioEvaluacion,
+)
+from .serializers import (
+    FacultadSerializer, DepartamentoSerializer, CarreraSerializer, PlanCurricularSerializer,
+    SilaboSerializer, SilaboDocumentoSerializer, UnidadSerializer,
+    ActividadSerializer, CriterioEvaluacionSerializer,
+)
+
+
+# ─────────────────────────────────────────────
+#  Lectura asíncrona de sílabos (ASGI)
+# ─────────────────────────────────────────────
+#
+# Variantes `async def` de las lecturas más frecuentes de SilaboViewSet y de
+# las acciones de jerarquía (universidad → facultades → departamentos →
+# carreras → planes), con la misma representación JSON. La consulta principal
+# usa el ORM asíncrono (`async for`, `aexists`) y trae las relaciones
+# `select_related` del plan de carga. Cada rama `prefetch_related` se
+# resuelve como una tarea independiente con asyncio.gather: Django no tiene
+# versión asíncrona de prefetch_related_objects, así que las ramas sí pasan
+# por sync_to_async. En PostgreSQL se ejecutan en hilos distintos, cada uno
+# con su conexión, de modo que las consultas corren realmente en paralelo; en
+# otros motores (SQLite) se serializan en el hilo de la petición. Las
+# escrituras siguen en la API sync.
+
+def consultas_paralelas():
+    return getattr(settings, 'SILABO_ASYNC_PARALELO', connection.vendor == 'postgresql')
+
+
+def _con_conexion_propia(funcion):
+    def envoltura():
+        close_old_connections()
+        try:
+            return funcion()
+        finally:
+            close_old_connections()
+    return envoltura
+
+
+async def ejecutar(funcion):
+    """
+    Ejecuta una función síncrona de acceso a datos desde el event loop
+    """
+    if consultas_paralelas():
+        return await sync_to_async(_con_conexion_propia(funcion), thread_sensitive=False)()
+    return await sync_to_async(funcion)()
+
+
+def _raiz(lookup):
+    return getattr(lookup, 'prefetch_to', lookup).split('__', 1)[0]
+
+
+async def cargar(queryset, serializer, prefetch=()):
+    """
+    Materializa `queryset` con el plan de carga de `serializer`: una consulta
+    para las filas y una tarea concurrente por cada relación prefetch raíz.
+    `prefetch` admite objetos Prefetch propios, que tienen prioridad.
+    """
+    select, rutas = plan_de_carga(serializer)
+    propios = {_raiz(lookup) for lookup in prefetch}
+    ramas = defaultdict(list)
+    for lookup in prefetch:
+        ramas[_raiz(lookup)].append(lookup)
+    for ruta in rutas:
+        if _raiz(ruta) not in propios:
+            ramas[_raiz(ruta)].append(ruta)
+
+    if select:
+        queryset = queryset.select_related(*select)
+    objetos = [objeto async for objeto in queryset]
+    if objetos and ramas:
+        await asyncio.gather(*(
+            ejecutar(partial(prefetch_related_objects, objetos, *lookups))
+            for lookups in ramas.values()
+        ))
+    return objetos
+
+
+# ←–– Autenticación y respuestas ––→
+
+def autenticar(request):
+    """
+    Autentica con las clases configuradas en DRF (JWT). Devuelve el usuario o None.
+    """
+    drf_request = Request(request)
+    for clase in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        resultado = clase().authenticate(drf_request)
+        if resultado is not None:
+            return resultado[0]
+    return None
+
+
+def error(status, **cuerpo):
+    return JsonResponse(cuerpo, status=status)
+
+
+def no_encontrado():
+    return error(404, detail='No encontrado.')
+
+
+def api_async(vista):
+    """
+    Sólo GET y usuario autenticado, como IsAuthenticated en la API sync
+    """
+    @wraps(vista)
+    async def envoltura(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return error(405, detail=f'Método "{request.method}" no permitido.')
+        try:
+            usuario = await sync_to_async(autenticar)(request)
+        except exceptions.AuthenticationFailed as exc:
+            return error(401, detail=str(exc.detail))
+        if usuario is None or not usuario.is_active:
+            return error(401, detail='Las credenciales de autenticación no se proveyeron.')
+        request.user = usuario
+        return await vista(request, *args, **kwargs)
+    return envoltura
+
+
+def _serializer(serializer_class, request, **kwargs):
+    return serializer_class(context={'request': Request(request)}, **kwargs)
+
+
+async def _lista(request, serializer_class, queryset, prefetch=()):
+    serializer = _serializer(serializer_class, request, many=True)
+    serializer.instance = await cargar(queryset, serializer, prefetch)
+    return JsonResponse(serializer.data, safe=False)
+
+
+async def _detalle(request, serializer_class, queryset, prefetch=()):
+    serializer = _serializer(serializer_class, request)
+    objetos = await cargar(queryset, serializer, prefetch)
+    if not objetos:
+        return no_encontrado()
+    serializer.instance = objetos[0]
+    return JsonResponse(serializer.data)
+
+
+# ←–– Vistas ––→
+
+@api_async
+async def silabo_lista(request):
+    return await _lista(request, SilaboSerializer, Silabo.objects.all())
+
+
+@api_async
+async def silabo_detalle(request, pk):
+    return await _detalle(request, SilaboSerializer, Silabo.objects.filter(pk=pk))
+
+
+@api_async
+async def silabo_documento(request, pk):
+    """
+    Unidades (con semanas, contenidos y bibliografías), actividades y
+    criterios se cargan de forma concurrente
+    """
+    return await _detalle(
+        request, SilaboDocumentoSerializer, Silabo.objects.filter(pk=pk), prefetch_documento()
+    )
+
+
+async def _hijos(request, padre, pk, serializer_class, queryset):
+    existe, respuesta = await asyncio.gather(
+        padre.objects.filter(pk=pk).aexists(),
+        _lista(request, serializer_class, queryset),
+    )
+    return respuesta if existe else no_encontrado()
+
+
+@api_async
+async def silabo_unidades(request, pk):
+    unidades = Unidad.objects.filter(silabo_id=pk, activo=True).order_by('numero')
+    return await _hijos(request, Silabo, pk, UnidadSerializer, unidades)
+
+
+@api_async
+async def silabo_actividades(request, pk):
+    actividades = Actividad.objects.filter(silabo_id=pk, activo=True)
+    return await _hijos(request, Silabo, pk, ActividadSerializer, actividades)
+
+
+@api_async
+async def silabo_criterios(request, pk):
+    criterios = CriterioEvaluacion.objects.filter(silabo_id=pk, activo=True)
+    return await _hijos(request, Silabo, pk, CriterioEvaluacionSerializer, criterios)
+
+
+# ←–– Jerarquía ––→
+
+def _hijos_de(padre, campo, serializer_class, model):
+    """
+    Vista de los hijos activos de `padre`, como las acciones de jerarquía
+    de los viewsets sync
+    """
+    @api_async
+    async def vista(request, pk):
+        hijos = model.objects.filter(**{f'{campo}_id': pk}, activo=True)
+        return await _hijos(request, padre, pk, serializer_class, hijos)
+    return vista
+
+
+universidad_facultades = _hijos_de(Universidad, 'universidad', FacultadSerializer, Facultad)
+facultad_departamentos = _hijos_de(Facultad, 'facultad', DepartamentoSerializer, Departamento)
+departamento_carreras = _hijos_de(Departamento, 'departamento', CarreraSerializer, Carrera)
+carrera_planes = _hijos_de(Carrera, 'carrera', PlanCurricularSerializer, PlanCurricular)
+
+
+def _por(parametro, campo):
+    @api_async
+    async def vista(request):
+        valor = request.GET.get(parametro)
+        if not valor:
+            return error(400, error=f'{parametro} es requerido')
+        return await _lista(request, SilaboSerializer, Silabo.objects.filter(**{campo: valor}, activo=True))
+    return vista
+
+
+silabo_por_profesor = _por('profesor_id', 'profesor_id')
+silabo_por_curso = _por('curso_id', 'curso_id')
+silabo_por_periodo = _por('periodo_id', 'periodo_lectivo_id')
@@ -0,0 +1,62 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+
+# ─────────────────────────────────────────────
+#  Modos de conexión a PostgreSQL
+# ─────────────────────────────────────────────
+#
+#   persistent  cada hilo reutiliza su conexión durante DB_CONN_MAX_AGE
+#               segundos (60 por defecto) y la verifica antes de usarla
+#   pool        pool de psycopg 3 compartido por los hilos del proceso
+#               (DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT)
+#   serverless  una conexión por petición, sin cursores del lado del servidor
+#               ni sentencias preparadas del lado del servidor (psycopg 3 las
+#               prepara tras 5 ejecuciones y el pooler puede entregar otra
+#               conexión); sirve detrás de PgBouncer/Supabase en modo
+#               transacción. Es el modo por defecto en Vercel.
+
+MODOS = ('persistent', 'pool', 'serverless')
+
+
+def _entero(entorno, nombre, defecto):
+    return int(entorno.get(nombre, defecto))
+
+
+def modo_por_defecto(entorno=os.environ):
+    return entorno.get('DB_CONN_MODE') or ('serverless' if entorno.get('VERCEL') else 'persistent')
+
+
+def opciones_conexion(modo, entorno=os.environ):
+    """
+    Claves de DATABASES['default'] que corresponden a `modo`
+    """
+    if modo not in MODOS:
+        raise ImproperlyConfigured(f"DB_CONN_MODE debe ser uno de: {', '.join(MODOS)}")
+    health_checks = entorno.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True'
+
+    if modo == 'pool':
+        pool = {
+            'min_size': _entero(entorno, 'DB_POOL_MIN_SIZE', 2),
+            'max_size': _entero(entorno, 'DB_POOL_MAX_SIZE', 10),
+            'timeout': float(entorno.get('DB_POOL_TIMEOUT', 10)),
+        }
+        if health_checks:
+            from psycopg_pool import ConnectionPool
+            pool['check'] = ConnectionPool.check_connection
+        # El pool administra la vida de las conexiones: Django exige CONN_MAX_AGE = 0
+        return {'CONN_MAX_AGE': 0, 'OPTIONS': {'pool': pool}}
+
+    if modo == 'serverless':
+        return {
+            'CONN_MAX_AGE': _entero(entorno, 'DB_CONN_MAX_AGE', 0),
+            'CONN_HEALTH_CHECKS': health_checks,
+            'DISABLE_SERVER_SIDE_CURSORS': True,
+            'OPTIONS': {'prepare_threshold': None},
+        }
+
+    return {
+        'CONN_MAX_AGE': _entero(entorno, 'DB_CONN_MAX_AGE', 60),
+        'CONN_HEALTH_CHECKS': health_checks,
+    }
@@ -0,0 +1,50 @@
+from django.test import RequestFactory
+from rest_framework import permissions
+from rest_framework.request import Request
+from drf_yasg.generators import OpenAPISchemaGenerator
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.views import get_schema_view
+from drf_yasg import openapi
+
+
+# ─────────────────────────────────────────────
+#  Generación del esquema OpenAPI (drf_yasg)
+# ─────────────────────────────────────────────
+#
+# En producción el esquema se sirve precalculado (ver esquema.py) y este
+# módulo sólo lo importan `generar_esquema` y, con OPENAPI_RUNTIME, las
+# vistas que lo regeneran en cada petición.
+
+INFO = openapi.Info(
+    title="API Sílabo",
+    default_version='v1',
+    description="Documentación de la API para la gestión académica",
+    contact=openapi.Contact(email="tu@email.com"),
+    license=openapi.License(name="MIT"),
+)
+
+CODECS = {
+    'json': OpenAPICodecJson,
+    'yaml': OpenAPICodecYaml,
+}
+
+
+def generar(formato):
+    """
+    Esquema público de todas las rutas DRF, codificado en `formato` (json | yaml)
+    """
+    # Algunos viewsets leen `request.query_params` en get_queryset: se usa una
+    # petición ficticia, como la que recibiría la vista de drf_yasg
+    request = Request(RequestFactory().get('/swagger.json'))
+    esquema = OpenAPISchemaGenerator(INFO, url='').get_schema(request=request, public=True)
+    return CODECS[formato](validators=[]).encode(esquema)
+
+
+schema_view = get_schema_view(
+    INFO,
+    public=True,
+    permission_classes=[permissions.AllowAny],
+)
+
+swagger = schema_view.with_ui('swagger', cache_timeout=0)
+redoc = schema_view.with_ui('redoc', cache_timeout=0)
@@ -0,0 +1,96 @@
+import gzip
+import hashlib
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.templatetags.static import static
+from django.views.decorators.http import require_safe
+
+
+# ─────────────────────────────────────────────
+#  Esquema OpenAPI precalculado
+# ─────────────────────────────────────────────
+#
+# `python manage.py generar_esquema` escribe openapi.json / openapi.yaml (y
+# sus .gz) en OPENAPI_DIR. Aquí se sirven tal cual, comprimidos si el cliente
+# acepta gzip y con ETag, sin importar drf_yasg ni recorrer los viewsets.
+
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'yaml': 'application/yaml',
+}
+
+_artefactos = {}
+
+
+def _artefacto(formato):
+    if formato not in _artefactos:
+        ruta = settings.OPENAPI_DIR / f'openapi.{formato}'
+        try:
+            datos = ruta.read_bytes()
+        except FileNotFoundError:
+            raise Http404("Esquema no generado: python manage.py generar_esquema")
+        comprimido = ruta.with_name(ruta.name + '.gz')
+        _artefactos[formato] = (
+            datos,
+            comprimido.read_bytes() if comprimido.exists() else gzip.compress(datos, mtime=0),
+            f'"{hashlib.sha256(datos).hexdigest()[:32]}"',
+        )
+    return _artefactos[formato]
+
+
+@require_safe
+def archivo(request, formato):
+    datos, comprimido, etag = _artefacto(formato)
+    if request.headers.get('If-None-Match') == etag:
+        return HttpResponseNotModified(headers={'ETag': etag})
+
+    usar_gzip = 'gzip' in request.headers.get('Accept-Encoding', '')
+    response = HttpResponse(comprimido if usar_gzip else datos, content_type=CONTENT_TYPES[formato])
+    if usar_gzip:
+        response['Content-Encoding'] = 'gzip'
+    response['Vary'] = 'Accept-Encoding'
+    response['ETag'] = etag
+    response['Cache-Control'] = 'public, max-age=3600'
+    return response
+
+
+# ←–– Interfaces (recursos estáticos de drf_yasg, ya en staticfiles/) ––→
+
+PAGINA = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>API Sílabo</title>
+{cabecera}
+</head>
+<body>
+{cuerpo}
+</body>
+</html>
+"""
+
+
+@require_safe
+def swagger_ui(request):
+    cabecera = f'<link rel="stylesheet" href="{static("drf-yasg/swagger-ui-dist/swagger-ui.css")}">'
+    cuerpo = f"""<div id="swagger-ui"></div>
+<script src="{static('drf-yasg/swagger-ui-dist/swagger-ui-bundle.js')}"></script>
+<script src="{static('drf-yasg/swagger-ui-dist/swagger-ui-standalone-preset.js')}"></script>
+<script>
+SwaggerUIBundle({{
+  url: "{request.build_absolute_uri('/swagger.json')}",
+  dom_id: "#swagger-ui",
+  presets: [SwaggerUIBundle.presets.apis, SwaggerUIStandalonePreset],
+  layout: "StandaloneLayout",
+  persistAuthorization: true,
+}});
+</script>"""
+    return HttpResponse(PAGINA.format(cabecera=cabecera, cuerpo=cuerpo))
+
+
+@require_safe
+def redoc(request):
+    cuerpo = f"""<redoc spec-url="{request.build_absolute_uri('/swagger.json')}"></redoc>
+<script src="{static('drf-yasg/redoc/redoc.min.js')}"></script>"""
+    return HttpResponse(PAGINA.format(cabecera='', cuerpo=cuerpo))
@@ -3,6 +3,8 @@ from dotenv import load_dotenv
 import os
 from datetime import timedelta
 
+from .conexiones import modo_por_defecto, opciones_conexion
+
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -24,8 +26,17 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
 
     'AUTH_HEADER_TYPES': ('Bearer',),
+
+    # Tokens con email, rol y estado del usuario (ver silabo/autenticacion.py)
+    'TOKEN_OBTAIN_SERIALIZER': 'silabo.autenticacion.TokenConClaimsSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'silabo.autenticacion.TokenRefreshConClaimsSerializer',
 }
 
+# Modo "sólo API" (DJANGO_API_ONLY=True), pensado para el lambda de Vercel:
+# sin admin, sesiones, mensajes, API navegable ni swagger/redoc, que sólo
+# encarecen el arranque en frío de una API que se consume con JWT
+API_ONLY = os.getenv('DJANGO_API_ONLY', 'False') == 'True'
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -47,20 +58,33 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'silabo.auditoria.auditoria_middleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+if API_ONLY:
+    SOLO_INTERFAZ_WEB = {
+        'django.contrib.admin', 'django.contrib.sessions', 'django.contrib.messages', 'drf_yasg',
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+    }
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in SOLO_INTERFAZ_WEB]
+    MIDDLEWARE = [m for m in MIDDLEWARE if m not in SOLO_INTERFAZ_WEB]
+
 # STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'silabo.autenticacion.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     )
 }
+if API_ONLY:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = ('rest_framework.renderers.JSONRenderer',)
 
 ROOT_URLCONF = 'silabo_s7_back.urls'
 
@@ -81,6 +105,9 @@ TEMPLATES = [
     },
 ]
 
+if API_ONLY:
+    TEMPLATES[0]['OPTIONS']['context_processors'].remove('django.contrib.messages.context_processors.messages')
+
 WSGI_APPLICATION = 'silabo_s7_back.wsgi.application'
 
 
@@ -95,6 +122,11 @@ DATABASES = {
     }
 }
 
+# Reutilización de conexiones. DB_CONN_MODE: persistent | pool | serverless
+# (ver conexiones.py)
+DB_CONN_MODE = modo_por_defecto()
+DATABASES['default'].update(opciones_conexion(DB_CONN_MODE))
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -131,3 +163,38 @@ STATICFILES_DIRS = [
 ]
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Esquema OpenAPI precalculado (python manage.py generar_esquema). Con
+# OPENAPI_RUNTIME (por defecto igual a DEBUG) también se publica el generador
+# de drf_yasg en /swagger/runtime/ y /redoc/runtime/
+OPENAPI_DIR = BASE_DIR / 'openapi'
+OPENAPI_RUNTIME = os.getenv('OPENAPI_RUNTIME', str(DEBUG)) == 'True'
+
+
+# Caché de respuestas (catálogos). CACHE_BACKEND: locmem | file | db | redis
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+CACHE_LOCATIONS = {
+    'locmem': 'silabo',
+    'file': '/tmp/silabo_cache',
+    'db': 'silabo_cache',  # python manage.py createcachetable
+    'redis': 'redis://127.0.0.1:6379/1',
+}
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.getenv('CACHE_LOCATION', CACHE_LOCATIONS[CACHE_BACKEND]),
+    }
+}
+
+SILABO_CACHE_ALIAS = 'default'
+SILABO_CACHE_TIMEOUT = int(os.getenv('CACHE_TIMEOUT', '3600'))
+
+# Secreto con que el cron de Vercel llama a /silabo/avance/actualizar/
+CRON_SECRET = os.getenv('CRON_SECRET')
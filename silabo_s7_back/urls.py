@@ -1,31 +1,46 @@
-from django.contrib import admin
 from django.urls import path, include
-
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
+from django.utils.module_loading import import_string
 
 from django.conf import settings
 from django.conf.urls.static import static
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="API Sílabo",
-        default_version='v1',
-        description="Documentación de la API para la gestión académica",
-        contact=openapi.Contact(email="tu@email.com"),
-        license=openapi.License(name="MIT"),
-    ),
-    public=True,
-    permission_classes=[permissions.AllowAny],
-)
+from . import esquema
+
+
+def vista_perezosa(ruta):
+    """
+    Vista que importa `ruta` (módulo.atributo) recién en su primera petición
+    """
+    vista = None
+
+    def envoltura(request, *args, **kwargs):
+        nonlocal vista
+        if vista is None:
+            vista = import_string(ruta)
+        return vista(request, *args, **kwargs)
+    return envoltura
+
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('silabo/', include('silabo.urls')),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('swagger.json', esquema.archivo, {'formato': 'json'}, name='schema-json'),
+    path('swagger.yaml', esquema.archivo, {'formato': 'yaml'}, name='schema-yaml'),
 ]
 
+if not settings.API_ONLY:
+    from django.contrib import admin
+
+    urlpatterns += [
+        path('admin/', admin.site.urls),
+        path('swagger/', esquema.swagger_ui, name='schema-swagger-ui'),
+        path('redoc/', esquema.redoc, name='schema-redoc'),
+    ]
+
+    if settings.OPENAPI_RUNTIME:
+        urlpatterns += [
+            path('swagger/runtime/', vista_perezosa('silabo_s7_back.docs.swagger'), name='schema-swagger-runtime'),
+            path('redoc/runtime/', vista_perezosa('silabo_s7_back.docs.redoc'), name='schema-redoc-runtime'),
+        ]
+
 if settings.DEBUG:
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file
+    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)